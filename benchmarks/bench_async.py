@@ -0,0 +1,88 @@
+"""Concurrency scaling of the async read views vs the DRF viewsets under ASGI.
+
+    python benchmarks/bench_async.py --concurrency 1 4 16 32 --db-latency-ms 5
+
+Requests go through django.test.AsyncClient, i.e. the project's ASGI handler in-process
+(run benchmarks/harness.py --driver asgi for a real server). --db-latency-ms adds a sleep
+to every query to stand in for a networked database; with SQLite in memory there is
+no I/O to overlap otherwise. BOARD_METRICS_ENABLED must stay off: a sync-only middleware
+puts the whole chain on one thread.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+from benchmarks.seed import Volumes, seed  # noqa: E402
+
+
+def install_latency(latency):
+    from django.db import connection
+    from django.db.backends.signals import connection_created
+
+    def slow_execute(execute, sql, params, many, context):
+        time.sleep(latency)
+        return execute(sql, params, many, context)
+
+    def on_connect(sender, connection, **kwargs):
+        connection.execute_wrappers.append(slow_execute)
+
+    connection_created.connect(on_connect, weak=False)
+    connection.execute_wrappers.append(slow_execute)
+
+
+async def run(client, path, requests, concurrency):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            response = await client.get(path)
+            assert response.status_code == 200, response.content
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 32])
+    parser.add_argument('--requests', type=int, default=64)
+    parser.add_argument('--db-latency-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.test import AsyncClient
+
+    from board.models import Post
+
+    seeded = seed(Volumes(users=20, boards=2, posts=500, comments=1000, likes=1000))
+    user = get_user_model().objects.get(pk=seeded.users[0])
+    client = AsyncClient()
+    client.force_login(user)
+    if args.db_latency_ms:
+        install_latency(args.db_latency_ms / 1000)
+
+    board = seeded.boards[0]
+    post = Post.objects.filter(board_id=board).values_list('pk', flat=True).first()
+    paths = {
+        'post list': f'/board/{board}/post/',
+        'post detail': f'/board/{board}/post/{post}/',
+    }
+
+    print(f'db latency {args.db_latency_ms} ms/query, {args.requests} requests per cell (req/s)')
+    print(f'{"route":<12} {"view":<6} ' + ' '.join(f'{f"c={c}":>8}' for c in args.concurrency))
+    for name, path in paths.items():
+        for view, prefix in (('sync', ''), ('async', '/async')):
+            row = [asyncio.run(run(client, f'{prefix}{path}', args.requests, c)) for c in args.concurrency]
+            print(f'{name:<12} {view:<6} ' + ' '.join(f'{rps:>8.1f}' for rps in row))
+
+
+if __name__ == '__main__':
+    main()
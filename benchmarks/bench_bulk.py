@@ -0,0 +1,49 @@
+"""Bulk create benchmark: one POST /board/<pk>/post/bulk/ vs N single POSTs.
+
+    python benchmarks/bench_bulk.py --items 1000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_client, setup_django  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=1000)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from board.models import Boards, Post
+
+    user = get_user_model().objects.create_user(username='bench', password='bench_password')
+    board = Boards.objects.create(author=user, title='board')
+    client = make_client(user)
+    url = f'/board/{board.pk}/post/'
+    items = [{'title': f'title {i}', 'content': f'content {i} ' * 20} for i in range(args.items)]
+
+    start = time.perf_counter()
+    response = client.post(f'{url}bulk/', data=json.dumps(items), content_type='application/json')
+    bulk_ms = (time.perf_counter() - start) * 1000
+    assert response.status_code == 201, response.content
+
+    start = time.perf_counter()
+    for item in items:
+        client.post(url, data=json.dumps(item), content_type='application/json')
+    single_ms = (time.perf_counter() - start) * 1000
+
+    assert Post.objects.count() == args.items * 2
+    print(f'{"mode":<8} {"items":>6} {"total ms":>10}')
+    print(f'{"bulk":<8} {args.items:>6} {bulk_ms:>10.1f}')
+    print(f'{"single":<8} {args.items:>6} {single_ms:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
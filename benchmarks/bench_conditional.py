@@ -0,0 +1,57 @@
+"""Polling client benchmark for ETag / conditional GET.
+
+    python benchmarks/bench_conditional.py --comments 200 --polls 300
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_client, mean, setup_django, timed  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--comments', type=int, default=200)
+    parser.add_argument('--polls', type=int, default=300)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from board.models import Boards, Comment, Post
+
+    user = get_user_model().objects.create_user(username='bench', password='bench_password')
+    board = Boards.objects.create(author=user, title='board')
+    post = Post.objects.create(author=user, board=board, title='title', content='content')
+    Comment.objects.bulk_create(
+        Comment(author=user, post=post, text=f'comment {i} ' * 8) for i in range(args.comments)
+    )
+
+    client = make_client(user)
+    url = f'/board/{board.pk}/post/{post.pk}/comment/'
+    etag = client.get(url)['ETag']
+
+    results = {}
+    for name, headers in (('full', {}), ('conditional', {'HTTP_IF_NONE_MATCH': etag})):
+        sizes = []
+
+        def poll():
+            response = client.get(url, **headers)
+            sizes.append(len(response.content))
+
+        samples = timed(poll, args.polls)
+        results[name] = (mean(samples), sum(sizes))
+
+    print(f'{"mode":<12} {"mean ms":>10} {"bytes":>12}')
+    for name, (ms, size) in results.items():
+        print(f'{name:<12} {ms:>10.3f} {size:>12}')
+
+    full_ms, full_bytes = results['full']
+    cond_ms, cond_bytes = results['conditional']
+    print(f'saved: {full_bytes - cond_bytes} bytes, {(1 - cond_ms / full_ms) * 100:.1f}% time per poll')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Full post dump: paging the list API vs the streaming export endpoint.
+
+    python benchmarks/bench_export.py --posts 20000
+
+Reports wall time and the tracemalloc peak while consuming each response.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_client, setup_django  # noqa: E402
+from benchmarks.seed import Volumes, seed  # noqa: E402
+
+
+def measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return rows, elapsed, peak / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', type=int, default=20000)
+    parser.add_argument('--page-size', type=int, default=100)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+
+    seeded = seed(Volumes(users=5, boards=1, posts=args.posts, comments=0, likes=0))
+    user = get_user_model().objects.get(pk=seeded.users[0])
+    user.is_staff = True
+    user.save()
+    client = make_client(user)
+    board = seeded.boards[0]
+
+    def paged():
+        rows, url = 0, f'/board/{board}/post/?pagination=keyset&limit={args.page_size}'
+        while url:
+            data = client.get(url).data
+            rows += len(data['results'])
+            url = data['next']
+        return rows
+
+    def streamed():
+        response = client.get('/export/posts/')
+        return sum(chunk.count(b'\n') for chunk in response.streaming_content)
+
+    print(f'{args.posts} posts')
+    print(f'{"mode":<22} {"rows":>8} {"seconds":>8} {"peak MiB":>9}')
+    for name, func in ((f'api pages of {args.page_size}', paged), ('export ndjson', streamed)):
+        rows, elapsed, peak = measure(func)
+        print(f'{name:<22} {rows:>8} {elapsed:>8.2f} {peak:>9.1f}')
+
+
+if __name__ == '__main__':
+    main()
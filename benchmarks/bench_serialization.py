@@ -0,0 +1,56 @@
+"""Post list serialization benchmark: full serializer vs ?fields= vs BOARD_LEAN_LIST.
+
+    python benchmarks/bench_serialization.py --sizes 10 100 1000 --repeat 20
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_client, mean, setup_django, timed  # noqa: E402
+
+FEED_FIELDS = 'title,author,is_like,like_count,created_at'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10, 100, 1000])
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.test import override_settings
+    from board.models import Boards, Post
+
+    user = get_user_model().objects.create_user(username='bench', password='bench_password')
+    board = Boards.objects.create(author=user, title='board')
+    Post.objects.bulk_create([
+        Post(author=user, board=board, title=f'title {i}', content='content ' * 200)
+        for i in range(max(args.sizes))
+    ])
+    client = make_client(user)
+    url = f'/board/{board.pk}/post/'
+
+    modes = [
+        ('full', '', False),
+        ('fields', f'&fields={FEED_FIELDS}', False),
+        ('lean', '', True),
+        ('lean+fields', f'&fields={FEED_FIELDS}', True),
+    ]
+
+    print(f'{"mode":<12} {"rows":>6} {"mean ms":>10} {"bytes":>9}')
+    for size in args.sizes:
+        for name, params, lean in modes:
+            path = f'{url}?limit={size}{params}'
+            with override_settings(BOARD_LEAN_LIST=lean):
+                response = client.get(path)
+                assert response.status_code == 200, response.content
+                samples = timed(lambda: client.get(path), args.repeat)
+            print(f'{name:<12} {size:>6} {mean(samples):>10.2f} {len(response.content):>9}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+"""Concurrent readers and writers against a file SQLite DB, stock vs production profile.
+
+    python benchmarks/bench_sqlite.py --threads 8 --seconds 5 --write-ratio 0.2
+
+Each profile runs in its own process on a fresh DB file (journal_mode=WAL stays in the
+file). Threads drive the full Django stack with test clients: writes create posts,
+reads fetch the post list. 'database is locked' errors are counted, not retried.
+
+    stock       default pragmas, CONN_MAX_AGE=0, every query on 'default'
+    production  BOARD_DB_PROFILE='production', persistent connections, reads on 'read'
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+from benchmarks.seed import Volumes, seed  # noqa: E402
+
+PROFILES = {
+    'stock': {'BOARD_DB_PROFILE': 'stock', 'BOARD_DB_REPLICAS': [], 'CONN_MAX_AGE': 0},
+    'production': {'BOARD_DB_PROFILE': 'production', 'BOARD_DB_REPLICAS': ['read'], 'CONN_MAX_AGE': 60},
+}
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p / 100))] if values else 0.0
+
+
+def worker(client, board, args, rng, deadline, results):
+    from django.db import OperationalError
+
+    while time.monotonic() < deadline:
+        kind = 'write' if rng.random() < args.write_ratio else 'read'
+        start = time.perf_counter()
+        try:
+            if kind == 'write':
+                response = client.post(f'/board/{board}/post/', {'title': 'title', 'content': 'content'})
+            else:
+                response = client.get(f'/board/{board}/post/')
+            ok = response.status_code < 500
+        except OperationalError as error:
+            if 'locked' not in str(error):
+                raise
+            ok = False
+        elapsed = (time.perf_counter() - start) * 1000
+        results.append((kind, ok, elapsed))
+
+
+def run_profile(profile, args):
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'subproject.settings')
+    from django.conf import settings
+
+    overrides = dict(PROFILES[profile])
+    conn_max_age = overrides.pop('CONN_MAX_AGE')
+    for database in settings.DATABASES.values():
+        database['CONN_MAX_AGE'] = conn_max_age
+
+    path = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+    setup_django(test_name=path, **overrides)
+
+    from django.contrib.auth import get_user_model
+    from django.db import connections
+    from django.test import Client
+
+    seeded = seed(Volumes(users=args.threads, boards=1, posts=500, comments=500, likes=500))
+    users = list(get_user_model().objects.filter(pk__in=seeded.users))
+    connections.close_all()
+
+    results = []
+    deadline = time.monotonic() + args.seconds
+    threads = []
+    for i, user in enumerate(users):
+        client = Client(raise_request_exception=True)
+        client.force_login(user)
+        thread = threading.Thread(target=worker, args=(client, seeded.boards[0], args, random.Random(i), deadline, results))
+        threads.append(thread)
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    summary = {}
+    for kind in ('read', 'write'):
+        latencies = [elapsed for k, ok, elapsed in results if k == kind and ok]
+        summary[kind] = {
+            'ok': len(latencies),
+            'locked': sum(1 for k, ok, _ in results if k == kind and not ok),
+            'p50': percentile(latencies, 50),
+            'p95': percentile(latencies, 95),
+        }
+    summary['rps'] = sum(1 for _, ok, _ in results if ok) / args.seconds
+    print(json.dumps(summary))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--seconds', type=float, default=5)
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--profile', choices=sorted(PROFILES), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args.profile, args)
+        return
+
+    print(f'{args.threads} threads, {args.seconds}s, {args.write_ratio:.0%} writes')
+    print(f'{"profile":<11} {"req/s":>7} {"read p50":>9} {"read p95":>9} {"write p50":>10} {"write p95":>10} {"locked":>7}')
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--profile', profile, '--threads', str(args.threads),
+             '--seconds', str(args.seconds), '--write-ratio', str(args.write_ratio)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        summary = json.loads(output.strip().splitlines()[-1])
+        read, write = summary['read'], summary['write']
+        print(f'{profile:<11} {summary["rps"]:>7.1f} {read["p50"]:>9.1f} {read["p95"]:>9.1f} '
+              f'{write["p50"]:>10.1f} {write["p95"]:>10.1f} {read["locked"] + write["locked"]:>7}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""Token-bucket throttle overhead: raw store checks and per-request cost.
+
+    python benchmarks/bench_throttle.py --checks 200000 --clients 1000,100000 --requests 500
+
+The first table times store.take() alone with calls spread over many clients. The time per check
+should stay flat as the number of clients grows. The second table times one GET request with the
+throttle off, on the local store and on the cache store. Budgets are set high enough that no request
+is rejected. The modes are interleaved request by request, and the order rotates each time, so drift
+over the run (warm caches, a growing session table) lands on every mode alike. The overhead is the
+paired difference against the unthrottled request next to it: the median with the 25th-75th
+percentile range of single pairs, and the mean with its 95% confidence interval. A check costs a few
+microseconds, far below the request-to-request noise, so expect the interval to span zero unless
+--requests is large.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_client, mean, setup_django, timed  # noqa: E402
+
+MODES = (None, 'local', 'cache')
+
+
+def bench_store(store, checks, clients):
+    keys = [f'read:user:{i}' for i in range(clients)]
+    order = [random.choice(keys) for _ in range(checks)]
+    start = time.perf_counter()
+    for key in order:
+        store.take(key, 20, 100)
+    elapsed = time.perf_counter() - start
+    return checks / elapsed, elapsed / checks * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--checks', type=int, default=200000)
+    parser.add_argument('--clients', default='1000,100000')
+    parser.add_argument('--requests', type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.core.cache import cache as default_cache
+    from django.test import override_settings
+    from board import throttling
+    from board.models import Boards, Post
+
+    print(f'{"store":<8} {"clients":>8} {"checks/s":>12} {"us/check":>9}')
+    for clients in (int(value) for value in args.clients.split(',')):
+        for name, make_store in (('local', throttling.LocalThrottleStore),
+                                 ('cache', lambda: throttling.CacheThrottleStore('default'))):
+            default_cache.clear()
+            rate, per_check = bench_store(make_store(), args.checks, clients)
+            print(f'{name:<8} {clients:>8} {rate:>12.0f} {per_check:>9.2f}')
+
+    user = get_user_model().objects.create_user(username='bench', password='bench_password')
+    board = Boards.objects.create(author=user, title='board')
+    post = Post.objects.create(author=user, board=board, title='title', content='content')
+    client = make_client(user)
+    url = f'/board/{board.pk}/post/{post.pk}/'
+
+    budgets = {'read': f'{args.requests * 10}/s'}
+    # 첫 요청들의 준비 비용이 첫 번째 모드에 몰리지 않도록 먼저 돌린다.
+    timed(lambda: client.get(url), 50)
+
+    samples = {name: [] for name in MODES}
+    for i in range(args.requests):
+        # 요청마다 모드 순서를 돌려서 실행 순서의 영향이 한 모드에 쌓이지 않게 한다.
+        for name in MODES[i % len(MODES):] + MODES[:i % len(MODES)]:
+            with override_settings(BOARD_THROTTLE=name, BOARD_THROTTLE_RATES=budgets,
+                                   BOARD_THROTTLE_BURST={'read': args.requests * 10}):
+                samples[name].extend(timed(lambda: client.get(url), 1))
+
+    print()
+    print(f'{"throttle":<8} {"mean ms":>10} {"median ms":>10}')
+    for name in MODES:
+        print(f'{name or "off":<8} {mean(samples[name]):>10.3f} {statistics.median(samples[name]):>10.3f}')
+
+    # 같은 차례에 잰 off 요청과의 차이
+    print()
+    print(f'{"overhead":<8} {"median us":>10} {"p25 us":>10} {"p75 us":>10} {"mean us":>10} {"95% ci":>10}')
+    for name in ('local', 'cache'):
+        diffs = [(on - off) * 1000 for on, off in zip(samples[name], samples[None])]
+        p25, median, p75 = statistics.quantiles(diffs, n=4)
+        ci = 1.96 * statistics.stdev(diffs) / len(diffs) ** 0.5
+        print(f'{name:<8} {median:>10.1f} {p25:>10.1f} {p75:>10.1f} {mean(diffs):>10.1f} {f"±{ci:.1f}":>10}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def setup_django(test_name=None, **overrides):
+    # 벤치마크는 테스트 러너와 같은 방식으로 메모리 SQLite 테스트 DB 를 만들어 쓴다.
+    # test_name 을 주면 그 경로의 파일 DB 를, overrides 는 DB 연결 전에 설정을 바꾼다.
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'subproject.settings')
+
+    from django.conf import settings
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    if test_name is not None:
+        settings.DATABASES['default']['TEST'] = {'NAME': test_name}
+
+    import django
+    django.setup()
+
+    from django.test.utils import setup_databases, setup_test_environment
+    setup_test_environment()
+    # 읽기 연결(TEST MIRROR)도 테스트 DB 를 보게 한다.
+    setup_databases(verbosity=0, interactive=False)
+
+
+def make_client(user):
+    from django.test import Client
+
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def timed(func, repeat):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0.0
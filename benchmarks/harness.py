@@ -0,0 +1,494 @@
+"""Board API load test: seed volumes, drive every route in board/urls.py, report and compare.
+
+    python benchmarks/harness.py --driver client --posts 1000 --comments 5000 --requests 50
+    python benchmarks/harness.py --driver wsgi --concurrency 8 --save baseline.json
+    python benchmarks/harness.py --driver asgi --compare baseline.json --threshold 0.25
+
+Drivers:
+    client  django.test.Client in-process (no HTTP, single thread)
+    wsgi    wsgiref threading server on 127.0.0.1, requests over HTTP
+    asgi    uvicorn on 127.0.0.1 when installed, otherwise django.test.AsyncClient in-process
+
+Queries per request are read from the Server-Timing header, so BOARD_METRICS_ENABLED is
+switched on for the run. Destructive routes (detail DELETE, bulk DELETE) are not driven.
+The exit status is 1 when --compare finds a regression.
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import logging
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import setup_django  # noqa: E402
+from benchmarks.seed import Volumes, seed  # noqa: E402
+
+SERVER_TIMING_QUERIES = re.compile(r'desc="(\d+) queries"')
+
+# 같은 라우트라도 비용이 다른 조회 방식은 따로 잰다.
+VARIANTS = {
+    'board-list': [''],
+    'post-list': ['', 'pagination=keyset', 'expand=comments', 'fields=title,author'],
+    'comment-list': ['', 'pagination=keyset'],
+    'search': ['q=게시글'],
+    'board-search': ['q=본문'],
+}
+
+# pk 가 아닌 라우트 인자 (export/<name>/ 는 게시글을 내보낸다)
+ROUTE_KWARGS = {
+    'name': 'posts',
+}
+
+BODIES = {
+    'board': {'title': 'bench'},
+    'post': {'title': 'bench', 'content': 'bench content'},
+    'comment': {'text': 'bench'},
+}
+
+
+class Scenario:
+
+    def __init__(self, name, method, make_request):
+        self.name = name
+        self.method = method
+        self.make_request = make_request
+
+    @property
+    def key(self):
+        return f'{self.method} {self.name}'
+
+
+def iter_patterns(patterns):
+    from django.urls import URLResolver
+
+    for pattern in patterns:
+        if isinstance(pattern, URLResolver):
+            yield from iter_patterns(pattern.url_patterns)
+        else:
+            yield pattern
+
+
+def allowed_methods(callback):
+    actions = getattr(callback, 'actions', None)
+    if actions is not None:
+        return set(actions)
+    view_class = getattr(callback, 'view_class', None) or getattr(callback, 'cls', None)
+    if view_class is None:
+        # 함수 뷰 (board/async_views.py 의 조회 전용 뷰)
+        return {'get'}
+    return {method for method in ('get', 'post', 'patch', 'delete') if hasattr(view_class, method)}
+
+
+def discover_routes():
+    # board/urls.py 에 등록된 이름 있는 라우트 (format suffix 패턴 제외)
+    from board import urls
+
+    routes = {}
+    for pattern in iter_patterns(urls.urlpatterns):
+        if not pattern.name or 'format' in pattern.pattern.regex.groupindex:
+            continue
+        routes[pattern.name] = (list(pattern.pattern.regex.groupindex), allowed_methods(pattern.callback))
+    return routes
+
+
+def resource(name):
+    # 'post-detail', 'async-post-detail' -> 'post'
+    return name[len('async-'):].split('-')[0] if name.startswith('async-') else name.split('-')[0]
+
+
+def build_scenarios(routes, fixture):
+    from django.urls import reverse
+    from django.utils.encoding import iri_to_uri
+
+    def kwargs_for(name, names):
+        values = {
+            'board_pk': fixture['board'],
+            'post_pk': fixture['post'],
+            'pk': fixture.get(resource(name), fixture['post']),
+            **ROUTE_KWARGS,
+        }
+        return {key: values[key] for key in names}
+
+    scenarios = []
+    for name, (names, methods) in sorted(routes.items()):
+        path = reverse(name, kwargs=kwargs_for(name, names))
+
+        if 'get' in methods:
+            for query in VARIANTS.get(name, ['']):
+                label = f'{name}?{query}' if query else name
+                url = iri_to_uri(f'{path}?{query}') if query else path
+                scenarios.append(Scenario(label, 'GET', lambda i, p=url: (p, None)))
+
+        basename = resource(name)
+        if name.endswith('-list') and 'post' in methods:
+            scenarios.append(Scenario(name, 'POST', lambda i, p=path, b=BODIES[basename]: (p, b)))
+        elif name.endswith('-detail') and 'patch' in methods:
+            field = 'text' if basename == 'comment' else 'title'
+            scenarios.append(Scenario(name, 'PATCH', lambda i, p=path, f=field: (p, {f: f'bench {i}'})))
+        elif name.endswith('-like') and 'post' in methods:
+            # 좋아요 / 취소를 번갈아 보낸다.
+            scenarios.append(Scenario(name, 'POST+DELETE', lambda i, p=path: (p, None)))
+        elif name.endswith('-like-batch'):
+            pk = fixture[basename]
+            scenarios.append(Scenario(name, 'POST', lambda i, p=path, pk=pk: (p, [{'pk': pk, 'like': i % 2 == 0}])))
+        elif name.endswith('-bulk'):
+            scenarios.append(Scenario(name, 'POST', lambda i, p=path, b=[BODIES[basename]] * 10: (p, b)))
+    return scenarios
+
+
+def request_method(scenario, i):
+    if scenario.method == 'POST+DELETE':
+        return 'POST' if i % 2 == 0 else 'DELETE'
+    return scenario.method
+
+
+def scenario_workers(scenario, concurrency):
+    # 쓰기는 순서대로 보낸다. 좋아요 토글은 순서가 결과를 바꾸고, 메모리 SQLite(shared cache)는
+    # 쓰기 잠금을 기다리지 않고 바로 "table is locked" 로 실패한다.
+    return concurrency if scenario.method == 'GET' else 1
+
+
+def parse_queries(server_timing):
+    match = SERVER_TIMING_QUERIES.search(server_timing or '')
+    return int(match.group(1)) if match else None
+
+
+def response_size(response):
+    # 스트리밍 응답(export)은 끝까지 읽어야 전체 시간이 잡힌다.
+    if response.streaming:
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+class ClientDriver:
+    name = 'client'
+
+    def __init__(self, user, concurrency):
+        from django.test import Client
+
+        self.client = Client()
+        self.client.force_login(user)
+        self.concurrency = 1
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def run(self, scenario, count):
+        results = []
+        for i in range(count):
+            path, body = scenario.make_request(i)
+            method = request_method(scenario, i).lower()
+            kwargs = {'data': json.dumps(body), 'content_type': 'application/json'} if body is not None else {}
+            start = time.perf_counter()
+            response = getattr(self.client, method)(path, **kwargs)
+            size = response_size(response)
+            elapsed = (time.perf_counter() - start) * 1000
+            results.append((response.status_code, elapsed, parse_queries(response.get('Server-Timing')), size))
+        return results
+
+
+class HTTPDriver:
+    # 실제 소켓 위의 서버에 요청을 보내는 드라이버의 공통 부분
+
+    def __init__(self, user, concurrency):
+        from django.test import Client
+
+        from django.middleware.csrf import _get_new_csrf_token
+
+        client = Client()
+        client.force_login(user)
+        # 세션 인증은 쓰기 요청에 CSRF 토큰을 요구한다 (테스트 Client 는 검사를 끈다).
+        self.csrf_token = _get_new_csrf_token()
+        self.cookie = f'sessionid={client.cookies["sessionid"].value}; csrftoken={self.csrf_token}'
+        self.concurrency = concurrency
+        self.host = '127.0.0.1'
+        self.port = None
+
+    def send(self, method, path, body):
+        connection = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        headers = {'Cookie': self.cookie, 'X-CSRFToken': self.csrf_token}
+        payload = None
+        if body is not None:
+            payload = json.dumps(body).encode()
+            headers['Content-Type'] = 'application/json'
+
+        start = time.perf_counter()
+        connection.request(method, path, body=payload, headers=headers)
+        response = connection.getresponse()
+        content = response.read()
+        elapsed = (time.perf_counter() - start) * 1000
+        connection.close()
+        return response.status, elapsed, parse_queries(response.getheader('Server-Timing')), len(content)
+
+    def run(self, scenario, count):
+        def one(i):
+            path, body = scenario.make_request(i)
+            return self.send(request_method(scenario, i), path, body)
+
+        workers = scenario_workers(scenario, self.concurrency)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(one, range(count)))
+
+
+class WSGIDriver(HTTPDriver):
+    name = 'wsgi'
+
+    def start(self):
+        from socketserver import ThreadingMixIn
+        from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+        from django.core.wsgi import get_wsgi_application
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, *args):
+                pass
+
+        class ThreadingWSGIServer(ThreadingMixIn, WSGIServer):
+            daemon_threads = True
+
+        self.server = make_server(self.host, 0, get_wsgi_application(),
+                                  server_class=ThreadingWSGIServer, handler_class=QuietHandler)
+        self.port = self.server.server_port
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class UvicornDriver(HTTPDriver):
+    name = 'asgi'
+
+    def start(self):
+        import uvicorn
+
+        from django.core.asgi import get_asgi_application
+
+        with socket.socket() as sock:
+            sock.bind((self.host, 0))
+            self.port = sock.getsockname()[1]
+
+        config = uvicorn.Config(get_asgi_application(), host=self.host, port=self.port, log_level='warning')
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+
+    def stop(self):
+        self.server.should_exit = True
+        self.thread.join()
+
+
+class AsyncClientDriver:
+    name = 'asgi'
+
+    def __init__(self, user, concurrency):
+        from django.test import AsyncClient
+
+        self.client = AsyncClient()
+        self.client.force_login(user)
+        self.concurrency = concurrency
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def run(self, scenario, count):
+        from asgiref.sync import sync_to_async
+
+        async def one(i, semaphore):
+            path, body = scenario.make_request(i)
+            method = request_method(scenario, i).lower()
+            kwargs = {}
+            if body is not None:
+                payload = json.dumps(body).encode()
+                # Django 3.1 의 AsyncRequestFactory 는 content-length 헤더를 잘못 만들므로 직접 넣는다.
+                kwargs = {'data': payload, 'content_type': 'application/json', 'headers': [
+                    (b'host', b'testserver'),
+                    (b'content-length', str(len(payload)).encode()),
+                    (b'content-type', b'application/json'),
+                ]}
+            async with semaphore:
+                start = time.perf_counter()
+                response = await getattr(self.client, method)(path, **kwargs)
+                # 스트리밍 응답은 동기 제너레이터에서 쿼리를 돌리므로 스레드에서 읽는다.
+                size = await sync_to_async(response_size)(response)
+                elapsed = (time.perf_counter() - start) * 1000
+            return response.status_code, elapsed, parse_queries(response.get('Server-Timing')), size
+
+        async def run_all():
+            workers = scenario_workers(scenario, self.concurrency)
+            semaphore = asyncio.Semaphore(workers)
+            if workers == 1:
+                return [await one(i, semaphore) for i in range(count)]
+            return await asyncio.gather(*(one(i, semaphore) for i in range(count)))
+
+        return asyncio.run(run_all())
+
+
+def make_driver(name, user, concurrency):
+    if name == 'client':
+        return ClientDriver(user, concurrency)
+    if name == 'wsgi':
+        return WSGIDriver(user, concurrency)
+    try:
+        import uvicorn  # noqa: F401
+    except ImportError:
+        return AsyncClientDriver(user, concurrency)
+    return UvicornDriver(user, concurrency)
+
+
+def summarize(results, wall_ms):
+    from board.metrics import percentile
+
+    latencies = [elapsed for _, elapsed, _, _ in results]
+    queries = [count for _, _, count, _ in results if count is not None]
+    statuses = Counter(status for status, _, _, _ in results)
+    return {
+        'requests': len(results),
+        'rps': round(len(results) / (wall_ms / 1000), 1) if wall_ms else 0.0,
+        'p50': round(percentile(latencies, 50), 2),
+        'p95': round(percentile(latencies, 95), 2),
+        'p99': round(percentile(latencies, 99), 2),
+        'queries': round(sum(queries) / len(queries), 2) if queries else None,
+        'bytes': round(sum(size for _, _, _, size in results) / len(results)),
+        'status': {str(status): count for status, count in sorted(statuses.items())},
+    }
+
+
+def print_report(report):
+    print(f'{"route":<40} {"n":>5} {"rps":>8} {"p50":>8} {"p95":>8} {"p99":>8} {"q/req":>6}  status')
+    for key, row in report.items():
+        status = ' '.join(f'{code}x{count}' for code, count in row['status'].items())
+        queries = '-' if row['queries'] is None else f'{row["queries"]:g}'
+        print(f'{key:<40} {row["requests"]:>5} {row["rps"]:>8.1f} {row["p50"]:>8.2f} {row["p95"]:>8.2f} '
+              f'{row["p99"]:>8.2f} {queries:>6}  {status}')
+
+
+def compare(report, baseline, threshold):
+    # p95 가 threshold 비율 이상 늘거나, 요청당 쿼리 수가 늘거나, 상태 코드가 바뀌면 회귀로 본다.
+    regressions = []
+    for key, row in report.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        reasons = []
+        if base['p95'] and row['p95'] > base['p95'] * (1 + threshold):
+            reasons.append(f'p95 {base["p95"]:.2f} -> {row["p95"]:.2f} ms')
+        if base['queries'] is not None and row['queries'] is not None and row['queries'] > base['queries']:
+            reasons.append(f'queries {base["queries"]:g} -> {row["queries"]:g}')
+        if set(base['status']) != set(row['status']):
+            reasons.append(f'status {sorted(base["status"])} -> {sorted(row["status"])}')
+        if reasons:
+            regressions.append((key, reasons))
+
+    missing = sorted(set(baseline) - set(report))
+    for key in missing:
+        print(f'missing from this run: {key}')
+    for key, reasons in regressions:
+        print(f'REGRESSION {key}: {"; ".join(reasons)}')
+    if not regressions:
+        print(f'no regressions against baseline (threshold {threshold:.0%})')
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--driver', choices=['client', 'wsgi', 'asgi'], default='client')
+    parser.add_argument('--requests', type=int, default=50, help='requests per route')
+    parser.add_argument('--concurrency', type=int, default=1)
+    parser.add_argument('--users', type=int, default=Volumes.users)
+    parser.add_argument('--boards', type=int, default=Volumes.boards)
+    parser.add_argument('--posts', type=int, default=Volumes.posts)
+    parser.add_argument('--comments', type=int, default=Volumes.comments)
+    parser.add_argument('--likes', type=int, default=Volumes.likes)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--routes', help='comma separated route keys to run, e.g. "GET post-list"')
+    parser.add_argument('--save', help='write the report to this JSON file')
+    parser.add_argument('--compare', help='baseline JSON written by --save')
+    parser.add_argument('--threshold', type=float, default=0.25)
+    args = parser.parse_args()
+
+    setup_django()
+
+    from django.contrib.auth import get_user_model
+    from django.test import override_settings
+
+    from board.models import Boards, Comment, Post
+
+    override_settings(BOARD_METRICS_ENABLED=True, ALLOWED_HOSTS=['testserver', '127.0.0.1']).enable()
+
+    volumes = Volumes(users=args.users, boards=args.boards, posts=args.posts,
+                      comments=args.comments, likes=args.likes)
+    start = time.perf_counter()
+    seeded = seed(volumes, args.seed)
+    print(f'seeded {volumes} in {time.perf_counter() - start:.1f}s')
+
+    # 쓰기 라우트가 권한 오류 없이 돌도록 벤치마크 사용자가 작성한 게시판/게시글/댓글을 고정한다.
+    user = get_user_model().objects.get(pk=seeded.users[0])
+    user.is_staff = True
+    user.save(update_fields=['is_staff'])
+    post = Post.objects.create(author=user, board_id=seeded.boards[0], title='bench', content='게시글 본문')
+    comment = Comment.objects.create(author=user, post=post, text='댓글')
+    other = get_user_model().objects.get(pk=seeded.users[-1])
+    post.like_post.add(other)
+    comment.like_comment.add(other)
+    Post.objects.filter(pk=post.pk).update(like_count=1)
+    Comment.objects.filter(pk=comment.pk).update(like_count=1)
+    Boards.objects.filter(pk=seeded.boards[0]).update(author=user)
+    fixture = {'board': seeded.boards[0], 'post': post.pk, 'comment': comment.pk}
+
+    scenarios = build_scenarios(discover_routes(), fixture)
+    if args.routes:
+        wanted = {key.strip() for key in args.routes.split(',')}
+        scenarios = [scenario for scenario in scenarios if scenario.key in wanted]
+
+    driver = make_driver(args.driver, user, args.concurrency)
+    driver.start()
+    # 4xx 응답마다 찍히는 django.request 경고가 결과 표를 가리지 않게 한다.
+    # (get_wsgi_application / get_asgi_application 이 로깅 설정을 다시 하므로 서버를 띄운 뒤에 둔다.)
+    logging.getLogger('django.request').setLevel(logging.ERROR)
+    report = {}
+    try:
+        for scenario in scenarios:
+            start = time.perf_counter()
+            results = driver.run(scenario, args.requests)
+            report[scenario.key] = summarize(results, (time.perf_counter() - start) * 1000)
+    finally:
+        driver.stop()
+
+    print(f'driver={driver.name} concurrency={driver.concurrency} requests/route={args.requests}')
+    print_report(report)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'driver': driver.name, 'volumes': vars(volumes), 'results': report}, f, indent=2,
+                      ensure_ascii=False)
+        print(f'saved {args.save}')
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('driver') != driver.name:
+            print(f'warning: baseline driver is {baseline.get("driver")}, this run is {driver.name}')
+        if compare(report, baseline['results'], args.threshold):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Bulk factories that seed a benchmark database with reproducible volumes."""
+import random
+from io import StringIO
+from dataclasses import dataclass
+
+BATCH_SIZE = 500
+
+
+@dataclass
+class Volumes:
+    users: int = 20
+    boards: int = 5
+    posts: int = 1000
+    comments: int = 5000
+    likes: int = 5000
+
+
+@dataclass
+class Seeded:
+    users: list
+    boards: list
+    posts: list
+    comments: list
+
+
+def bulk_pks(model, objs):
+    # SQLite 는 bulk_create 결과에 id 를 채워주지 않으므로 새로 생긴 구간을 다시 읽는다.
+    last = model.objects.order_by('-id').values_list('id', flat=True).first() or 0
+    model.objects.bulk_create(objs, batch_size=BATCH_SIZE)
+    return list(model.objects.filter(id__gt=last).order_by('id').values_list('id', flat=True))
+
+
+def seed(volumes, rng_seed=0):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.hashers import make_password
+    from django.core.management import call_command
+    from django.db import transaction
+
+    from board.likes import refresh_like_count
+    from board.models import Boards, Comment, Post
+
+    User = get_user_model()
+    rng = random.Random(rng_seed)
+    password = make_password('bench_password')
+
+    with transaction.atomic():
+        users = bulk_pks(User, [User(username=f'bench{i}', password=password) for i in range(volumes.users)])
+        boards = bulk_pks(Boards, [
+            Boards(author_id=rng.choice(users), title=f'board {i}') for i in range(volumes.boards)
+        ])
+        posts = bulk_pks(Post, [
+            Post(author_id=rng.choice(users), board_id=rng.choice(boards),
+                 title=f'post {i}', content=f'게시글 본문 {i} ' * rng.randint(5, 50))
+            for i in range(volumes.posts)
+        ])
+        comments = bulk_pks(Comment, [
+            Comment(author_id=rng.choice(users), post_id=rng.choice(posts), text=f'댓글 {i} ' * rng.randint(1, 10))
+            for i in range(volumes.comments)
+        ]) if posts else []
+
+        # 좋아요는 (사용자, 대상) 쌍이 겹치지 않도록 뽑고 절반은 게시글, 절반은 댓글에 준다.
+        for model, targets in ((Post, posts), (Comment, comments)):
+            relation = Post.like_post if model is Post else Comment.like_comment
+            field = relation.field
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            wanted = min(volumes.likes // 2, len(users) * len(targets))
+            pairs = set()
+            while len(pairs) < wanted:
+                pairs.add((rng.choice(targets), rng.choice(users)))
+            relation.through.objects.bulk_create(
+                [relation.through(**{f'{source}_id': obj, f'{target}_id': user}) for obj, user in pairs],
+                batch_size=BATCH_SIZE,
+            )
+            refresh_like_count(model.objects.all())
+
+    call_command('rebuild_search_index', stdout=StringIO())
+    return Seeded(users=users, boards=boards, posts=posts, comments=comments)
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class BoardConfig(AppConfig):
     name = 'board'
+
+    def ready(self):
+        from . import db, search, stats, trending  # noqa: F401 SQLite PRAGMA / 검색 색인 / 게시판 통계 / 인기 점수 signal 등록
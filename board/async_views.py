@@ -0,0 +1,172 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from django.http import JsonResponse
+from rest_framework.exceptions import NotAuthenticated, NotFound, Throttled, ValidationError
+from rest_framework.request import Request
+
+from . import throttling
+from .likes import LIKE_RELATIONS, liked_ids
+from .models import Boards, Comment, Post
+from .pagination import OffsetPagination
+from .serializers import AuthorSerializer, BoardSerializer, CommentSerializer, PostSerializer
+
+
+def run_query(func):
+    # ORM 은 동기 코드이므로 스레드 풀에서 돌리고, 요청 스레드가 아니어서 request_finished 로 닫히지 않는
+    # 그 스레드의 연결은 직접 정리한다.
+    def wrapper(*args, **kwargs):
+        try:
+            return func(*args, **kwargs)
+        finally:
+            close_old_connections()
+
+    # thread_sensitive=False : 서로 독립적인 쿼리를 서로 다른 스레드에서 동시에 실행한다.
+    return sync_to_async(wrapper, thread_sensitive=False)
+
+
+def json_response(data, status=200):
+    return JsonResponse(data, status=status, safe=False, json_dumps_params={'ensure_ascii': False})
+
+
+def error_response(exception):
+    detail = exception.detail
+    return json_response(detail if isinstance(detail, list) else {'detail': detail}, status=exception.status_code)
+
+
+def throttled_response(wait):
+    # DRF 의 Throttled 처리와 같은 본문과 Retry-After
+    exception = Throttled(wait)
+    response = error_response(exception)
+    response['Retry-After'] = '%d' % exception.wait
+    return response
+
+
+def resolve_user(request):
+    # AuthenticationMiddleware 의 request.user 는 지연 객체라 처음 접근할 때 세션/사용자를 조회한다.
+    # 같은 스레드 호출에서 읽기 예산의 토큰도 꺼낸다. (사용자, 기다릴 초)
+    if not request.user.is_authenticated:
+        return request.user, 0
+    return request.user, throttling.take('read', f'user:{request.user.pk}')
+
+
+class AsyncReadView:
+    # DRF ViewSet 과 같은 응답을 내는 조회 전용 비동기 뷰.
+    # 목록은 count / 페이지 / 좋아요 집합을 동시에 조회한다. (ETag, 캐시, ?fields= 는 동기 뷰에서만 지원)
+    model = None
+    serializer_class = None
+    select_related = ('author',)
+
+    def get_queryset(self, **kwargs):
+        return self.model.objects.select_related(*self.select_related)
+
+    def as_view(self, action):
+        async def view(request, **kwargs):
+            user, wait = await run_query(resolve_user)(request)
+            if not user.is_authenticated:
+                # 세션 인증만 쓰므로 DRF 와 같이 401 대신 403 을 돌려준다.
+                return json_response({'detail': NotAuthenticated().detail}, status=403)
+            if wait:
+                return throttled_response(wait)
+            try:
+                return await getattr(self, action)(request, **kwargs)
+            except (NotFound, ValidationError) as exception:
+                return error_response(exception)
+
+        view.__name__ = f'{type(self).__name__}.{action}'
+        return view
+
+    def is_likeable(self):
+        return self.model in (Post, Comment)
+
+    def serializer_context(self, request, liked=None):
+        context = {'request': request}
+        if liked is not None:
+            context['liked_ids'] = {self.model: liked}
+        return context
+
+    async def list(self, request, **kwargs):
+        drf_request = Request(request)
+        paginator = OffsetPagination()
+        limit = paginator.get_limit(drf_request)
+        offset = paginator.get_offset(drf_request)
+
+        queryset = self.get_queryset(**kwargs)
+        page_ids = queryset.order_by('-id').values('pk')[offset:offset + limit]
+
+        queries = [
+            run_query(queryset.order_by().count)(),
+            run_query(lambda: list(queryset[offset:offset + limit]))(),
+        ]
+        if self.is_likeable():
+            # 페이지 id 를 서브쿼리로 넘겨서 페이지 조회를 기다리지 않고 좋아요 집합을 함께 가져온다.
+            queries.append(run_query(liked_ids)(self.model, request.user, page_ids))
+        count, page, *liked = await asyncio.gather(*queries)
+
+        paginator.request = drf_request
+        paginator.limit, paginator.offset, paginator.count = limit, offset, count
+        serializer = self.serializer_class(page, many=True,
+                                           context=self.serializer_context(request, *liked))
+        return json_response({
+            'count': count,
+            'next': paginator.get_next_link(),
+            'previous': paginator.get_previous_link(),
+            'results': serializer.data,
+        })
+
+    async def retrieve(self, request, pk, **kwargs):
+        queries = [run_query(lambda: self.get_queryset(**kwargs).filter(pk=pk).first())()]
+        if self.is_likeable():
+            queries.append(run_query(liked_ids)(self.model, request.user, [pk]))
+        obj, *liked = await asyncio.gather(*queries)
+
+        if obj is None:
+            raise NotFound()
+        serializer = self.serializer_class(obj, context=self.serializer_context(request, *liked))
+        return json_response(serializer.data)
+
+    async def like_list(self, request, pk, **kwargs):
+        exists, users = await asyncio.gather(
+            run_query(self.get_queryset(**kwargs).filter(pk=pk).exists)(),
+            run_query(self.likers)(pk),
+        )
+        if not exists:
+            raise NotFound()
+        if not users:
+            raise ValidationError('post like not exists')
+        return json_response(users)
+
+    def likers(self, pk):
+        users = list(getattr(self.model(pk=pk), LIKE_RELATIONS[self.model].field.name).all())
+        serializer = AuthorSerializer(data=users, many=True)
+        serializer.is_valid()
+        return serializer.data
+
+
+class AsyncBoardView(AsyncReadView):
+    model = Boards
+    serializer_class = BoardSerializer
+    select_related = ('author', 'stats')
+
+
+class AsyncPostView(AsyncReadView):
+    model = Post
+    serializer_class = PostSerializer
+
+    def get_queryset(self, board_pk, **kwargs):
+        return super().get_queryset().filter(board_id=board_pk, board__deleted_at__isnull=True)
+
+
+class AsyncCommentView(AsyncReadView):
+    model = Comment
+    serializer_class = CommentSerializer
+
+    def get_queryset(self, post_pk, **kwargs):
+        return super().get_queryset().filter(post_id=post_pk, post__deleted_at__isnull=True,
+                                             post__board__deleted_at__isnull=True)
+
+
+boards = AsyncBoardView()
+posts = AsyncPostView()
+comments = AsyncCommentView()
@@ -0,0 +1,166 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from . import cache, events, like_buffer, search, stats, tombstones, trending
+from .likes import apply_likes
+
+
+def bulk_insert(model, objs, **scope):
+    objs = model.objects.bulk_create(objs, batch_size=500)
+    if connection.features.can_return_rows_from_bulk_insert:
+        return objs
+
+    # SQLite 는 bulk_create 결과에 id 를 채워주지 않는다. 같은 트랜잭션에서 쓰기 잠금을 잡고 있으므로
+    # scope 안의 마지막 len(objs) 개가 방금 넣은 행이다.
+    pks = list(model.objects.filter(**scope).order_by('-id').values_list('id', flat=True)[:len(objs)])
+    for obj, pk in zip(objs, reversed(pks)):
+        obj.pk = pk
+        obj._state.adding = False
+    return objs
+
+
+class BulkMixin:
+    bulk_update_fields = ()
+
+    def get_bulk_save_kwargs(self):
+        raise NotImplementedError
+
+    def get_write_scopes(self):
+        raise NotImplementedError
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError('expected a list')
+        if len(items) > getattr(settings, 'BOARD_BULK_MAX_ITEMS', 1000):
+            raise ValidationError('too many items')
+        return items
+
+    @action(detail=False, methods=['POST'], url_path='bulk')
+    def bulk(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        save_kwargs = self.get_bulk_save_kwargs()
+        serializer = self.get_serializer(data=items, many=True)
+        serializer.is_valid(raise_exception=True)
+
+        model = self.get_queryset().model
+        with transaction.atomic():
+            objs = bulk_insert(
+                model,
+                [model(**data, **save_kwargs) for data in serializer.validated_data],
+                **save_kwargs,
+            )
+            # bulk_create/bulk_update 는 post_save 를 보내지 않으므로 검색 색인, 인기 점수, 게시판 통계를 직접 갱신한다.
+            search.index_objects(model, objs)
+            trending.record_created(model, objs)
+            stats.record_created(model, objs)
+        cache.invalidate(*self.get_write_scopes())
+        events.publish(model, 'created', [obj.pk for obj in objs])
+
+        serializer = self.get_serializer(objs, many=True)
+        return Response(data=serializer.data, status=status.HTTP_201_CREATED)
+
+    @bulk.mapping.patch
+    def bulk_update(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        pks = [item.get('pk') for item in items if isinstance(item, dict) and isinstance(item.get('pk'), int)]
+        objs = self.get_queryset().in_bulk(pks)
+        now = timezone.now()
+
+        results = []
+        updated = []
+        for item in items:
+            pk = item.get('pk') if isinstance(item, dict) else None
+            obj = objs.get(pk)
+            if obj is None:
+                results.append({'pk': pk, 'status': status.HTTP_404_NOT_FOUND})
+                continue
+            if obj.author_id != request.user.pk:
+                results.append({'pk': pk, 'status': status.HTTP_403_FORBIDDEN, 'detail': '접근권한이 없습니다.'})
+                continue
+
+            serializer = self.get_serializer(obj, data=item, partial=True)
+            if not serializer.is_valid():
+                results.append({'pk': pk, 'status': status.HTTP_400_BAD_REQUEST, 'errors': serializer.errors})
+                continue
+
+            for attr, value in serializer.validated_data.items():
+                setattr(obj, attr, value)
+            obj.updated_at = now
+            updated.append(obj)
+            results.append({'pk': pk, 'status': status.HTTP_200_OK})
+
+        if updated:
+            with transaction.atomic():
+                self.get_queryset().model.objects.bulk_update(
+                    updated, [*self.bulk_update_fields, 'updated_at'], batch_size=500)
+                search.index_objects(self.get_queryset().model, updated)
+            cache.invalidate(*self.get_write_scopes())
+            events.publish(self.get_queryset().model, 'updated', [obj.pk for obj in updated])
+
+        data = iter(self.get_serializer(updated, many=True).data)
+        for result in results:
+            if result['status'] == status.HTTP_200_OK:
+                result['data'] = next(data)
+        return Response(data=results, status=status.HTTP_200_OK)
+
+    @bulk.mapping.delete
+    def bulk_destroy(self, request, *args, **kwargs):
+        pks = self.get_bulk_items(request)
+        if not all(isinstance(pk, int) for pk in pks):
+            raise ValidationError('expected a list of ids')
+        authors = dict(self.get_queryset().filter(pk__in=pks).values_list('pk', 'author_id'))
+
+        results = []
+        allowed = []
+        for pk in pks:
+            if pk not in authors:
+                results.append({'pk': pk, 'status': status.HTTP_404_NOT_FOUND})
+            elif authors[pk] != request.user.pk:
+                results.append({'pk': pk, 'status': status.HTTP_403_FORBIDDEN, 'detail': '접근권한이 없습니다.'})
+            else:
+                allowed.append(pk)
+                results.append({'pk': pk, 'status': status.HTTP_204_NO_CONTENT})
+
+        if allowed:
+            tombstones.soft_delete(self.get_queryset().model, allowed)
+            cache.invalidate(*self.get_write_scopes())
+            events.publish(self.get_queryset().model, 'deleted', allowed)
+        return Response(data=results, status=status.HTTP_200_OK)
+
+    @action(detail=False, methods=['POST'], url_path='likes')
+    def like_batch(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        states = {}
+        for item in items:
+            if not isinstance(item, dict) or not isinstance(item.get('pk'), int) or not isinstance(item.get('like'), bool):
+                raise ValidationError('expected a list of {"pk": int, "like": bool}')
+            states[item['pk']] = item['like']
+
+        model = self.get_queryset().model
+        found = set(self.get_queryset().filter(pk__in=list(states)).values_list('pk', flat=True))
+        found_states = {pk: like for pk, like in states.items() if pk in found}
+        if like_buffer.is_enabled():
+            changed = like_buffer.toggle_many(model, request.user, found_states)
+        else:
+            added, removed = apply_likes(model, request.user, found_states)
+            changed = added + removed
+        if changed:
+            cache.invalidate(*self.get_write_scopes())
+            events.publish_likes(model, changed)
+
+        counts = dict(model.objects.filter(pk__in=found).values_list('pk', 'like_count'))
+        for pk, delta in like_buffer.count_deltas(model, found).items():
+            counts[pk] += delta
+        results = []
+        for pk, like in states.items():
+            if pk in found:
+                results.append({'pk': pk, 'status': status.HTTP_200_OK, 'is_like': like, 'like_count': counts[pk]})
+            else:
+                results.append({'pk': pk, 'status': status.HTTP_404_NOT_FOUND})
+        return Response(data=results, status=status.HTTP_200_OK)
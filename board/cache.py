@@ -0,0 +1,157 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from .likes import liked_ids
+from .middleware import route_name
+from .serializers import LikeableSerializer
+
+
+def get_cache():
+    return caches[getattr(settings, 'BOARD_CACHE_ALIAS', 'default')]
+
+
+def is_enabled():
+    return getattr(settings, 'BOARD_CACHE_ENABLED', False)
+
+
+def version_key(scope):
+    return f'board:version:{scope}'
+
+
+def get_versions(scopes):
+    cache = get_cache()
+    keys = [version_key(scope) for scope in scopes]
+    versions = cache.get_many(keys)
+
+    for key in keys:
+        if key not in versions:
+            # 버전 키가 사라졌을 때 예전 항목이 되살아나지 않도록 시각 기반 값으로 시작한다.
+            cache.add(key, time.time_ns(), None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump(*scopes):
+    cache = get_cache()
+    for scope in scopes:
+        try:
+            cache.incr(version_key(scope))
+        except ValueError:
+            cache.add(version_key(scope), time.time_ns(), None)
+
+
+def invalidate(*scopes):
+    # 지금 한 번, 커밋 후 한 번 올려서 커밋 전의 데이터가 새 버전으로 저장되는 경우를 막는다.
+    if not is_enabled():
+        return
+    bump(*scopes)
+    transaction.on_commit(lambda: bump(*scopes))
+
+
+def object_identity(obj):
+    # 목록 fast path 는 모델 대신 values() 행(dict)을 페이지로 넘긴다.
+    if isinstance(obj, dict):
+        return obj['id'], obj['author']
+    return obj.pk, obj.author_id
+
+
+class CacheStats:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def record(self, route, hit):
+        with self._lock:
+            self._counts[route]['hits' if hit else 'misses'] += 1
+
+    def summary(self):
+        with self._lock:
+            return {route: dict(counts) for route, counts in sorted(self._counts.items())}
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+
+
+stats = CacheStats()
+
+
+class VersionedCacheMixin:
+    # 사용자와 무관한 응답을 캐시하고, is_author / is_like 는 히트 후에 덮어쓴다.
+
+    def get_cache_scopes(self):
+        raise NotImplementedError
+
+    def is_cacheable(self, request):
+        return True
+
+    def get_cache_key(self, request):
+        versions = ':'.join(str(version) for version in get_versions(self.get_cache_scopes()))
+        path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+        return f'board:response:{versions}:{path}'
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        self._cached_objects = page
+        return page
+
+    def get_object(self):
+        obj = super().get_object()
+        self._cached_objects = [obj]
+        return obj
+
+    def cached_response(self, view, request, *args, **kwargs):
+        if not is_enabled() or not self.is_cacheable(request):
+            return view(request, *args, **kwargs)
+
+        cache = get_cache()
+        key = self.get_cache_key(request)
+        entry = cache.get(key)
+        stats.record(route_name(request), entry is not None)
+
+        if entry is not None:
+            response = Response(data=self.overlay(entry), status=200)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        response = view(request, *args, **kwargs)
+        if response.status_code == 200:
+            objects = getattr(self, '_cached_objects', None) or []
+            entry = {
+                'data': response.data,
+                'objects': [object_identity(obj) for obj in objects],
+            }
+            cache.set(key, entry, getattr(settings, 'BOARD_CACHE_TIMEOUT', 300))
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def overlay(self, entry):
+        data = entry['data']
+        items = data['results'] if 'results' in data else [data]
+        user = self.request.user
+
+        liked = None
+        if issubclass(self.get_serializer_class(), LikeableSerializer):
+            model = self.get_serializer_class().Meta.model
+            liked = liked_ids(model, user, [pk for pk, _ in entry['objects']])
+
+        for item, (pk, author_id) in zip(items, entry['objects']):
+            if 'is_author' in item:
+                item['is_author'] = author_id == user.pk
+            if liked is not None and 'is_like' in item:
+                item['is_like'] = pk in liked
+        return data
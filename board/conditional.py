@@ -0,0 +1,100 @@
+import hashlib
+import json
+
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import like_buffer, likes
+
+
+def strip_weak(etag):
+    return etag[2:] if etag.startswith('W/') else etag
+
+
+def etag_matches(etag, header):
+    etags = parse_etags(header)
+    if '*' in etags:
+        return True
+    return strip_weak(etag) in {strip_weak(tag) for tag in etags}
+
+
+class ConditionalGetMixin:
+    # 본문을 직렬화하기 전에 validator 쿼리로 ETag 를 계산해 304 를 돌려준다.
+    # 좋아요/삭제는 updated_at 을 바꾸지 않으므로 Last-Modified 는 쓰지 않고 ETag 만 비교한다.
+    # validator_relations: 응답에 함께 나가는 관계(예: 게시판 통계)의 updated_at 도 validator 에 넣는다.
+    validator_relations = ()
+
+    def get_validator_rows(self, queryset):
+        # 응답에 나가는 행마다 (id, updated_at, like_count, 본인 좋아요 여부)를 고른다.
+        fields = ['id', 'updated_at']
+        if hasattr(queryset.model, 'like_count'):
+            fields.append('like_count')
+            if self.request.user.is_authenticated:
+                queryset = queryset.annotate(liked=likes.liked_exists(queryset.model, self.request.user))
+                fields.append('liked')
+        fields.extend(f'{relation}__updated_at' for relation in self.validator_relations)
+        if 'total' in queryset.query.annotations:
+            fields.append('total')
+        return list(queryset.values(*fields))
+
+    def get_list_validator(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        window = queryset
+        page_window = getattr(self.paginator, 'page_window', None)
+        if page_window is not None:
+            # 전체가 아니라 현재 페이지 범위의 행만 읽는다.
+            window = page_window(queryset, self.request)
+
+        rows = self.get_validator_rows(window)
+        validator = {'rows': rows}
+        if 'total' in window.query.annotations:
+            # offset 페이지네이션은 같은 쿼리에서 얻은 전체 개수를 쓴다. (빈 페이지면 따로 센다)
+            validator['count'] = rows[0]['total'] if rows else queryset.count()
+            for row in rows:
+                del row['total']
+        return validator
+
+    def get_detail_validator(self):
+        queryset = self.get_queryset().order_by().filter(pk=self.kwargs[self.lookup_url_kwarg or self.lookup_field])
+        # pk 로 한 행만 고르므로 정렬하지 않는다. (first() 의 ORDER BY 는 관계를 JOIN 하면 임시 정렬을 만든다)
+        rows = self.get_validator_rows(queryset[:1])
+        return rows[0] if rows else None
+
+    def list(self, request, *args, **kwargs):
+        validator = self.get_list_validator()
+        # offset 페이지네이션은 validator 에서 얻은 count 를 그대로 쓴다.
+        self.known_count = validator.get('count')
+        return self.conditional_response(validator, super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        validator = self.get_detail_validator()
+        if validator is None:
+            return super().retrieve(request, *args, **kwargs)
+        return self.conditional_response(validator, super().retrieve, request, *args, **kwargs)
+
+    def make_etag(self, request, validator):
+        payload = json.dumps(
+            [request.user.pk, request.get_full_path(), sorted(validator.items())],
+            default=str,
+        )
+        return quote_etag(hashlib.md5(payload.encode()).hexdigest())
+
+    def is_not_modified(self, request, etag):
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        return bool(if_none_match) and etag_matches(etag, if_none_match)
+
+    def conditional_response(self, validator, view, request, *args, **kwargs):
+        if like_buffer.is_enabled():
+            # 버퍼에 쌓인 좋아요는 아직 DB 에 보이지 않으므로 버퍼 revision 을 함께 넣는다.
+            validator = {**validator, 'like_buffer': like_buffer.revision()}
+        etag = self.make_etag(request, validator)
+
+        if self.is_not_modified(request, etag):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = view(request, *args, **kwargs)
+
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED):
+            response['ETag'] = etag
+        return response
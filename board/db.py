@@ -0,0 +1,175 @@
+import random
+import threading
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from rest_framework.permissions import SAFE_METHODS
+
+# 연결마다 적용하는 SQLite PRAGMA 묶음. BOARD_DB_PRAGMAS 로 항목별로 덮어쓴다.
+PROFILES = {
+    'stock': {},
+    'production': {
+        # 읽기와 쓰기가 서로 막지 않는다. (DB 파일에 남는 설정)
+        'journal_mode': 'WAL',
+        # WAL 에서는 NORMAL 로도 커밋이 깨지지 않는다. (전원 장애 시 마지막 커밋만 잃을 수 있음)
+        'synchronous': 'NORMAL',
+        # 잠금을 만나면 바로 database is locked 를 내지 않고 기다리는 시간(ms)
+        'busy_timeout': 5000,
+        # 음수는 KiB 단위 (64MB)
+        'cache_size': -64000,
+        'mmap_size': 256 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+    },
+}
+
+_read_alias = ContextVar('board_read_alias', default=None)
+
+# 쓰기 뒤에 이 쿠키가 살아 있는 동안은 복제 지연과 상관없이 자기 글을 보도록 primary 에서 읽는다.
+STICKY_COOKIE = 'board_primary'
+
+
+def get_pragmas():
+    profile = getattr(settings, 'BOARD_DB_PROFILE', 'stock')
+    return {**PROFILES[profile], **getattr(settings, 'BOARD_DB_PRAGMAS', {})}
+
+
+def replica_aliases():
+    return [alias for alias in getattr(settings, 'BOARD_DB_REPLICAS', []) if alias in connections.databases]
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    if connection.vendor != 'sqlite':
+        return
+    # Django 커서를 거치지 않아 쿼리 로그/메트릭에 잡히지 않는다.
+    for name, value in get_pragmas().items():
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    if connection.alias in replica_aliases():
+        # 읽기 전용 연결로 쓰기가 새지 않게 막는다.
+        connection.connection.execute('PRAGMA query_only = ON')
+
+
+class ReplicaHealth:
+    # 복제본마다 마지막 확인 결과를 BOARD_DB_REPLICA_CHECK_INTERVAL 초 동안 재사용한다.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked = {}
+
+    def is_healthy(self, alias):
+        interval = getattr(settings, 'BOARD_DB_REPLICA_CHECK_INTERVAL', 5)
+        checked = self._checked.get(alias)
+        if checked is not None and time.monotonic() - checked[0] < interval:
+            return checked[1]
+
+        healthy = self.probe(alias)
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), healthy)
+        return healthy
+
+    def probe(self, alias):
+        # 빈 파일도 열리는 SQLite 를 위해 마이그레이션된 테이블까지 읽어 본다.
+        try:
+            with connections[alias].cursor() as cursor:
+                cursor.execute('SELECT 1 FROM django_migrations LIMIT 1')
+            return True
+        except DatabaseError:
+            connections[alias].close()
+            return False
+
+    def mark_down(self, alias):
+        with self._lock:
+            self._checked[alias] = (time.monotonic(), False)
+
+    def reset(self):
+        with self._lock:
+            self._checked.clear()
+
+
+health = ReplicaHealth()
+
+
+def choose_replica():
+    replicas = [alias for alias in replica_aliases() if health.is_healthy(alias)]
+    return random.choice(replicas) if replicas else None
+
+
+def is_pinned(request):
+    return request is not None and STICKY_COOKIE in request.COOKIES
+
+
+def pin_primary(response):
+    seconds = getattr(settings, 'BOARD_DB_STICKY_SECONDS', 5)
+    if seconds:
+        response.set_cookie(STICKY_COOKIE, '1', max_age=seconds, httponly=True, samesite='Lax')
+
+
+def replica_for(request=None):
+    # 트랜잭션 안이거나 방금 쓴 사용자의 요청이면 None (primary 에 남는다)
+    if connections[DEFAULT_DB_ALIAS].in_atomic_block or is_pinned(request):
+        return None
+    return choose_replica()
+
+
+def activate_read(request=None):
+    return _read_alias.set(replica_for(request))
+
+
+def deactivate_read(token):
+    _read_alias.reset(token)
+
+
+class ReadRouter:
+    # ReadRoutingMixin 이 고른 복제본으로 그 요청의 읽기를 보내고, 쓰기는 항상 primary(default) 로 보낸다.
+
+    def db_for_read(self, model, **hints):
+        alias = _read_alias.get()
+        if alias is None or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            # 트랜잭션 안에서는 아직 커밋하지 않은 쓰기를 봐야 하므로 default 에서 읽는다.
+            return None
+        return alias
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # 복제본은 primary 와 같은 데이터를 보므로 서로 다른 연결에서 읽은 객체도 관계를 맺을 수 있다.
+        aliases = {DEFAULT_DB_ALIAS, *replica_aliases()}
+        if obj1._state.db in aliases and obj2._state.db in aliases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db in replica_aliases():
+            return False
+        return None
+
+
+class ReadRoutingMixin:
+    # list / retrieve 같은 조회 액션의 쿼리를 복제본으로 보내고, 쓰기에 성공하면 잠시 primary 에 고정한다.
+    read_actions = ('list', 'retrieve')
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.action in self.read_actions and request.method in SAFE_METHODS:
+            self._read_token = activate_read(request)
+
+    def handle_exception(self, exc):
+        alias = _read_alias.get()
+        if alias is not None and isinstance(exc, DatabaseError):
+            # 다음 확인 주기까지 이 복제본을 고르지 않는다.
+            health.mark_down(alias)
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, '_read_token', None)
+        if token is not None:
+            deactivate_read(token)
+            self._read_token = None
+        if request.method not in SAFE_METHODS and response.status_code < 400 and replica_aliases():
+            pin_primary(response)
+        return super().finalize_response(request, response, *args, **kwargs)
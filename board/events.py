@@ -0,0 +1,232 @@
+import asyncio
+import json
+import logging
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from rest_framework import serializers as s
+
+from . import bulk, like_buffer
+from .models import BoardEvent, Comment, Post
+
+logger = logging.getLogger(__name__)
+
+# 모델: (이벤트 이름, 생성/수정 이벤트에 싣는 컬럼, 게시판 id 컬럼, 게시글 id 컬럼)
+SOURCES = {
+    Post: ('post', ('title', 'like_count', 'created_at', 'updated_at'), 'board_id', 'id'),
+    Comment: ('comment', ('text', 'like_count', 'created_at', 'updated_at'), 'post__board_id', 'post_id'),
+}
+
+# 로그를 자르는 간격(이벤트 수)
+TRIM_EVERY = 100
+
+datetime_field = s.DateTimeField()
+
+
+def log_size():
+    return getattr(settings, 'BOARD_EVENT_LOG_SIZE', 10000)
+
+
+def like_window():
+    return getattr(settings, 'BOARD_EVENT_LIKE_WINDOW', 1)
+
+
+def build(model, action, pks):
+    # 한 번의 조회로 pks 의 이벤트를 만든다. (아직 저장하지 않은 BoardEvent 목록)
+    name, fields, board_field, post_field = SOURCES[model]
+    if action in ('created', 'updated', 'restored'):
+        columns = ('author__username', *fields)
+    elif action == 'like':
+        columns = ('like_count',)
+    else:
+        columns = ()
+
+    rows = model.all_objects.filter(pk__in=pks).order_by('pk').values('pk', board_field, post_field, *columns)
+    deltas = like_buffer.count_deltas(model, pks) if 'like_count' in columns else {}
+    events = []
+    for row in rows:
+        data = {'pk': row['pk'], 'board': row[board_field], 'post': row[post_field]}
+        for column in columns:
+            if column == 'author__username':
+                data['author'] = {'username': row[column]}
+            elif column == 'like_count':
+                data[column] = row[column] + deltas.get(row['pk'], 0)
+            elif column in ('created_at', 'updated_at'):
+                data[column] = datetime_field.to_representation(row[column])
+            else:
+                data[column] = row[column]
+        events.append(BoardEvent(
+            board_id=row[board_field], post_id=row[post_field], kind=f'{name}.{action}', object_id=row['pk'],
+            data=json.dumps(data, ensure_ascii=False),
+        ))
+    return events
+
+
+def log(events):
+    # 로그에 넣어 id 를 받는다. TRIM_EVERY 번째 id 를 지날 때마다 오래된 이벤트를 지운다.
+    if not events:
+        return events
+    with transaction.atomic():
+        events = bulk.bulk_insert(BoardEvent, events)
+        last = events[-1].pk
+        if last > log_size() and last // TRIM_EVERY != (events[0].pk - 1) // TRIM_EVERY:
+            BoardEvent.objects.filter(pk__lte=last - log_size()).delete()
+    return events
+
+
+def publish(model, action, pks):
+    # 뷰셋이 글/댓글을 만들거나(created) 고치거나(updated) 삭제(deleted)·복구(restored)한 뒤에 부른다.
+    # 로그는 호출한 쪽의 트랜잭션에 넣고 구독자에게는 커밋된 뒤에 보낸다.
+    if not pks:
+        return
+    events = log(build(model, action, list(pks)))
+    transaction.on_commit(lambda: bus.broadcast(events))
+
+
+_likes = set()
+_likes_lock = threading.Lock()
+_likes_timer = None
+
+
+def publish_likes(model, pks):
+    # 좋아요는 몰려 들어오므로 BOARD_EVENT_LIKE_WINDOW 초 동안 모았다가 대상마다 그때의 like_count 하나만 보낸다.
+    pks = list(pks)
+    if pks:
+        transaction.on_commit(lambda: schedule_likes(model, pks))
+
+
+def schedule_likes(model, pks):
+    global _likes_timer
+    window = like_window()
+    with _likes_lock:
+        _likes.update((model, pk) for pk in pks)
+        if window and _likes_timer is None:
+            _likes_timer = threading.Timer(window, flush_likes_in_background)
+            _likes_timer.daemon = True
+            _likes_timer.start()
+    if not window:
+        flush_likes()
+
+
+def flush_likes():
+    # 모아 둔 좋아요 변경을 이벤트로 보낸다. 보낸 이벤트 수
+    global _likes_timer
+    with _likes_lock:
+        pending = list(_likes)
+        _likes.clear()
+        if _likes_timer is not None:
+            _likes_timer.cancel()
+            _likes_timer = None
+
+    events = []
+    for model in SOURCES:
+        pks = [pk for pending_model, pk in pending if pending_model is model]
+        if pks:
+            events.extend(log(build(model, 'like', pks)))
+    bus.broadcast(events)
+    return len(events)
+
+
+def flush_likes_in_background():
+    try:
+        flush_likes()
+    except Exception:
+        logger.exception('like event flush failed')
+    finally:
+        close_old_connections()
+
+
+def last_id():
+    return BoardEvent.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def replay(board_id, post_id, after):
+    # after 뒤의 이벤트와, after 가 로그에서 이미 지워진 범위인지 여부. 좋아요는 대상마다 마지막 것만 남긴다.
+    oldest = BoardEvent.objects.order_by('pk').values_list('pk', flat=True).first()
+    events = BoardEvent.objects.filter(pk__gt=after)
+    if post_id is None:
+        events = events.filter(board_id=board_id)
+    else:
+        events = events.filter(post_id=post_id)
+    events = coalesce(events.order_by('pk')[:log_size()])
+    return events, oldest is not None and after < oldest - 1
+
+
+def event_key(event):
+    return (event.kind, event.object_id) if event.kind.endswith('.like') else event.pk
+
+
+def coalesce(events):
+    latest = {}
+    for event in events:
+        latest.pop(event_key(event), None)
+        latest[event_key(event)] = event
+    return sorted(latest.values(), key=lambda event: event.pk)
+
+
+class Subscriber:
+    # SSE 연결 하나. 다른 스레드에서 발행된 이벤트를 연결의 이벤트 루프로 넘기고,
+    # 아직 보내지 못한 좋아요 이벤트는 대상마다 마지막 것만 남긴다.
+
+    def __init__(self, board_id, post_id=None):
+        self.board_id = board_id
+        self.post_id = post_id
+        self.loop = asyncio.get_running_loop()
+        self.pending = []
+        self.ready = asyncio.Event()
+
+    def matches(self, event):
+        if self.post_id is None:
+            return event.board_id == self.board_id
+        return event.post_id == self.post_id
+
+    def offer(self, events):
+        events = [event for event in events if self.matches(event)]
+        if events:
+            self.loop.call_soon_threadsafe(self.push, events)
+
+    def push(self, events):
+        self.pending = coalesce([*self.pending, *events])
+        self.ready.set()
+
+    async def get(self, timeout):
+        # 이벤트가 올 때까지(최대 timeout 초) 기다린다. 시간이 지나면 빈 목록
+        try:
+            await asyncio.wait_for(self.ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self.ready.clear()
+        events, self.pending = self.pending, []
+        return events
+
+
+class Bus:
+    # 프로세스 안의 구독자에게 이벤트를 나눠준다. 다른 프로세스의 이벤트는 스트림이 로그를 다시 읽어 받는다.
+
+    def __init__(self):
+        self.subscribers = set()
+        self.lock = threading.Lock()
+
+    def subscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.add(subscriber)
+
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            self.subscribers.discard(subscriber)
+
+    def broadcast(self, events):
+        if not events:
+            return
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for subscriber in subscribers:
+            try:
+                subscriber.offer(events)
+            except RuntimeError:
+                # 이벤트 루프가 이미 닫힌 연결
+                self.unsubscribe(subscriber)
+
+
+bus = Bus()
@@ -0,0 +1,82 @@
+from collections import defaultdict
+
+from django.db.models import Count, F, OuterRef, Subquery, Window
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce, RowNumber
+
+from . import likes
+from .models import Comment
+
+
+def comment_count_subquery():
+    # comment(post_id, id) 인덱스만 읽는 상관 서브쿼리
+    counts = (
+        Comment.objects
+        .filter(post=OuterRef('pk'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def latest_comments(post_ids, limit):
+    # 게시글마다 최신 댓글 limit 개를 ROW_NUMBER() 윈도우로 한 번에 가져온다.
+    if not post_ids or limit < 1:
+        return {}
+
+    ranked = (
+        Comment.objects
+        .filter(post_id__in=post_ids)
+        .order_by()
+        .annotate(rank=Window(RowNumber(), partition_by=[F('post_id')], order_by=F('id').desc()))
+        .values('id', 'rank')
+    )
+    sql, params = ranked.query.sql_with_params()
+    comments = (
+        Comment.objects
+        .filter(pk__in=RawSQL(f'SELECT id FROM ({sql}) WHERE rank <= %s', (*params, limit)))
+        .select_related('author')
+        .order_by('-id')
+    )
+
+    grouped = defaultdict(list)
+    for comment in comments:
+        grouped[comment.post_id].append(comment)
+    return grouped
+
+
+def comment_validator(post_ids, limit, user):
+    # 펼친 댓글이 바뀌면 ETag 도 바뀌도록 현재 페이지 게시글들의 최신 댓글 limit 개마다
+    # (게시글, 댓글 수, id, updated_at, like_count, 본인 좋아요 여부)를 고른다. 댓글이 없으면 limit 이 0 이어도 한 개는 본다.
+    if not post_ids:
+        return {'comments': []}
+
+    ranked = (
+        Comment.objects
+        .filter(post_id__in=post_ids)
+        .order_by()
+        .annotate(rank=Window(RowNumber(), partition_by=[F('post_id')], order_by=F('id').desc()))
+        .values('id', 'rank')
+    )
+    sql, params = ranked.query.sql_with_params()
+    counts = (
+        Comment.objects
+        .filter(post=OuterRef('post_id'))
+        .order_by()
+        .values('post')
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    fields = ['post_id', 'count', 'id', 'updated_at', 'like_count']
+    comments = (
+        Comment.objects
+        .filter(pk__in=RawSQL(f'SELECT id FROM ({sql}) WHERE rank <= %s', (*params, max(limit, 1))))
+        .annotate(count=Subquery(counts))
+        .order_by('post_id', '-id')
+    )
+    if user.is_authenticated:
+        comments = comments.annotate(liked=likes.liked_exists(Comment, user))
+        fields.append('liked')
+    return {'comments': list(comments.values_list(*fields))}
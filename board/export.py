@@ -0,0 +1,101 @@
+import csv
+import io
+import zlib
+from itertools import chain
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import Boards, Comment, Post
+
+# 내보내기 이름: (모델, 컬럼). 좋아요는 through 테이블을 그대로 내보낸다.
+# 삭제 표시된 행도 deleted_at 과 함께 내보낸다. 삭제할 때 updated_at 이 바뀌므로 ?since= 증분에도 나온다.
+EXPORTS = {
+    'boards': (Boards, ['id', 'author_id', 'title', 'created_at', 'updated_at', 'deleted_at']),
+    'posts': (Post, ['id', 'board_id', 'author_id', 'title', 'content', 'like_count', 'created_at', 'updated_at',
+                     'deleted_at']),
+    'comments': (Comment, ['id', 'post_id', 'author_id', 'text', 'like_count', 'created_at', 'updated_at',
+                           'deleted_at']),
+    'post_likes': (Post.like_post.through, ['id', 'post_id', 'user_id']),
+    'comment_likes': (Comment.like_comment.through, ['id', 'comment_id', 'user_id']),
+}
+
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def chunk_size():
+    return getattr(settings, 'BOARD_EXPORT_CHUNK_SIZE', 2000)
+
+
+def supports_since(name):
+    model, _ = EXPORTS[name]
+    return any(field.name == 'updated_at' for field in model._meta.fields)
+
+
+def parse_since(value):
+    # ISO 8601. 시간대가 없으면 UTC 로 본다.
+    try:
+        since = parse_datetime(value)
+    except ValueError:
+        return None
+    if since is not None and timezone.is_naive(since):
+        since = timezone.make_aware(since, timezone.utc)
+    return since
+
+
+def get_queryset(name, since=None, after_id=None, using='default'):
+    # id 순으로 읽어 중간에 끊겨도 마지막 id 부터 이어받을 수 있다.
+    model, columns = EXPORTS[name]
+    # through 모델에는 all_objects 가 없다.
+    manager = getattr(model, 'all_objects', model.objects)
+    queryset = manager.using(using).order_by('id')
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    if after_id is not None:
+        queryset = queryset.filter(id__gt=after_id)
+    return queryset.values_list(*columns)
+
+
+def ndjson_lines(columns, rows):
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    for row in rows:
+        yield encoder.encode(dict(zip(columns, row))) + '\n'
+
+
+def csv_lines(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in chain([columns], rows):
+        writer.writerow([value.isoformat() if hasattr(value, 'isoformat') else value for value in row])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def stream(name, fmt='ndjson', since=None, after_id=None, using='default', compress=False):
+    # 한 번에 chunk_size 행만 메모리에 두고 그만큼씩 묶어서 bytes 로 내보낸다.
+    _, columns = EXPORTS[name]
+    size = chunk_size()
+    rows = get_queryset(name, since, after_id, using).iterator(chunk_size=size)
+    lines = ndjson_lines(columns, rows) if fmt == 'ndjson' else csv_lines(columns, rows)
+
+    # wbits=31 : gzip 헤더/트레일러
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= size:
+            data = ''.join(batch).encode()
+            batch = []
+            yield compressor.compress(data) if compressor else data
+
+    data = ''.join(batch).encode()
+    if compressor:
+        yield compressor.compress(data) + compressor.flush()
+    elif data:
+        yield data
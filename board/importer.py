@@ -0,0 +1,195 @@
+import csv
+import gzip
+import json
+from contextlib import contextmanager
+from itertools import islice
+
+from django.apps import apps
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+
+from . import search
+from .bulk import bulk_insert
+from .export import parse_since
+from .likes import like_through, refresh_like_count
+from .models import Boards, Comment, ImportCheckpoint, ImportIdMap, Post, TimestampedModel
+
+
+def parse_time(value):
+    return (parse_since(value) if value else None) or timezone.now()
+
+
+def build_user(record, refs):
+    user = get_user_model()(username=record['username'], email=record.get('email') or '',
+                            date_joined=parse_time(record.get('created_at')))
+    user.set_unusable_password()
+    return user
+
+
+def timestamps(record):
+    # updated_at 이 없으면 created_at 과 같게 둔다.
+    created_at = parse_time(record.get('created_at'))
+    updated_at = parse_time(record['updated_at']) if record.get('updated_at') else created_at
+    return {'created_at': created_at, 'updated_at': updated_at}
+
+
+# kind: (모델, {입력 컬럼: 원본 id 를 찾을 kind}, 행 생성 함수). 부모 kind 를 먼저 가져와야 한다.
+KINDS = {
+    'users': (None, {}, build_user),
+    'boards': (Boards, {'author_id': 'users'},
+               lambda record, refs: Boards(title=record['title'], **refs, **timestamps(record))),
+    'posts': (Post, {'board_id': 'boards', 'author_id': 'users'},
+              lambda record, refs: Post(title=record['title'], content=record['content'], **refs, **timestamps(record))),
+    'comments': (Comment, {'post_id': 'posts', 'author_id': 'users'},
+                 lambda record, refs: Comment(text=record['text'], **refs, **timestamps(record))),
+    'post_likes': (Post, {'post_id': 'posts', 'user_id': 'users'}, None),
+    'comment_likes': (Comment, {'comment_id': 'comments', 'user_id': 'users'}, None),
+}
+
+LIKE_KINDS = {'post_likes', 'comment_likes'}
+
+
+def get_model(kind):
+    model = KINDS[kind][0]
+    return get_user_model() if kind == 'users' else model
+
+
+@contextmanager
+def preserved_timestamps():
+    # 이관하는 동안만 TimestampedModel 의 auto_now_add / auto_now 를 꺼서 원본 created_at / updated_at 을 저장한다.
+    fields = [
+        model._meta.get_field(name)
+        for model in apps.get_models() if issubclass(model, TimestampedModel)
+        for name in ('created_at', 'updated_at')
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def read_records(path, fmt=None):
+    # 한 줄씩 읽으므로 입력 크기와 상관없이 메모리를 일정하게 쓴다. .gz 는 풀면서 읽는다.
+    fmt = fmt or ('csv' if '.csv' in path else 'ndjson')
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rt', encoding='utf-8', newline='') as f:
+        if fmt == 'csv':
+            yield from csv.DictReader(f)
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def batches(records, size):
+    while True:
+        batch = list(islice(records, size))
+        if not batch:
+            return
+        yield batch
+
+
+def resolve(source, columns, records):
+    # 배치에 나온 원본 id 만 한 번에 찾는다. {(kind, 원본 id): 새 id}
+    wanted = {}
+    for column, kind in columns.items():
+        wanted.setdefault(kind, set()).update(str(record.get(column)) for record in records)
+    refs = {}
+    for kind, legacy_ids in wanted.items():
+        rows = ImportIdMap.objects.filter(source=source, kind=kind, legacy_id__in=legacy_ids)
+        refs.update(((kind, legacy_id), new_id) for legacy_id, new_id in rows.values_list('legacy_id', 'new_id'))
+    return refs
+
+
+def drop_taken_usernames(rows, legacy_ids):
+    # 이미 있거나 배치 안에서 겹치는 username 은 넣지 않는다. (남은 행, 남은 원본 id, [(원본 id, 이유)])
+    taken = set(
+        get_user_model().objects.filter(username__in=[row.username for row in rows]).values_list('username', flat=True)
+    )
+    kept_rows, kept_ids, conflicts = [], [], []
+    for row, legacy_id in zip(rows, legacy_ids):
+        if row.username in taken:
+            conflicts.append((legacy_id, f'username {row.username!r} already exists'))
+        else:
+            taken.add(row.username)
+            kept_rows.append(row)
+            kept_ids.append(legacy_id)
+    return kept_rows, kept_ids, conflicts
+
+
+def insert(kind, rows):
+    # 넣은 행에 id 를 채워 돌려준다. 사용자는 username 으로 찾는다.
+    model = get_model(kind)
+    if kind == 'users':
+        model.objects.bulk_create(rows, batch_size=500)
+        ids = dict(model.objects.filter(username__in=[row.username for row in rows]).values_list('username', 'pk'))
+        for row in rows:
+            row.pk = ids[row.username]
+        return rows
+
+    # 같은 테이블에 다른 곳에서 넣은 행이 섞이지 않도록 배치의 부모 id 와 작성 시각 범위로 좁혀서 id 를 찾는다.
+    scope = {}
+    for column in (*KINDS[kind][1], 'created_at'):
+        values = [getattr(row, column) for row in rows]
+        scope[f'{column}__gte'], scope[f'{column}__lte'] = min(values), max(values)
+    return bulk_insert(model, rows, **scope)
+
+
+def import_batch(source, kind, records):
+    # 배치 하나를 한 트랜잭션으로 넣고 체크포인트를 옮긴다.
+    # (가져온 수, 건너뛴 수, 충돌로 건너뛴 [(원본 id, 이유)])
+    model, columns, build = KINDS[kind]
+    refs = resolve(source, columns, records)
+
+    if kind not in LIKE_KINDS:
+        done = set(
+            ImportIdMap.objects
+            .filter(source=source, kind=kind, legacy_id__in=[str(record['id']) for record in records])
+            .values_list('legacy_id', flat=True)
+        )
+
+    rows, legacy_ids = [], []
+    for record in records:
+        values = {column: refs.get((parent, str(record.get(column)))) for column, parent in columns.items()}
+        if None in values.values():
+            # 부모가 이관되지 않은 레코드
+            continue
+        if kind in LIKE_KINDS:
+            rows.append(values)
+        elif str(record['id']) not in done:
+            rows.append(build(record, values))
+            legacy_ids.append(str(record['id']))
+
+    conflicts = []
+    with transaction.atomic():
+        if kind == 'users' and rows:
+            rows, legacy_ids, conflicts = drop_taken_usernames(rows, legacy_ids)
+
+        if kind in LIKE_KINDS:
+            through, source_field, target_field = like_through(model)
+            through.objects.bulk_create(
+                [through(**{f'{source_field}_id': row[f'{source_field}_id'], f'{target_field}_id': row['user_id']})
+                 for row in rows],
+                batch_size=500, ignore_conflicts=True,
+            )
+            refresh_like_count(model.objects.filter(pk__in={row[f'{source_field}_id'] for row in rows}))
+        elif rows:
+            objs = insert(kind, rows)
+            ImportIdMap.objects.bulk_create([
+                ImportIdMap(source=source, kind=kind, legacy_id=legacy_id, new_id=obj.pk)
+                for legacy_id, obj in zip(legacy_ids, objs)
+            ], batch_size=500)
+            search.index_objects(model, objs)
+
+        imported, skipped = len(rows), len(records) - len(rows)
+        checkpoint = ImportCheckpoint.objects.select_for_update().get(source=source, kind=kind)
+        checkpoint.records += len(records)
+        checkpoint.imported += imported
+        checkpoint.skipped += skipped
+        checkpoint.save()
+    return imported, skipped, conflicts
@@ -0,0 +1,112 @@
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import models
+from rest_framework import serializers as s
+from rest_framework.response import Response
+
+from . import like_buffer, metrics
+from .likes import liked_ids
+from .serializers import LikeableSerializer
+from .sparse import model_columns, nested_columns, nested_serializers
+
+
+class LeanSerializer:
+    # ModelSerializer 를 거치지 않고 values() 행에서 바로 목록 응답을 만든다.
+    # 출력은 같은 serializer_class 의 결과와 같아야 한다.
+
+    datetime_field = s.DateTimeField()
+
+    def __init__(self, serializer_class, rows, context, fields=None):
+        self.serializer_class = serializer_class
+        self.rows = rows
+        self.context = context
+        self.fields = [name for name in serializer_class.Meta.fields if fields is None or name in fields]
+
+    @classmethod
+    def columns(cls, serializer_class, fields=None):
+        fields = serializer_class.Meta.fields if fields is None else fields
+        return model_columns(serializer_class, fields) + nested_columns(serializer_class, fields)
+
+    @property
+    def data(self):
+        with metrics.timer('serialize'):
+            return self.to_representation()
+
+    def to_representation(self):
+        model = self.serializer_class.Meta.model
+        user = self.context['request'].user
+        liked = set()
+        if 'is_like' in self.fields and issubclass(self.serializer_class, LikeableSerializer):
+            liked = liked_ids(model, user, [row['id'] for row in self.rows])
+
+        deltas = {}
+        if 'like_count' in self.fields:
+            deltas = like_buffer.count_deltas(model, [row['id'] for row in self.rows])
+
+        nested = nested_serializers(self.serializer_class, self.fields)
+        formatters = []
+        for name in self.fields:
+            if name == 'pk':
+                formatters.append((name, lambda row: row['id']))
+            elif name in nested:
+                formatters.append((name, self.nested_formatter(name, nested[name])))
+            elif name == 'is_author':
+                formatters.append((name, lambda row: row['author'] == user.pk))
+            elif name == 'is_like':
+                formatters.append((name, lambda row: row['id'] in liked))
+            elif name == 'like_count':
+                formatters.append((name, lambda row: row['like_count'] + deltas.get(row['id'], 0)))
+            elif self.is_datetime(model, name):
+                formatters.append((name, lambda row, name=name: self.datetime_field.to_representation(row[name])))
+            else:
+                formatters.append((name, lambda row, name=name: row[name]))
+
+        return [{name: format_value(row) for name, format_value in formatters} for row in self.rows]
+
+    def nested_formatter(self, name, serializer):
+        # 관계 행이 없으면(LEFT JOIN 컬럼이 모두 NULL) None
+        model = serializer.Meta.model
+        columns = [
+            (field, f'{name}__{field}', self.is_datetime(model, field)) for field in serializer.Meta.fields
+        ]
+
+        def format_value(row):
+            if all(row[column] is None for _, column, _ in columns):
+                return None
+            return {
+                field: self.datetime_field.to_representation(row[column]) if is_datetime else row[column]
+                for field, column, is_datetime in columns
+            }
+        return format_value
+
+    @staticmethod
+    def is_datetime(model, name):
+        try:
+            return isinstance(model._meta.get_field(name), models.DateTimeField)
+        except FieldDoesNotExist:
+            return False
+
+
+class LeanListMixin:
+    # BOARD_LEAN_LIST 가 켜져 있으면 목록을 values() + LeanSerializer 로 만든다.
+
+    def use_lean_list(self):
+        return (
+            getattr(settings, 'BOARD_LEAN_LIST', False)
+            and self.get_serializer_class() is self.serializer_class
+        )
+
+    def list(self, request, *args, **kwargs):
+        if not self.use_lean_list():
+            return super().list(request, *args, **kwargs)
+
+        context = self.get_serializer_context()
+        fields = context.get('fields')
+        queryset = self.filter_queryset(self.get_queryset())
+        rows = queryset.values(*LeanSerializer.columns(self.serializer_class, fields))
+
+        page = self.paginate_queryset(rows)
+        serializer = LeanSerializer(self.serializer_class, page if page is not None else list(rows), context, fields)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
@@ -0,0 +1,322 @@
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+def is_enabled():
+    return getattr(settings, 'BOARD_LIKE_BUFFER', None) in BUFFERS
+
+
+def model_label(model):
+    return model._meta.label_lower
+
+
+def settled(current, flushed):
+    # 비우는 동안 다시 토글된 의도를 방금 반영한 상태(flushed 의 좋아요 여부) 위로 옮긴다. 할 일이 없으면 None
+    if current is None or current == flushed:
+        return None
+    like, base = current[0], flushed[0]
+    return None if like == base else (like, base)
+
+
+class LocalLikeBuffer:
+    # 프로세스 안에서만 보이는 버퍼. 여러 프로세스로 띄울 때는 cache 버퍼를 쓴다.
+    # 의도는 (모델, pk) 와 (모델, 사용자) 로도 색인해 조회는 페이지에 있는 키만 읽는다.
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._intents = {}
+        self._by_object = defaultdict(set)
+        self._by_user = defaultdict(set)
+        self._revision = 0
+
+    def locked(self):
+        return self._lock
+
+    def snapshot(self):
+        with self._lock:
+            return dict(self._intents)
+
+    def get(self, keys):
+        with self._lock:
+            return {key: self._intents[key] for key in keys if key in self._intents}
+
+    def object_intents(self, label, pks):
+        with self._lock:
+            return self.get([(label, pk, user_id) for pk in pks for user_id in self._by_object.get((label, pk), ())])
+
+    def user_intents(self, label, user_id):
+        with self._lock:
+            return self.get([(label, pk, user_id) for pk in self._by_user.get((label, user_id), ())])
+
+    def set(self, intents):
+        # intents: {(모델 label, pk, user_id): (좋아요 여부, 버퍼에 처음 들어올 때의 DB 상태) 또는 None(지움)}
+        with self._lock:
+            for (label, pk, user_id), value in intents.items():
+                if value is None:
+                    self._intents.pop((label, pk, user_id), None)
+                    self._unindex(self._by_object, (label, pk), user_id)
+                    self._unindex(self._by_user, (label, user_id), pk)
+                else:
+                    self._intents[label, pk, user_id] = value
+                    self._by_object[label, pk].add(user_id)
+                    self._by_user[label, user_id].add(pk)
+            self._revision += 1
+
+    def _unindex(self, index, key, member):
+        members = index.get(key)
+        if members is not None:
+            members.discard(member)
+            if not members:
+                del index[key]
+
+    def settle(self, snapshot):
+        # 반영한 의도는 지우고, 그 사이 다시 토글된 의도는 반영한 상태 위로 옮긴다.
+        with self._lock:
+            self.set({key: settled(self._intents.get(key), value) for key, value in snapshot.items()})
+
+    def revision(self):
+        return self._revision
+
+    def clear(self):
+        with self._lock:
+            self._intents.clear()
+            self._by_object.clear()
+            self._by_user.clear()
+            self._revision += 1
+
+
+class CacheLikeBuffer:
+    # 캐시 백엔드에 의도를 저장해 여러 프로세스가 같은 버퍼를 본다. 색인 키는 cache.add 잠금으로 보호한다.
+    # 전체 색인은 flush 만 읽고, 조회는 (모델, pk) / (모델, 사용자) 색인으로 필요한 의도만 가져온다.
+    index_key = 'board:likebuf:index'
+    lock_key = 'board:likebuf:lock'
+    revision_key = 'board:likebuf:revision'
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    @contextmanager
+    def locked(self, timeout=5):
+        deadline = time.monotonic() + timeout
+        while not self.cache.add(self.lock_key, 1, timeout):
+            if time.monotonic() > deadline:
+                raise TimeoutError('like buffer lock timeout')
+            time.sleep(0.001)
+        try:
+            yield
+        finally:
+            self.cache.delete(self.lock_key)
+
+    def intent_key(self, key):
+        return 'board:likebuf:{}:{}:{}'.format(*key)
+
+    def object_key(self, label, pk):
+        return f'board:likebuf:object:{label}:{pk}'
+
+    def user_key(self, label, user_id):
+        return f'board:likebuf:user:{label}:{user_id}'
+
+    def get(self, keys):
+        keys = list(keys)
+        values = self.cache.get_many([self.intent_key(key) for key in keys])
+        return {key: values[self.intent_key(key)] for key in keys if self.intent_key(key) in values}
+
+    def snapshot(self):
+        return self.get(self.cache.get(self.index_key) or set())
+
+    def object_intents(self, label, pks):
+        users = self.cache.get_many([self.object_key(label, pk) for pk in pks])
+        return self.get([(label, pk, user_id) for pk in pks for user_id in users.get(self.object_key(label, pk), ())])
+
+    def user_intents(self, label, user_id):
+        return self.get([(label, pk, user_id) for pk in self.cache.get(self.user_key(label, user_id)) or ()])
+
+    def set(self, intents):
+        # LocalLikeBuffer.set 과 같다. locked() 안에서 부른다.
+        index_keys = {self.index_key}
+        for label, pk, user_id in intents:
+            index_keys.update((self.object_key(label, pk), self.user_key(label, user_id)))
+        indexes = self.cache.get_many(list(index_keys))
+
+        def update(index_key, member, add):
+            members = indexes.setdefault(index_key, set())
+            if add:
+                members.add(member)
+            else:
+                members.discard(member)
+
+        for (label, pk, user_id), value in intents.items():
+            key = (label, pk, user_id)
+            if value is None:
+                self.cache.delete(self.intent_key(key))
+            else:
+                self.cache.set(self.intent_key(key), value, None)
+            update(self.index_key, key, value is not None)
+            update(self.object_key(label, pk), user_id, value is not None)
+            update(self.user_key(label, user_id), pk, value is not None)
+
+        self.cache.set_many({key: members for key, members in indexes.items() if members}, None)
+        self.cache.delete_many([key for key, members in indexes.items() if not members])
+        self.bump()
+
+    def settle(self, snapshot):
+        with self.locked():
+            current = self.get(snapshot)
+            self.set({key: settled(current.get(key), value) for key, value in snapshot.items()})
+
+    def bump(self):
+        try:
+            self.cache.incr(self.revision_key)
+        except ValueError:
+            self.cache.add(self.revision_key, time.time_ns(), None)
+
+    def revision(self):
+        return self.cache.get(self.revision_key)
+
+    def clear(self):
+        with self.locked():
+            self.set(dict.fromkeys(self.cache.get(self.index_key) or set()))
+
+
+BUFFERS = {
+    'local': lambda: LocalLikeBuffer(),
+    'cache': lambda: CacheLikeBuffer(getattr(settings, 'BOARD_LIKE_BUFFER_ALIAS', 'default')),
+}
+
+_buffers = {}
+_buffers_lock = threading.Lock()
+
+
+def get_buffer():
+    kind = getattr(settings, 'BOARD_LIKE_BUFFER', None)
+    with _buffers_lock:
+        if kind not in _buffers:
+            _buffers[kind] = BUFFERS[kind]()
+        return _buffers[kind]
+
+
+def toggle_many(model, user, states):
+    # states: {pk: 좋아요 여부}. 버퍼와 DB 를 합친 현재 상태와 다른 항목만 의도로 기록하고 그 pk 목록을 돌려준다.
+    # 버퍼와 DB 를 잠금 안에서 읽어야 그 사이에 끝난 flush 의 결과를 놓치지 않는다.
+    from .likes import liked_ids
+
+    buffer = get_buffer()
+    label = model_label(model)
+    keys = {pk: (label, pk, user.pk) for pk in states}
+    with buffer.locked():
+        pending = buffer.get(keys.values())
+        stored = liked_ids(model, user, list(states), buffered=False)
+
+        intents = {}
+        for pk, like in states.items():
+            intent = pending.get(keys[pk])
+            current = intent[0] if intent is not None else pk in stored
+            if current != like:
+                intents[keys[pk]] = (like, intent[1] if intent is not None else pk in stored)
+        if intents:
+            buffer.set(intents)
+
+    if intents:
+        ensure_flusher()
+    return [pk for pk in states if keys[pk] in intents]
+
+
+def toggle(model, pk, user, like):
+    # 이미 like 상태이면 False
+    return bool(toggle_many(model, user, {pk: like}))
+
+
+def overlay(model, user, liked, pks=None):
+    # 사용자 본인의 대기 중인 의도를 DB 에서 읽은 좋아요 집합에 덮어쓴다.
+    # pks 를 주면 그 pk 의 의도만, 아니면 (모델, 사용자) 색인으로 본인의 의도를 모두 읽는다.
+    if not is_enabled():
+        return liked
+    label = model_label(model)
+    if pks is None:
+        intents = get_buffer().user_intents(label, user.pk)
+    else:
+        intents = get_buffer().get((label, pk, user.pk) for pk in pks)
+    for (_, pk, _), (like, _) in intents.items():
+        if like:
+            liked.add(pk)
+        else:
+            liked.discard(pk)
+    return liked
+
+
+def count_deltas(model, pks):
+    # 아직 DB 에 반영되지 않은 like_count 증감 {pk: delta}
+    if not is_enabled():
+        return {}
+    deltas = defaultdict(int)
+    for (_, pk, _), (like, base) in get_buffer().object_intents(model_label(model), set(pks)).items():
+        deltas[pk] += int(like) - int(base)
+    return deltas
+
+
+def revision():
+    return get_buffer().revision() if is_enabled() else None
+
+
+def flush():
+    # 대기 중인 의도를 (모델, 사용자) 단위로 묶어 apply_likes 로 반영한다. 반영한 의도 수를 돌려준다.
+    from .likes import apply_likes
+
+    if not is_enabled():
+        return 0
+    buffer = get_buffer()
+    snapshot = buffer.snapshot()
+    if not snapshot:
+        return 0
+
+    grouped = defaultdict(dict)
+    for (label, pk, user_id), (like, _) in snapshot.items():
+        grouped[label, user_id][pk] = like
+
+    User = get_user_model()
+    for (label, user_id), states in grouped.items():
+        model = apps.get_model(label)
+        # 버퍼에 있는 동안 지워진 게시글/댓글은 건너뛴다.
+        existing = set(model.objects.filter(pk__in=list(states)).values_list('pk', flat=True))
+        apply_likes(model, User(pk=user_id), {pk: like for pk, like in states.items() if pk in existing})
+    buffer.settle(snapshot)
+    return len(snapshot)
+
+
+_flusher = None
+
+
+def ensure_flusher():
+    # BOARD_LIKE_BUFFER_FLUSH_INTERVAL 초마다 비우는 백그라운드 스레드를 처음 기록할 때 띄운다. (0 이면 명령으로만 비운다)
+    global _flusher
+    interval = getattr(settings, 'BOARD_LIKE_BUFFER_FLUSH_INTERVAL', 5)
+    if not interval or _flusher is not None:
+        return
+
+    def run():
+        while True:
+            time.sleep(interval)
+            try:
+                flush()
+            except Exception:
+                logger.exception('like buffer flush failed')
+            finally:
+                close_old_connections()
+
+    with _buffers_lock:
+        if _flusher is None:
+            _flusher = threading.Thread(target=run, name='like-buffer-flusher', daemon=True)
+            _flusher.start()
+            atexit.register(flush)
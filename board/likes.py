@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Coalesce
+
+from . import like_buffer, stats, trending
+from .models import Comment, Post
+
+LIKE_RELATIONS = {
+    Post: Post.like_post,
+    Comment: Comment.like_comment,
+}
+
+
+def like_through(model):
+    # (through 모델, 대상 FK 이름, 사용자 FK 이름)
+    field = LIKE_RELATIONS[model].field
+    return LIKE_RELATIONS[model].through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+
+def liked_ids(model, user, pks, buffered=True):
+    # pks 는 id 목록이나 id 를 고르는 queryset(서브쿼리)
+    # buffered: 아직 DB 에 반영되지 않은 본인의 좋아요/취소(like_buffer)를 덮어쓴다.
+    if not user.is_authenticated:
+        return set()
+    if not isinstance(pks, QuerySet) and not pks:
+        return set()
+
+    through, source, target = like_through(model)
+    liked = set(
+        through.objects
+        .filter(**{target: user.pk, f'{source}__in': pks})
+        .values_list(f'{source}_id', flat=True)
+    )
+    if not buffered:
+        return liked
+    if isinstance(pks, QuerySet):
+        return like_buffer.overlay(model, user, liked)
+    return like_buffer.overlay(model, user, liked, pks) & set(pks)
+
+
+def liked_exists(model, user):
+    # 행마다 user 가 좋아요를 눌렀는지 나타내는 표현식 (like_buffer 는 반영하지 않는다)
+    through, source, target = like_through(model)
+    return Exists(through.objects.filter(**{source: OuterRef('pk'), target: user.pk}))
+
+
+def like_count_subquery(model):
+    # 좋아요 through 테이블을 기준으로 like_count 를 다시 계산하는 표현식
+    through, source, _ = like_through(model)
+    counts = (
+        through.objects
+        .filter(**{source: OuterRef('pk')})
+        .order_by()
+        .values(source)
+        .annotate(count=Count('*'))
+        .values('count')
+    )
+    return Coalesce(Subquery(counts), 0)
+
+
+def refresh_like_count(queryset):
+    return queryset.update(like_count=like_count_subquery(queryset.model))
+
+
+def apply_likes(model, user, states):
+    # states: {pk: 좋아요 여부}. 바뀐 행만 through 테이블에 반영하고 like_count 를 다시 센다.
+    through, source, target = like_through(model)
+
+    with transaction.atomic():
+        existing = liked_ids(model, user, list(states), buffered=False)
+        added = [pk for pk, like in states.items() if like and pk not in existing]
+        removed = [pk for pk, like in states.items() if not like and pk in existing]
+
+        if added:
+            through.objects.bulk_create(
+                [through(**{f'{source}_id': pk, f'{target}_id': user.pk}) for pk in added],
+                ignore_conflicts=True,
+            )
+        if removed:
+            through.objects.filter(**{target: user.pk, f'{source}__in': removed}).delete()
+        if added or removed:
+            refresh_like_count(model.objects.filter(pk__in=added + removed))
+            trending.record_likes(model, added, removed)
+            stats.record_likes(model, added, removed)
+
+    return added, removed
+
+
+def set_like(model, pk, user, like):
+    # 좋아요 한 건을 반영하고 실제로 바뀌었는지 돌려준다.
+    # exists() 로 먼저 확인하지 않고 through 행의 insert/delete 결과로 판단하므로 같은 사용자의 동시 요청이 두 번 세지지 않는다.
+    through, source, target = like_through(model)
+    lookup = {f'{source}_id': pk, f'{target}_id': user.pk}
+
+    with transaction.atomic():
+        if like:
+            changed = through.objects.get_or_create(**lookup)[1]
+        else:
+            changed = through.objects.filter(**lookup).delete()[0] > 0
+        if changed:
+            added, removed = ([pk], []) if like else ([], [pk])
+            refresh_like_count(model.objects.filter(pk=pk))
+            trending.record_likes(model, added, removed)
+            stats.record_likes(model, added, removed)
+
+    return changed
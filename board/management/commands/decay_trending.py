@@ -0,0 +1,54 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from board import trending
+from board.models import Comment, Post, PostScore
+
+
+class Command(BaseCommand):
+    help = '인기 점수를 지금 시각 기준으로 감쇠하고 작아진 점수를 지웁니다. 순위와는 관계없으며 주기적으로(예: 하루에 한 번) 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rebuild', action='store_true',
+                            help='좋아요 수와 댓글 작성 시각으로 점수를 처음부터 다시 계산합니다.')
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            self.rebuild(options['batch_size'])
+
+        decayed, pruned = trending.decay()
+        self.stdout.write(self.style.SUCCESS(f'{decayed} scores decayed, {pruned} pruned'))
+
+    def rebuild(self, batch_size):
+        # 좋아요 through 테이블에는 시각이 없으므로 좋아요는 게시글 작성 시각 기준으로 감쇠한다.
+        # 지우고 다시 넣는 동안 /trending/ 이 비어 보이지 않도록 한 트랜잭션으로 바꾼다.
+        # 삭제 표시된 게시글도 되살릴 때 점수가 남아 있도록 all_objects 로 다시 계산한다. (/trending/ 에서는 걸러진다)
+        now = time.time()
+        like_weight, comment_weight = trending.like_weight(), trending.comment_weight()
+        rebuilt = 0
+        with transaction.atomic():
+            PostScore.objects.all().delete()
+
+            last_pk = Post.all_objects.aggregate(last=Max('pk'))['last'] or 0
+            for start in range(0, last_pk, batch_size):
+                posts = Post.all_objects.filter(pk__gt=start, pk__lte=start + batch_size)
+                scores = {
+                    pk: [board_id, like_weight * like_count * trending.decay_factor(created_at.timestamp(), now)]
+                    for pk, board_id, like_count, created_at
+                    in posts.values_list('pk', 'board_id', 'like_count', 'created_at')
+                }
+                comments = Comment.objects.filter(post__in=posts).values_list('post_id', 'created_at')
+                for post_id, created_at in comments:
+                    scores[post_id][1] += comment_weight * trending.decay_factor(created_at.timestamp(), now)
+
+                PostScore.objects.bulk_create([
+                    PostScore(post_id=pk, board_id=board_id, score=score, decayed_at=now,
+                              rank=trending.rank(score, now))
+                    for pk, (board_id, score) in scores.items() if score > 0
+                ])
+                rebuilt += len(scores)
+        self.stdout.write(f'{rebuilt} posts rescored')
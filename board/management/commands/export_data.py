@@ -0,0 +1,43 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from board import export
+
+
+class Command(BaseCommand):
+    help = '게시판/게시글/댓글/좋아요를 NDJSON 또는 CSV 로 내보냅니다. 메모리는 BOARD_EXPORT_CHUNK_SIZE 행만큼만 씁니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', choices=sorted(export.EXPORTS))
+        parser.add_argument('--fmt', choices=sorted(export.FORMATS), default='ndjson')
+        parser.add_argument('--since', help='updated_at 이 이 시각(ISO 8601) 이후인 행만 내보냅니다.')
+        parser.add_argument('--after-id', type=int, help='id 가 이 값보다 큰 행만 내보냅니다.')
+        parser.add_argument('--gzip', action='store_true')
+        parser.add_argument('--output', help='파일 경로 (기본: 표준 출력)')
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        name = options['name']
+        since = None
+        if options['since']:
+            since = export.parse_since(options['since'])
+            if since is None or not export.supports_since(name):
+                raise CommandError('invalid --since')
+
+        watermark = timezone.now()
+        chunks = export.stream(name, options['fmt'], since, options['after_id'],
+                               using=options['database'], compress=options['gzip'])
+
+        output = open(options['output'], 'wb') if options['output'] else sys.stdout.buffer
+        try:
+            for chunk in chunks:
+                output.write(chunk)
+        finally:
+            if options['output']:
+                output.close()
+            else:
+                output.flush()
+        # 다음 증분 내보내기의 --since 로 쓴다.
+        self.stderr.write(f'watermark {watermark.isoformat()}')
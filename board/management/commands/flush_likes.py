@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from board import like_buffer
+
+
+class Command(BaseCommand):
+    help = '좋아요 버퍼(BOARD_LIKE_BUFFER)에 쌓인 좋아요/취소를 DB 에 반영합니다. local 버퍼는 같은 프로세스 안에서만 보입니다.'
+
+    def handle(self, *args, **options):
+        if not like_buffer.is_enabled():
+            self.stderr.write('like buffer is disabled (BOARD_LIKE_BUFFER)')
+            return
+
+        flushed = like_buffer.flush()
+        self.stdout.write(self.style.SUCCESS(f'{flushed} intents flushed'))
@@ -0,0 +1,54 @@
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from board import importer
+from board.models import ImportCheckpoint
+
+
+class Command(BaseCommand):
+    help = ('이전 포럼의 NDJSON/CSV 덤프를 bulk_create 로 이관합니다. '
+            'users → boards → posts → comments → post_likes/comment_likes 순서로 kind 마다 실행합니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('kind', choices=list(importer.KINDS))
+        parser.add_argument('path', help='.ndjson / .csv 파일 (.gz 가능)')
+        parser.add_argument('--fmt', choices=['ndjson', 'csv'], help='기본: 확장자로 판단')
+        parser.add_argument('--source', default='legacy', help='원본 id 대응과 체크포인트를 나누는 이름')
+        parser.add_argument('--batch-size', type=int, default=getattr(settings, 'BOARD_IMPORT_BATCH_SIZE', 1000))
+        parser.add_argument('--restart', action='store_true', help='체크포인트를 지우고 처음부터 읽습니다.')
+
+    def handle(self, *args, **options):
+        kind, source = options['kind'], options['source']
+        checkpoint, _ = ImportCheckpoint.objects.get_or_create(source=source, kind=kind)
+        if options['restart']:
+            checkpoint.records = checkpoint.imported = checkpoint.skipped = 0
+            checkpoint.save()
+        elif checkpoint.records:
+            self.stderr.write(f'{kind}: resuming after {checkpoint.records} records')
+
+        records = islice(importer.read_records(options['path'], options['fmt']), checkpoint.records, None)
+        start = time.perf_counter()
+        totals = [0, 0, 0]
+        with importer.preserved_timestamps():
+            for batch in importer.batches(records, options['batch_size']):
+                imported, skipped, conflicts = importer.import_batch(source, kind, batch)
+                for legacy_id, reason in conflicts:
+                    self.stderr.write(f'{kind} {legacy_id}: skipped, {reason}')
+                totals[0] += len(batch)
+                totals[1] += imported
+                totals[2] += skipped
+                elapsed = time.perf_counter() - start
+                self.stderr.write(f'{kind}: {checkpoint.records + totals[0]} records, {totals[1]} imported, '
+                                  f'{totals[2]} skipped, {totals[0] / elapsed:.0f} records/s')
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{kind}: {totals[1]} imported, {totals[2]} skipped in {elapsed:.1f}s'
+        ))
+        if kind in ('posts', 'comments', 'post_likes'):
+            self.stdout.write('run decay_trending --rebuild once the import is complete')
+        if kind != 'users':
+            self.stdout.write('run reconcile_board_stats once the import is complete')
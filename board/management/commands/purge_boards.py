@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from board import purge
+from board.models import BoardPurge
+
+
+class Command(BaseCommand):
+    help = ('삭제된 게시판의 인기 점수, 댓글 좋아요, 댓글, 게시글 좋아요, 게시글을 순서대로 나눠서 지웁니다. '
+            '보존 기간을 기다리지 않으며 정리를 시작한 게시판은 되살릴 수 없습니다. '
+            '단계마다 커밋하므로 중단해도 다시 실행하면 남은 행부터 이어서 지웁니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards', help='이 게시판만 (여러 번 지정 가능)')
+        parser.add_argument('--batch-size', type=int, default=purge.batch_size())
+        parser.add_argument('--max-batches', type=int, help='게시판마다 이 횟수만큼만 지우고 다음 실행으로 넘깁니다.')
+
+    def handle(self, *args, **options):
+        purges = purge.pending()
+        if options['boards']:
+            purges = [board_purge for board_purge in purges if board_purge.board_id in options['boards']]
+
+        def progress(board_purge, stage, deleted):
+            self.stderr.write(f'board {board_purge.board_id}: {deleted} {stage} deleted')
+
+        finished = 0
+        for board_purge in purges:
+            finished += purge.run(board_purge, options['batch_size'], options['max_batches'], progress)
+            board_purge = BoardPurge.objects.get(pk=board_purge.pk)
+            self.stdout.write(
+                f'board {board_purge.board_id}: {board_purge.posts} posts, {board_purge.comments} comments, '
+                f'{board_purge.likes} likes deleted' + (' (done)' if board_purge.finished_at else '')
+            )
+        self.stdout.write(self.style.SUCCESS(f'{finished} of {len(purges)} boards purged'))
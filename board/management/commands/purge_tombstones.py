@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from board import purge, tombstones
+
+
+class Command(BaseCommand):
+    help = ('보존 기간(BOARD_TOMBSTONE_TTL)이 지난 삭제된 댓글, 게시글, 게시판과 그 하위 행을 나눠서 지웁니다. '
+            '배치마다 커밋하므로 주기적으로 실행하면 되고 중단해도 이어서 지웁니다.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=purge.batch_size())
+        parser.add_argument('--max-batches', type=int, help='이 횟수만큼만 지우고 다음 실행으로 넘깁니다.')
+
+    def handle(self, *args, **options):
+        def progress(board_purge, stage, deleted):
+            prefix = f'board {board_purge.board_id}: ' if board_purge else ''
+            self.stderr.write(f'{prefix}{deleted} {stage} deleted')
+
+        self.stdout.write(f'purging tombstones deleted before {tombstones.expired_before().isoformat()}')
+        deleted = purge.purge_expired(options['batch_size'], options['max_batches'], progress)
+        summary = ', '.join(f'{count} {stage}' for stage, count in deleted.items()) or 'nothing'
+        self.stdout.write(self.style.SUCCESS(f'{summary} purged'))
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Max
+
+from board import search
+from board.models import Comment, Post
+
+MODELS = {
+    'post': (Post, search.index_posts),
+    'comment': (Comment, search.index_comments),
+}
+
+
+class Command(BaseCommand):
+    help = '게시글/댓글 전문 검색 색인을 처음부터 다시 만듭니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            self.stderr.write('full-text search requires SQLite FTS5')
+            return
+
+        batch_size = options['batch_size']
+        search.clear()
+
+        for name, (model, index) in MODELS.items():
+            last_pk = model.objects.aggregate(last=Max('pk'))['last'] or 0
+            indexed = 0
+            for start in range(0, last_pk, batch_size):
+                pks = list(model.objects.filter(pk__gt=start, pk__lte=start + batch_size).values_list('pk', flat=True))
+                if pks:
+                    with transaction.atomic():
+                        index(pks)
+                    indexed += len(pks)
+            self.stdout.write(f'{name}: {indexed} indexed')
+
+        self.stdout.write(self.style.SUCCESS('search index rebuilt'))
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from board import cache, stats
+
+
+class Command(BaseCommand):
+    help = '게시판 통계(글/댓글/좋아요 수, 마지막 활동)를 원본 행에서 다시 셉니다. 이관 뒤나 값이 어긋났을 때 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--board', type=int, action='append', dest='boards',
+                            help='이 게시판만 다시 셉니다. 여러 번 줄 수 있습니다.')
+
+    def handle(self, *args, **options):
+        reconciled = stats.rebuild(options['boards'])
+        cache.invalidate('boards')
+        self.stdout.write(self.style.SUCCESS(f'{reconciled} boards reconciled'))
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.db.models import F, Max
+
+from board.likes import like_count_subquery, refresh_like_count
+from board.models import Comment, Post
+
+MODELS = {
+    'post': Post,
+    'comment': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = '게시글/댓글의 like_count 를 좋아요 테이블 기준으로 다시 계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', choices=sorted(MODELS), action='append', dest='models')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--check', action='store_true', help='수정하지 않고 어긋난 행 수만 출력합니다.')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+
+        for name in options['models'] or sorted(MODELS):
+            model = MODELS[name]
+            drifted = (
+                model.objects
+                .annotate(actual=like_count_subquery(model))
+                .exclude(like_count=F('actual'))
+                .count()
+            )
+            self.stdout.write(f'{name}: {drifted} drifted')
+
+            if options['check'] or not drifted:
+                continue
+
+            last_pk = model.objects.aggregate(last=Max('pk'))['last'] or 0
+            for start in range(0, last_pk, batch_size):
+                refresh_like_count(model.objects.filter(pk__gt=start, pk__lte=start + batch_size))
+
+            self.stdout.write(self.style.SUCCESS(f'{name}: like_count refreshed'))
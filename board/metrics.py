@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_current = ContextVar('board_request_metrics', default=None)
+
+PERCENTILES = (50, 95, 99)
+
+
+class RequestMetrics:
+    # 요청 하나 동안 쌓이는 쿼리 수와 구간별 시간(ms)
+
+    def __init__(self):
+        self.queries = 0
+        self.timings = defaultdict(float)
+        self._active = set()
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper 로 등록되어 모든 SQL 실행을 감싼다.
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.timings['db'] += (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def timer(self, name):
+        if name in self._active:
+            yield
+            return
+
+        self._active.add(name)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[name] += (time.perf_counter() - start) * 1000
+            self._active.discard(name)
+
+
+def current():
+    return _current.get()
+
+
+def activate(metrics):
+    return _current.set(metrics)
+
+
+def deactivate(token):
+    _current.reset(token)
+
+
+@contextmanager
+def timer(name):
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+
+    with metrics.timer(name):
+        yield
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+class MetricsStore:
+    # 라우트별로 최근 samples 개의 값만 유지하면서 백분위를 계산한다.
+
+    def __init__(self, samples=1000):
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._counts = defaultdict(int)
+        self._values = defaultdict(lambda: defaultdict(lambda: deque(maxlen=self.samples)))
+
+    def record(self, route, values):
+        with self._lock:
+            self._counts[route] += 1
+            for name, value in values.items():
+                self._values[route][name].append(value)
+
+    def summary(self):
+        with self._lock:
+            snapshot = {
+                route: {name: list(values) for name, values in metrics.items()}
+                for route, metrics in self._values.items()
+            }
+            counts = dict(self._counts)
+
+        return {
+            route: {
+                'count': counts[route],
+                **{
+                    name: {f'p{p}': round(percentile(values, p), 3) for p in PERCENTILES}
+                    for name, values in metrics.items()
+                },
+            }
+            for route, metrics in sorted(snapshot.items())
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts.clear()
+            self._values.clear()
+
+
+store = MetricsStore()
@@ -0,0 +1,72 @@
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.functional import classproperty
+
+from . import metrics
+
+
+def route_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return None
+
+    view = match.func
+    actions = getattr(view, 'actions', None)
+    if actions:
+        basename = view.initkwargs.get('basename')
+        action = actions.get(request.method.lower(), request.method.lower())
+        return f'{basename}.{action}'
+    return match.view_name
+
+
+class QueryMetricsMiddleware:
+    # BOARD_METRICS_ENABLED 가 꺼져 있으면 미들웨어 체인에서 빠진다.
+    sync_capable = True
+
+    @classproperty
+    def async_capable(cls):
+        # Django 3.1.3 은 MiddlewareNotUsed 를 만나도 그 전에 바꾼 핸들러 어댑터(async_to_sync)를 남겨서
+        # ASGI 에서 비동기 뷰가 깨진다. 빠질 때는 async 로 선언해 어댑터가 생기지 않게 한다.
+        return not getattr(settings, 'BOARD_METRICS_ENABLED', False)
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'BOARD_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        metrics.store.samples = getattr(settings, 'BOARD_METRICS_SAMPLES', metrics.store.samples)
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request_metrics = metrics.RequestMetrics()
+        token = metrics.activate(request_metrics)
+        start = time.perf_counter()
+
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(request_metrics))
+                response = self.get_response(request)
+        finally:
+            metrics.deactivate(token)
+
+        total = (time.perf_counter() - start) * 1000
+        values = {
+            'queries': request_metrics.queries,
+            'db': request_metrics.timings['db'],
+            'serialize': request_metrics.timings['serialize'],
+            'total': total,
+        }
+
+        route = route_name(request)
+        if route is not None:
+            metrics.store.record(route, values)
+
+        response['Server-Timing'] = ', '.join([
+            f'db;dur={values["db"]:.3f};desc="{values["queries"]} queries"',
+            f'serialize;dur={values["serialize"]:.3f}',
+            f'total;dur={total:.3f}',
+        ])
+        return response
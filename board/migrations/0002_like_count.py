@@ -0,0 +1,42 @@
+# Generated by Django 3.1.3 on 2026-10-18 08:54
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_like_count(apps, schema_editor):
+    for model_name, relation_name in (('Post', 'like_post'), ('Comment', 'like_comment')):
+        model = apps.get_model('board', model_name)
+        relation = getattr(model, relation_name)
+        source = relation.field.m2m_field_name()
+        counts = (
+            relation.through.objects
+            .filter(**{source: OuterRef('pk')})
+            .order_by()
+            .values(source)
+            .annotate(count=Count('*'))
+            .values('count')
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(fill_like_count, migrations.RunPython.noop),
+    ]
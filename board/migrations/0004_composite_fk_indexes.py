@@ -0,0 +1,24 @@
+# Generated by Django 3.1.3 on 2026-10-18 08:57
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0003_list_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='comment',
+            name='post',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='board.post'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='board',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='board.boards'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:12
+
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 가상 테이블은 SQLite 에서만 만든다. 기존 데이터는 rebuild_search_index 명령으로 채운다.
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS board_search USING fts5("
+        "title, body, kind UNINDEXED, object_id UNINDEXED, board_id UNINDEXED, post_id UNINDEXED, "
+        "tokenize = 'unicode61')"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    schema_editor.execute('DROP TABLE IF EXISTS board_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0004_composite_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0005_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostScore',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='trending_score', serialize=False, to='board.post')),
+                ('score', models.FloatField(default=0)),
+                ('decayed_at', models.FloatField()),
+                ('board', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='board.boards')),
+            ],
+            options={
+                'verbose_name': '인기 점수',
+                'db_table': 'post_score',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(fields=['board', '-score'], name='post_score_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(fields=['-score'], name='post_score_idx'),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0006_post_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ImportCheckpoint',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('kind', models.CharField(max_length=20)),
+                ('records', models.PositiveBigIntegerField(default=0)),
+                ('imported', models.PositiveBigIntegerField(default=0)),
+                ('skipped', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '이관 체크포인트',
+                'db_table': 'import_checkpoint',
+            },
+        ),
+        migrations.CreateModel(
+            name='ImportIdMap',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('source', models.CharField(max_length=50)),
+                ('kind', models.CharField(max_length=20)),
+                ('legacy_id', models.CharField(max_length=64)),
+                ('new_id', models.BigIntegerField()),
+            ],
+            options={
+                'verbose_name': '이관 id 대응',
+                'db_table': 'import_id_map',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='importidmap',
+            constraint=models.UniqueConstraint(fields=('source', 'kind', 'legacy_id'), name='import_id_map_unique'),
+        ),
+        migrations.AddConstraint(
+            model_name='importcheckpoint',
+            constraint=models.UniqueConstraint(fields=('source', 'kind'), name='import_checkpoint_unique'),
+        ),
+    ]
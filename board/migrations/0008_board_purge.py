@@ -0,0 +1,39 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0007_import_state'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardPurge',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.BigIntegerField(unique=True)),
+                ('posts', models.PositiveBigIntegerField(default=0)),
+                ('comments', models.PositiveBigIntegerField(default=0)),
+                ('likes', models.PositiveBigIntegerField(default=0)),
+                ('started_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': '게시판 정리',
+                'db_table': 'board_purge',
+            },
+        ),
+        migrations.AddField(
+            model_name='boards',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='boards',
+            index=models.Index(condition=models.Q(deleted_at__isnull=False), fields=['deleted_at'], name='board_deleted_idx'),
+        ),
+    ]
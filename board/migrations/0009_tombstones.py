@@ -0,0 +1,43 @@
+# Generated by Django 3.1.3 on 2026-10-18 09:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0008_board_purge'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='boards',
+            index=models.Index(condition=models.Q(deleted_at__isnull=True), fields=['id'], name='board_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(deleted_at__isnull=True), fields=['post', 'id'], name='comment_post_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(condition=models.Q(deleted_at__isnull=False), fields=['deleted_at'], name='comment_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(deleted_at__isnull=True), fields=['board', 'id'], name='post_board_live_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(deleted_at__isnull=False), fields=['deleted_at'], name='post_deleted_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:05
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def fill_stats(apps, schema_editor):
+    # 이미 있는 게시판의 통계 행을 만들고 reconcile_board_stats 와 같은 방법으로 센다.
+    from board.stats import rebuild_models
+
+    rebuild_models(*(apps.get_model('board', name) for name in ('Boards', 'BoardStats', 'Post', 'Comment')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0009_tombstones'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardStats',
+            fields=[
+                ('board', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='board.boards')),
+                ('post_count', models.PositiveIntegerField(default=0)),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('like_count', models.PositiveIntegerField(default=0)),
+                ('last_activity_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': '게시판 통계',
+                'db_table': 'board_stats',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='boardstats',
+            index=models.Index(fields=['last_activity_at'], name='board_stats_activity_idx'),
+        ),
+        migrations.RunPython(fill_stats, migrations.RunPython.noop),
+    ]
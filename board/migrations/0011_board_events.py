@@ -0,0 +1,37 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0010_board_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BoardEvent',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('board_id', models.BigIntegerField()),
+                ('post_id', models.BigIntegerField()),
+                ('kind', models.CharField(max_length=30)),
+                ('object_id', models.BigIntegerField()),
+                ('data', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': '실시간 이벤트',
+                'db_table': 'board_event',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='boardevent',
+            index=models.Index(fields=['board_id', 'id'], name='board_event_board_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='boardevent',
+            index=models.Index(fields=['post_id', 'id'], name='board_event_post_idx'),
+        ),
+    ]
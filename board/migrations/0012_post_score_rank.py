@@ -0,0 +1,47 @@
+# Generated by Django 3.1.3 on 2026-10-18 10:46
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import F, Value
+from django.db.models.functions import Log, NullIf
+
+
+def fill_rank(apps, schema_editor):
+    # board.trending.rank 와 같은 식. 반감기 설정을 바꾸면 decay_trending --rebuild 로 다시 계산한다.
+    half_life = float(getattr(settings, 'BOARD_TRENDING_HALF_LIFE', 24 * 60 * 60))
+    PostScore = apps.get_model('board', 'PostScore')
+    PostScore.objects.update(
+        rank=Log(Value(2.0), NullIf(F('score'), Value(0.0))) + F('decayed_at') / Value(half_life),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('board', '0011_board_events'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='postscore',
+            name='post_score_board_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='postscore',
+            name='post_score_idx',
+        ),
+        migrations.AddField(
+            model_name='postscore',
+            name='rank',
+            field=models.FloatField(null=True),
+        ),
+        migrations.RunPython(fill_rank, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(fields=['board', '-rank'], name='post_score_board_idx', condition=models.Q(rank__isnull=False)),
+        ),
+        migrations.AddIndex(
+            model_name='postscore',
+            index=models.Index(fields=['-rank'], name='post_score_idx', condition=models.Q(rank__isnull=False)),
+        ),
+    ]
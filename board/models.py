@@ -3,9 +3,20 @@ from django.conf import settings
 # Create your models here.
 
 
+class LiveManager(m.Manager):
+    # 삭제 표시(deleted_at)된 행을 뺀다. 관계를 따라갈 때 쓰는 _base_manager 는 그대로 모든 행을 본다.
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class TimestampedModel(m.Model):
     created_at = m.DateTimeField(auto_now_add=True)
     updated_at = m.DateTimeField(auto_now=True)
+    # 삭제 시각(tombstone). 보존 기간(BOARD_TOMBSTONE_TTL) 동안은 되살릴 수 있고 이후 purge_tombstones 가 지운다.
+    deleted_at = m.DateTimeField(null=True, blank=True)
+
+    objects = LiveManager()
+    all_objects = m.Manager()
 
     class Meta:
         abstract = True
@@ -22,14 +33,19 @@ class Boards(TimestampedModel):
         db_table = 'board'
         ordering = ['-id']
         verbose_name = '게시판'
+        indexes = [
+            m.Index(fields=['id'], name='board_live_idx', condition=m.Q(deleted_at__isnull=True)),
+            m.Index(fields=['deleted_at'], name='board_deleted_idx', condition=m.Q(deleted_at__isnull=False)),
+        ]
 
 
 class Post(TimestampedModel):
     author = m.ForeignKey(settings.AUTH_USER_MODEL, on_delete=m.CASCADE)
-    board = m.ForeignKey(Boards, on_delete=m.CASCADE)
+    board = m.ForeignKey(Boards, on_delete=m.CASCADE, db_index=False)
     title = m.CharField(max_length=50)
     content = m.TextField()
     like_post = m.ManyToManyField(settings.AUTH_USER_MODEL, blank=True, related_name='post_like')
+    like_count = m.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.title
@@ -38,13 +54,20 @@ class Post(TimestampedModel):
         db_table = 'post'
         ordering = ['-id']
         verbose_name = '게시글'
+        indexes = [
+            m.Index(fields=['board', 'id'], name='post_board_id_idx'),
+            # 살아 있는 행만 담는 부분 인덱스. 목록/count 는 deleted_at 을 확인하러 테이블을 읽지 않는다.
+            m.Index(fields=['board', 'id'], name='post_board_live_idx', condition=m.Q(deleted_at__isnull=True)),
+            m.Index(fields=['deleted_at'], name='post_deleted_idx', condition=m.Q(deleted_at__isnull=False)),
+        ]
 
 
 class Comment(TimestampedModel):
     author = m.ForeignKey(settings.AUTH_USER_MODEL, on_delete=m.CASCADE)
-    post = m.ForeignKey(Post, on_delete=m.CASCADE)
+    post = m.ForeignKey(Post, on_delete=m.CASCADE, db_index=False)
     text = m.CharField(max_length=255)
     like_comment = m.ManyToManyField(settings.AUTH_USER_MODEL, blank=True, related_name='comment_like')
+    like_count = m.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f'{self.author}님이 작성한 댓글 {self.text} 입니다.'
@@ -53,3 +76,113 @@ class Comment(TimestampedModel):
         db_table = 'comment'
         ordering = ['-id']
         verbose_name = '댓글'
+        indexes = [
+            m.Index(fields=['post', 'id'], name='comment_post_id_idx'),
+            m.Index(fields=['post', 'id'], name='comment_post_live_idx', condition=m.Q(deleted_at__isnull=True)),
+            m.Index(fields=['deleted_at'], name='comment_deleted_idx', condition=m.Q(deleted_at__isnull=False)),
+        ]
+
+
+class PostScore(m.Model):
+    # 좋아요/댓글 이벤트마다 갱신하는 인기 점수. decayed_at(유닉스 시각) 기준 값이고 decay_trending 이 주기적으로 감쇠한다.
+    post = m.OneToOneField(Post, on_delete=m.CASCADE, primary_key=True, related_name='trending_score')
+    board = m.ForeignKey(Boards, on_delete=m.CASCADE, db_index=False, related_name='+')
+    score = m.FloatField(default=0)
+    decayed_at = m.FloatField()
+    # 순위 키 log2(score) + decayed_at / 반감기 (board.trending.rank). 점수가 0 이면 NULL 이고 인덱스에서 빠진다.
+    rank = m.FloatField(null=True)
+
+    class Meta:
+        db_table = 'post_score'
+        verbose_name = '인기 점수'
+        indexes = [
+            m.Index(fields=['board', '-rank'], name='post_score_board_idx', condition=m.Q(rank__isnull=False)),
+            m.Index(fields=['-rank'], name='post_score_idx', condition=m.Q(rank__isnull=False)),
+        ]
+
+
+class ImportIdMap(m.Model):
+    # 이관 원본(source)의 id 와 새로 만든 행의 id 대응. import_forum_data 가 채운다.
+    source = m.CharField(max_length=50)
+    kind = m.CharField(max_length=20)
+    legacy_id = m.CharField(max_length=64)
+    new_id = m.BigIntegerField()
+
+    class Meta:
+        db_table = 'import_id_map'
+        verbose_name = '이관 id 대응'
+        constraints = [
+            m.UniqueConstraint(fields=['source', 'kind', 'legacy_id'], name='import_id_map_unique'),
+        ]
+
+
+class ImportCheckpoint(m.Model):
+    # (source, kind) 별로 입력에서 소비한 레코드 수. 이어받을 때 그만큼 건너뛴다.
+    source = m.CharField(max_length=50)
+    kind = m.CharField(max_length=20)
+    records = m.PositiveBigIntegerField(default=0)
+    imported = m.PositiveBigIntegerField(default=0)
+    skipped = m.PositiveBigIntegerField(default=0)
+    updated_at = m.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'import_checkpoint'
+        verbose_name = '이관 체크포인트'
+        constraints = [
+            m.UniqueConstraint(fields=['source', 'kind'], name='import_checkpoint_unique'),
+        ]
+
+
+class BoardPurge(m.Model):
+    # 삭제 표시된 게시판의 정리 진행 상황. 게시판 행은 마지막에 지우므로 FK 대신 id 만 둔다.
+    board_id = m.BigIntegerField(unique=True)
+    posts = m.PositiveBigIntegerField(default=0)
+    comments = m.PositiveBigIntegerField(default=0)
+    likes = m.PositiveBigIntegerField(default=0)
+    started_at = m.DateTimeField(auto_now_add=True)
+    updated_at = m.DateTimeField(auto_now=True)
+    finished_at = m.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'board_purge'
+        verbose_name = '게시판 정리'
+
+
+class BoardStats(m.Model):
+    # 게시판별 집계. 글/댓글 작성·삭제·복구와 좋아요마다 board.stats 가 증감을 반영하고
+    # reconcile_board_stats 가 전체를 다시 센다. 삭제된 글과 그 아래 댓글은 세지 않는다.
+    board = m.OneToOneField(Boards, on_delete=m.CASCADE, primary_key=True, related_name='stats')
+    post_count = m.PositiveIntegerField(default=0)
+    comment_count = m.PositiveIntegerField(default=0)
+    # 살아 있는 글과 댓글의 like_count 합
+    like_count = m.PositiveIntegerField(default=0)
+    # 게시판이나 그 안의 글/댓글이 마지막으로 작성된 시각
+    last_activity_at = m.DateTimeField(null=True, blank=True)
+    updated_at = m.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'board_stats'
+        verbose_name = '게시판 통계'
+        indexes = [
+            m.Index(fields=['last_activity_at'], name='board_stats_activity_idx'),
+        ]
+
+
+class BoardEvent(m.Model):
+    # 실시간 스트림(board.sse)으로 보낸 이벤트. id 가 SSE 이벤트 id 이며 Last-Event-ID 로 다시 연결하면
+    # 그 뒤의 이벤트부터 다시 보낸다. 최근 BOARD_EVENT_LOG_SIZE 개만 남기므로 FK 대신 id 만 둔다.
+    board_id = m.BigIntegerField()
+    post_id = m.BigIntegerField()
+    kind = m.CharField(max_length=30)
+    object_id = m.BigIntegerField()
+    # JSON 문자열. SSE data 줄에 그대로 싣는다.
+    data = m.TextField()
+    created_at = m.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'board_event'
+        verbose_name = '실시간 이벤트'
+        indexes = [
+            m.Index(fields=['board_id', 'id'], name='board_event_board_idx'),
+            m.Index(fields=['post_id', 'id'], name='board_event_post_idx'),
+        ]
@@ -0,0 +1,71 @@
+from django.db.models import F, Func, Subquery
+from rest_framework.pagination import CursorPagination, LimitOffsetPagination
+
+
+class OffsetPagination(LimitOffsetPagination):
+    # 뷰가 이미 센 count(known_count)가 있으면 COUNT(*) 를 다시 하지 않는다.
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.known_count = getattr(view, 'known_count', None)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_count(self, queryset):
+        if self.known_count is not None:
+            return self.known_count
+        return super().get_count(queryset)
+
+    def page_window(self, queryset, request):
+        # limit/offset 이 가리키는 페이지 범위만 남기고, 응답의 count 도 바뀌므로
+        # 전체 개수(total)를 상관없는 스칼라 서브쿼리로 붙인다. (한 번만 계산된다)
+        limit = self.get_limit(request)
+        offset = self.get_offset(request)
+        total = queryset.order_by().annotate(total=Func(F('pk'), function='COUNT')).values('total')
+        queryset = queryset.annotate(total=Subquery(total))
+        if limit is None:
+            return queryset[offset:]
+        return queryset[offset:offset + limit]
+
+
+class KeysetPagination(CursorPagination):
+    # (board_id, id) / (post_id, id) 인덱스를 따라가는 커서 페이지네이션, 전체 count 를 세지 않는다.
+    ordering = '-id'
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+    def page_window(self, queryset, request):
+        # 현재 커서가 가리키는 페이지 범위만 남긴 queryset (ETag 집계용)
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+        offset, reverse, position = cursor if cursor else (0, False, None)
+
+        if position is not None:
+            lookup = 'id__gt' if reverse else 'id__lt'
+            queryset = queryset.filter(**{lookup: position})
+
+        queryset = queryset.order_by('id' if reverse else '-id')
+        return queryset[offset:offset + page_size + 1]
+
+
+class PaginationModeMixin:
+    pagination_mode = 'offset'
+    pagination_modes = {
+        'offset': OffsetPagination,
+        'keyset': KeysetPagination,
+    }
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            self._paginator = self.pagination_modes[self.get_pagination_mode()]()
+        return self._paginator
+
+    def get_pagination_mode(self):
+        if self.request is None:
+            return self.pagination_mode
+
+        params = self.request.query_params
+        if KeysetPagination.cursor_query_param in params:
+            return 'keyset'
+
+        mode = params.get('pagination', self.pagination_mode)
+        return mode if mode in self.pagination_modes else self.pagination_mode
@@ -0,0 +1,182 @@
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.db import close_old_connections, router, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import cache, search, tombstones
+from .models import Boards, BoardPurge, BoardStats, Comment, Post, PostScore
+
+logger = logging.getLogger(__name__)
+
+PostLike = Post.like_post.through
+CommentLike = Comment.like_comment.through
+
+# 게시판을 지울 때 자식부터 지운다. (단계, 모델, 게시판의 행을 고르는 조건, 늘릴 BoardPurge 카운터)
+# 점수를 먼저 지워 인기글에서 바로 빠지게 한다.
+STAGES = [
+    ('scores', PostScore, 'board_id', None),
+    ('comment_likes', CommentLike, 'comment__post__board_id', 'likes'),
+    ('comments', Comment, 'post__board_id', 'comments'),
+    ('post_likes', PostLike, 'post__board_id', 'likes'),
+    ('posts', Post, 'board_id', 'posts'),
+    ('stats', BoardStats, 'board_id', None),
+]
+
+
+def batch_size():
+    return getattr(settings, 'BOARD_PURGE_BATCH_SIZE', 1000)
+
+
+def board_stages(board_id):
+    return [(stage, model, {field: board_id}, counter) for stage, model, field, counter in STAGES]
+
+
+def expired_stages(before):
+    # 보존 기간이 지난 댓글/게시글 tombstone 과 그 자식. 조건마다 deleted_at 부분 인덱스로 찾는다.
+    return [
+        ('comment_likes', CommentLike, {'comment__deleted_at__lt': before}, 'likes'),
+        ('comment_likes', CommentLike, {'comment__post__deleted_at__lt': before}, 'likes'),
+        ('comments', Comment, {'deleted_at__lt': before}, 'comments'),
+        ('comments', Comment, {'post__deleted_at__lt': before}, 'comments'),
+        ('post_likes', PostLike, {'post__deleted_at__lt': before}, 'likes'),
+        ('scores', PostScore, {'post__deleted_at__lt': before}, None),
+        ('posts', Post, {'deleted_at__lt': before}, 'posts'),
+    ]
+
+
+def raw_delete(model, pks):
+    # Collector 를 거치지 않는다. 시그널(검색 색인, 인기 점수)은 여기서 직접 정리한다.
+    model._base_manager.filter(pk__in=pks)._raw_delete(router.db_for_write(model))
+
+
+def delete_posts(pks):
+    # 이전 단계 이후 끼어든 댓글/좋아요가 있어도 FK 제약에 걸리지 않도록 같은 트랜잭션에서 함께 지운다.
+    comments = list(Comment.all_objects.filter(post_id__in=pks).values_list('pk', flat=True))
+    if comments:
+        raw_delete(CommentLike, CommentLike.objects.filter(comment_id__in=comments).values_list('pk', flat=True))
+        search.remove(Comment, comments)
+        raw_delete(Comment, comments)
+    raw_delete(PostLike, PostLike.objects.filter(post_id__in=pks).values_list('pk', flat=True))
+    raw_delete(PostScore, pks)
+    search.remove(Post, pks)
+    raw_delete(Post, pks)
+
+
+def delete_batch(stages, size, using):
+    # 남은 행이 있는 첫 단계에서 최대 size 행을 지운다. (단계, 지운 수, 카운터) 또는 None
+    for stage, model, filters, counter in stages:
+        pks = list(model._base_manager.using(using).filter(**filters).order_by().values_list('pk', flat=True)[:size])
+        if pks:
+            break
+    else:
+        return None
+
+    if model is Post:
+        delete_posts(pks)
+    else:
+        if model is Comment:
+            search.remove(Comment, pks)
+        raw_delete(model, pks)
+    return stage, len(pks), counter
+
+
+def step(purge, size=None):
+    # 한 배치를 한 트랜잭션으로 지운다. 끝났으면 게시판 행을 지우고 None.
+    # 매 배치가 커밋되므로 중단돼도 남은 행부터 다시 시작한다.
+    using = router.db_for_write(Boards)
+    with transaction.atomic(using=using):
+        result = delete_batch(board_stages(purge.board_id), size or batch_size(), using)
+        if result is None:
+            raw_delete(Boards, [purge.board_id])
+            purge.finished_at = timezone.now()
+            BoardPurge.objects.filter(pk=purge.pk).update(finished_at=purge.finished_at, updated_at=purge.finished_at)
+            return None
+
+        stage, deleted, counter = result
+        if counter:
+            BoardPurge.objects.filter(pk=purge.pk).update(**{counter: F(counter) + deleted}, updated_at=timezone.now())
+    return stage, deleted
+
+
+def run(purge, size=None, max_steps=None, progress=None):
+    # 끝까지(또는 max_steps 번) step 을 반복한다. 끝났으면 True
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        result = step(purge, size)
+        if result is None:
+            cache.invalidate('boards', f'board:{purge.board_id}')
+            return True
+        if progress:
+            progress(purge, *result)
+        steps += 1
+    return False
+
+
+def pending(before=None):
+    # 삭제된 게시판(before 가 있으면 그 전에 삭제된 것만)의 정리 작업. 처음 정리할 때 BoardPurge 를 만들며
+    # 그 뒤로는 되살릴 수 없다.
+    deleted = Boards.all_objects.filter(deleted_at__isnull=False)
+    if before is not None:
+        deleted = deleted.filter(deleted_at__lt=before)
+    for board_id in deleted.values_list('pk', flat=True):
+        BoardPurge.objects.get_or_create(board_id=board_id)
+    purges = BoardPurge.objects.filter(finished_at__isnull=True)
+    if before is not None:
+        purges = purges.filter(board_id__in=deleted.values('pk'))
+    return list(purges.order_by('pk'))
+
+
+def run_pending(size=None, max_steps=None, progress=None, before=None):
+    return sum(run(purge, size, max_steps, progress) for purge in pending(before))
+
+
+def purge_expired(size=None, max_steps=None, progress=None):
+    # 보존 기간이 지난 tombstone 을 배치마다 커밋하며 지운다. 게시글/댓글 다음에 게시판. {단계: 지운 수}
+    before = tombstones.expired_before()
+    using = router.db_for_write(Post)
+    size = size or batch_size()
+    deleted = {}
+    steps = 0
+    while max_steps is None or steps < max_steps:
+        with transaction.atomic(using=using):
+            result = delete_batch(expired_stages(before), size, using)
+        if result is None:
+            deleted['boards'] = run_pending(size, None if max_steps is None else max_steps - steps, progress, before)
+            break
+        stage, count, _ = result
+        deleted[stage] = deleted.get(stage, 0) + count
+        if progress:
+            progress(None, stage, count)
+        steps += 1
+    return deleted
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def ensure_worker():
+    # BOARD_PURGE_INTERVAL 초마다 purge_expired 를 부르는 백그라운드 스레드. (0 이면 purge_tombstones 명령으로만)
+    global _worker
+    interval = getattr(settings, 'BOARD_PURGE_INTERVAL', 0)
+    if not interval or _worker is not None:
+        return
+
+    def work():
+        while True:
+            try:
+                purge_expired()
+            except Exception:
+                logger.exception('tombstone purge failed')
+            finally:
+                close_old_connections()
+            time.sleep(interval)
+
+    with _worker_lock:
+        if _worker is None:
+            _worker = threading.Thread(target=work, name='tombstone-purger', daemon=True)
+            _worker.start()
@@ -0,0 +1,244 @@
+import base64
+import json
+import re
+
+from django.db import connection
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils.html import escape
+
+from .models import Comment, Post
+
+TABLE = 'board_search'
+
+HANGUL = re.compile(r'[가-힣]+')
+WORD = re.compile(r'\w+')
+
+# 제목에 본문보다 큰 가중치를 준다. (title, body)
+BM25_WEIGHTS = (5.0, 1.0)
+
+SNIPPET_RADIUS = 40
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def word_tokens(word):
+    # unicode61 토크나이저는 한국어 형태소를 모르기 때문에 한글 구간은 2-gram 으로 쪼개서 색인한다.
+    tokens = []
+    position = 0
+    for match in HANGUL.finditer(word):
+        if match.start() > position:
+            tokens.append(word[position:match.start()])
+        run = match.group()
+        if len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        position = match.end()
+    if position < len(word):
+        tokens.append(word[position:])
+    return tokens
+
+
+def index_text(text):
+    return ' '.join(token for word in WORD.findall(text or '') for token in word_tokens(word))
+
+
+def match_expression(query):
+    terms = []
+    for word in WORD.findall(query):
+        tokens = word_tokens(word.lower())
+        if len(tokens) == 1 and HANGUL.fullmatch(tokens[0]) and len(tokens[0]) == 1:
+            # 한 글자 검색어는 그 글자로 시작하는 2-gram 과 맞춘다.
+            terms.append(f'"{tokens[0]}"*')
+        else:
+            terms.append('"{}"'.format(' '.join(tokens)))
+    return ' '.join(terms)
+
+
+def post_row(post):
+    return (post['id'] * 2, index_text(post['title']), index_text(post['content']), 'post', post['id'], post['board_id'], post['id'])
+
+
+def comment_row(comment):
+    return (comment['id'] * 2 + 1, '', index_text(comment['text']), 'comment', comment['id'],
+            comment['post__board_id'], comment['post_id'])
+
+
+def write_rows(rows, rowids):
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        if rowids:
+            placeholders = ', '.join(['%s'] * len(rowids))
+            cursor.execute(f'DELETE FROM {TABLE} WHERE rowid IN ({placeholders})', rowids)
+        if rows:
+            cursor.executemany(
+                f'INSERT INTO {TABLE} (rowid, title, body, kind, object_id, board_id, post_id) '
+                f'VALUES (%s, %s, %s, %s, %s, %s, %s)',
+                rows,
+            )
+
+
+def index_posts(pks):
+    posts = Post.objects.filter(pk__in=pks).values('id', 'board_id', 'title', 'content')
+    write_rows([post_row(post) for post in posts], [pk * 2 for pk in pks])
+
+
+def index_comments(pks):
+    comments = Comment.objects.filter(pk__in=pks).values('id', 'post_id', 'post__board_id', 'text')
+    write_rows([comment_row(comment) for comment in comments], [pk * 2 + 1 for pk in pks])
+
+
+def index_objects(model, objs):
+    pks = [obj.pk for obj in objs]
+    if model is Post:
+        index_posts(pks)
+    elif model is Comment:
+        index_comments(pks)
+
+
+def remove(model, pks):
+    # rowid 는 게시글 pk*2, 댓글 pk*2+1 이다. 게시판은 색인하지 않으므로 지울 행이 없다.
+    if model is Post:
+        write_rows([], [pk * 2 for pk in pks])
+    elif model is Comment:
+        write_rows([], [pk * 2 + 1 for pk in pks])
+
+
+def clear():
+    if is_available():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE}')
+
+
+def encode_cursor(score, rowid):
+    return base64.urlsafe_b64encode(json.dumps([score, rowid]).encode()).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        score, rowid = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(rowid)
+    except (TypeError, ValueError):
+        return None
+
+
+def search(query, board_id=None, cursor=None, limit=10):
+    # bm25 점수(낮을수록 관련도 높음)와 rowid 로 keyset 페이지네이션을 한다.
+    expression = match_expression(query)
+    if not expression or not is_available():
+        return [], None
+
+    where = [f'{TABLE} MATCH %s']
+    params = [*BM25_WEIGHTS, expression]
+    if board_id is not None:
+        where.append('board_id = %s')
+        params.append(board_id)
+
+    outer = ''
+    position = decode_cursor(cursor) if cursor else None
+    if position is not None:
+        outer = 'WHERE score > %s OR (score = %s AND rowid > %s)'
+        params.extend([position[0], position[0], position[1]])
+
+    sql = (
+        f'SELECT rowid, kind, object_id, score FROM ('
+        f'SELECT rowid, kind, object_id, bm25({TABLE}, %s, %s) AS score FROM {TABLE} WHERE {" AND ".join(where)}'
+        f') {outer} ORDER BY score, rowid LIMIT %s'
+    )
+    params.append(limit + 1)
+
+    with connection.cursor() as db_cursor:
+        db_cursor.execute(sql, params)
+        rows = db_cursor.fetchall()
+
+    next_cursor = encode_cursor(rows[limit - 1][3], rows[limit - 1][0]) if len(rows) > limit else None
+    return build_results(rows[:limit], query), next_cursor
+
+
+def build_results(rows, query):
+    post_ids = [object_id for _, kind, object_id, _ in rows if kind == 'post']
+    comment_ids = [object_id for _, kind, object_id, _ in rows if kind == 'comment']
+    # 삭제된 게시판/게시글 아래의 행은 색인에 남아 있어도 결과에서 뺀다.
+    posts = Post.objects.filter(pk__in=post_ids, board__deleted_at__isnull=True)
+    posts = {post['id']: post for post in posts.values('id', 'board_id', 'title', 'content')}
+    comments = Comment.objects.filter(pk__in=comment_ids, post__deleted_at__isnull=True,
+                                      post__board__deleted_at__isnull=True)
+    comments = {comment['id']: comment for comment in comments.values('id', 'post_id', 'post__board_id', 'text')}
+
+    terms = [word for word in WORD.findall(query)]
+    results = []
+    for _, kind, object_id, score in rows:
+        if kind == 'post' and object_id in posts:
+            post = posts[object_id]
+            results.append({
+                'type': 'post',
+                'pk': post['id'],
+                'board': post['board_id'],
+                'post': post['id'],
+                'title': highlight(post['title'], terms, whole=True),
+                'snippet': highlight(post['content'], terms),
+                'score': score,
+            })
+        elif kind == 'comment' and object_id in comments:
+            comment = comments[object_id]
+            results.append({
+                'type': 'comment',
+                'pk': comment['id'],
+                'board': comment['post__board_id'],
+                'post': comment['post_id'],
+                'title': '',
+                'snippet': highlight(comment['text'], terms),
+                'score': score,
+            })
+    return results
+
+
+def highlight(text, terms, whole=False):
+    pattern = re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)), re.IGNORECASE)
+    first = pattern.search(text)
+
+    if whole or first is None:
+        start, end = 0, len(text) if whole else min(len(text), SNIPPET_RADIUS * 2)
+    else:
+        start = max(0, first.start() - SNIPPET_RADIUS)
+        end = min(len(text), first.end() + SNIPPET_RADIUS)
+
+    window = text[start:end]
+    parts = []
+    position = 0
+    for match in pattern.finditer(window):
+        parts.append(escape(window[position:match.start()]))
+        parts.append(f'<b>{escape(match.group())}</b>')
+        position = match.end()
+    parts.append(escape(window[position:]))
+
+    prefix = '…' if start > 0 else ''
+    suffix = '…' if end < len(text) else ''
+    return f'{prefix}{"".join(parts)}{suffix}'
+
+
+@receiver(post_save, sender=Post)
+def index_saved_post(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not {'title', 'content'} & set(update_fields):
+        return
+    write_rows([post_row({'id': instance.pk, 'board_id': instance.board_id,
+                          'title': instance.title, 'content': instance.content})], [instance.pk * 2])
+
+
+@receiver(post_save, sender=Comment)
+def index_saved_comment(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and 'text' not in update_fields:
+        return
+    write_rows([comment_row({'id': instance.pk, 'post_id': instance.post_id,
+                             'post__board_id': instance.post.board_id, 'text': instance.text})],
+               [instance.pk * 2 + 1])
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Comment)
+def remove_deleted(sender, instance, **kwargs):
+    remove(sender, [instance.pk])
@@ -1,6 +1,10 @@
 from django.contrib.auth import get_user_model
+from django.db import models
 from rest_framework import serializers as s
-from .models import Boards, Comment, Post
+from . import like_buffer, metrics
+from .expand import latest_comments
+from .likes import liked_ids
+from .models import Boards, BoardStats, Comment, Post
 
 User = get_user_model()
 
@@ -13,49 +17,122 @@ class AuthorSerializer(s.ModelSerializer):
         ]
 
 
-class BoardSerializer(s.ModelSerializer):
+class PageListSerializer(s.ListSerializer):
+    # 페이지 단위로 사용자별 필드를 미리 계산해 context 로 공유한다.
+
+    @property
+    def data(self):
+        with metrics.timer('serialize'):
+            return super().data
+
+    def to_representation(self, data):
+        iterable = data.all() if isinstance(data, models.Manager) else data
+        objs = list(iterable)
+        self.child.prepare_page(objs)
+        return super().to_representation(objs)
+
+
+class AuthoredSerializer(s.ModelSerializer):
     author = AuthorSerializer(read_only=True)
     is_author = s.SerializerMethodField("is_author_field")
 
-    def is_author_field(self, board):
+    @property
+    def data(self):
+        with metrics.timer('serialize'):
+            return super().data
+
+    def get_fields(self):
+        fields = super().get_fields()
+        requested = self.context.get('fields')
+        if requested is None:
+            return fields
+        return {name: field for name, field in fields.items() if name in requested}
+
+    def is_author_field(self, obj):
+        if 'request' in self.context:
+            user = self.context['request'].user
+            return obj.author_id == user.pk
+
+    def prepare_page(self, objs):
+        pass
+
+
+class LikeableSerializer(AuthoredSerializer):
+    is_like = s.SerializerMethodField("is_like_field")
+
+    def is_like_field(self, obj):
+        if 'request' in self.context:
+            user = self.context['request'].user
+            liked = self.context.get('liked_ids', {}).get(self.Meta.model)
+            if liked is None:
+                liked = liked_ids(self.Meta.model, user, [obj.pk])
+            return obj.pk in liked
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'like_count' in data and like_buffer.is_enabled():
+            # 아직 DB 에 반영되지 않은 좋아요/취소를 like_count 에 더한다.
+            deltas = self.context.get('like_deltas', {}).get(self.Meta.model)
+            if deltas is None:
+                deltas = like_buffer.count_deltas(self.Meta.model, [instance.pk])
+            data['like_count'] += deltas.get(instance.pk, 0)
+        return data
+
+    def prepare_page(self, objs):
+        if like_buffer.is_enabled():
+            pks = [obj.pk for obj in objs]
+            self.context.setdefault('like_deltas', {})[self.Meta.model] = like_buffer.count_deltas(self.Meta.model, pks)
+        if self.Meta.model in self.context.get('liked_ids', {}):
+            # 뷰가 페이지 조회와 함께 미리 가져온 경우
+            return
         if 'request' in self.context:
             user = self.context['request'].user
-            return board.author == user
+            pks = [obj.pk for obj in objs]
+            self.context.setdefault('liked_ids', {})[self.Meta.model] = liked_ids(self.Meta.model, user, pks)
+
+    def update(self, instance, validated_data):
+        # like_count 는 좋아요 액션에서 F() 로 갱신하므로 덮어쓰지 않는다.
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=[*validated_data, 'updated_at'])
+        return instance
+
+
+class BoardStatsSerializer(s.ModelSerializer):
+    class Meta:
+        model = BoardStats
+        fields = [
+            'post_count',
+            'comment_count',
+            'like_count',
+            'last_activity_at',
+        ]
+
+
+class BoardSerializer(AuthoredSerializer):
+    stats = BoardStatsSerializer(read_only=True)
 
     class Meta:
         model = Boards
+        list_serializer_class = PageListSerializer
         fields = [
             'pk',
             'author',
             'is_author',
             'title',
+            'stats',
             'created_at',
             'updated_at',
         ]
 
 
-class PostSerializer(s.ModelSerializer):
-    author = AuthorSerializer(read_only=True)
-    is_author = s.SerializerMethodField("is_author_field")
-    like_count = s.SerializerMethodField("like_count_field")
-    is_like = s.SerializerMethodField("is_like_field")
-
-    def is_author_field(self, post):
-        if 'request' in self.context:
-            user = self.context['request'].user
-            return post.author == user
-
-    def like_count_field(self, post):
-        return post.like_post.count()
-
-    def is_like_field(self, post):
-        if 'request' in self.context:
-            user = self.context['request'].user
-            return post.like_post.filter(pk=user.pk).exists()
+class PostSerializer(LikeableSerializer):
 
     class Meta:
         model = Post
+        list_serializer_class = PageListSerializer
         fields = [
+            'pk',
             'author',
             'is_author',
             'is_like',
@@ -65,29 +142,16 @@ class PostSerializer(s.ModelSerializer):
             'created_at',
             'updated_at',
         ]
+        read_only_fields = [
+            'like_count',
+        ]
 
 
-class CommentSerializer(s.ModelSerializer):
-    author = AuthorSerializer(read_only=True)
-    is_author = s.SerializerMethodField("is_author_field")
-    like_count = s.SerializerMethodField("like_count_field")
-    is_like = s.SerializerMethodField("is_like_field")
-
-    def is_author_field(self, comment):
-        if 'request' in self.context:
-            user = self.context['request'].user
-            return comment.author == user
-
-    def like_count_field(self, comment):
-        return comment.like_comment.count()
-
-    def is_like_field(self, comment):
-        if 'request' in self.context:
-            user = self.context['request'].user
-            return comment.like_comment.filter(pk=user.pk).exists()
+class CommentSerializer(LikeableSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = PageListSerializer
         fields = [
             'pk',
             'author',
@@ -97,4 +161,37 @@ class CommentSerializer(s.ModelSerializer):
             'like_count',
             'created_at',
             'updated_at',
-        ]
\ No newline at end of file
+        ]
+        read_only_fields = [
+            'like_count',
+        ]
+
+
+class PostExpandedSerializer(PostSerializer):
+    comment_count = s.IntegerField(read_only=True)
+    comments = s.SerializerMethodField("comments_field")
+
+    class Meta(PostSerializer.Meta):
+        fields = [
+            *PostSerializer.Meta.fields,
+            'comment_count',
+            'comments',
+        ]
+
+    def comments_field(self, obj):
+        # 댓글마다 ListSerializer 를 만들면 페이지 준비 쿼리가 게시글 수만큼 나가므로 child 를 직접 쓴다.
+        serializer = CommentSerializer(context={**self.context, 'fields': None})
+        return [serializer.to_representation(comment) for comment in self.context['latest_comments'].get(obj.pk, [])]
+
+    def prepare_page(self, objs):
+        super().prepare_page(objs)
+        limit = self.context.get('comment_limit', 0)
+        self.context['latest_comments'] = latest_comments([obj.pk for obj in objs], limit)
+
+        if 'request' in self.context:
+            user = self.context['request'].user
+            pks = [comment.pk for comments in self.context['latest_comments'].values() for comment in comments]
+            self.context['liked_ids'][Comment] = liked_ids(Comment, user, pks)
+        if like_buffer.is_enabled():
+            pks = [comment.pk for comments in self.context['latest_comments'].values() for comment in comments]
+            self.context.setdefault('like_deltas', {})[Comment] = like_buffer.count_deltas(Comment, pks)
@@ -0,0 +1,69 @@
+from rest_framework import serializers as s
+from rest_framework.exceptions import ValidationError
+
+
+def model_columns(serializer_class, fields):
+    # 직렬화에 필요한 컬럼만 고른다. id / author_id 는 is_author, is_like, 캐시 덮어쓰기에 항상 필요하다.
+    model = serializer_class.Meta.model
+    concrete = {field.name for field in model._meta.concrete_fields}
+    columns = ['id', 'author']
+    columns.extend(name for name in fields if name in concrete and name not in columns)
+    return columns
+
+
+def nested_serializers(serializer_class, fields):
+    # author, stats 처럼 관계를 따라가는 중첩 serializer. {필드: serializer}
+    declared = serializer_class._declared_fields
+    return {
+        name: declared[name] for name in fields
+        if isinstance(declared.get(name), s.ModelSerializer)
+    }
+
+
+def nested_columns(serializer_class, fields):
+    return [
+        f'{name}__{column}'
+        for name, nested in nested_serializers(serializer_class, fields).items()
+        for column in nested.Meta.fields
+    ]
+
+
+def narrow_queryset(queryset, serializer_class, fields):
+    nested = list(nested_serializers(serializer_class, fields))
+    queryset = queryset.select_related(None)
+    if nested:
+        queryset = queryset.select_related(*nested)
+    return queryset.only(*model_columns(serializer_class, fields), *nested_columns(serializer_class, fields))
+
+
+class SparseFieldsMixin:
+    # ?fields=title,author : 응답 필드와 SELECT 컬럼을 함께 줄인다.
+    fields_query_param = 'fields'
+    sparse_actions = ('list', 'retrieve')
+
+    def get_requested_fields(self):
+        if self.request is None or self.action not in self.sparse_actions:
+            return None
+        raw = self.request.query_params.get(self.fields_query_param)
+        if not raw:
+            return None
+
+        requested = {name.strip() for name in raw.split(',') if name.strip()}
+        available = set(self.get_serializer_class().Meta.fields)
+        unknown = requested - available
+        if unknown:
+            raise ValidationError({self.fields_query_param: f'unknown fields: {", ".join(sorted(unknown))}'})
+        # pk 는 항상 내려준다.
+        return requested | {'pk'}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.get_requested_fields()
+        if fields is not None:
+            queryset = narrow_queryset(queryset, self.get_serializer_class(), fields)
+        return queryset
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'] = self.get_requested_fields()
+        return context
@@ -0,0 +1,145 @@
+import asyncio
+import io
+import json
+import re
+from importlib import import_module
+from urllib.parse import parse_qs
+
+from django.conf import settings
+from django.contrib import auth
+from django.core.handlers.asgi import ASGIRequest
+from rest_framework.exceptions import NotAuthenticated, NotFound, Throttled
+
+from . import events, throttling
+from .async_views import run_query
+from .models import Boards, Post
+
+ROUTES = [
+    re.compile(r'^/board/(?P<board_pk>\d+)/events/$'),
+    re.compile(r'^/board/(?P<board_pk>\d+)/post/(?P<post_pk>\d+)/events/$'),
+]
+
+
+def keepalive():
+    return getattr(settings, 'BOARD_EVENT_KEEPALIVE', 15)
+
+
+def format_event(event):
+    return f'id: {event.pk}\nevent: {event.kind}\ndata: {event.data}\n\n'.encode()
+
+
+def load_user(scope):
+    # SessionMiddleware / AuthenticationMiddleware 와 같은 방법으로 세션 쿠키에서 사용자를 찾는다.
+    request = ASGIRequest(scope, io.BytesIO())
+    engine = import_module(settings.SESSION_ENGINE)
+    request.session = engine.SessionStore(request.COOKIES.get(settings.SESSION_COOKIE_NAME))
+    return auth.get_user(request)
+
+
+def authenticate(scope):
+    # 연결 하나가 읽기 토큰 하나를 쓴다. (사용자, 기다릴 초)
+    user = load_user(scope)
+    if not user.is_authenticated:
+        return user, 0
+    return user, throttling.take('read', f'user:{user.pk}')
+
+
+def exists(board_pk, post_pk=None):
+    if post_pk is None:
+        return Boards.objects.filter(pk=board_pk).exists()
+    return Post.objects.filter(pk=post_pk, board_id=board_pk, board__deleted_at__isnull=True).exists()
+
+
+def last_event_id(scope):
+    # EventSource 는 다시 연결할 때 Last-Event-ID 헤더를 보낸다. 처음 연결할 때는 ?last_event_id= 로 줄 수 있다.
+    headers = dict(scope.get('headers') or [])
+    value = headers.get(b'last-event-id', b'').decode()
+    if not value:
+        value = parse_qs(scope.get('query_string', b'').decode()).get('last_event_id', [''])[0]
+    return int(value) if value.isdigit() else None
+
+
+async def send_json(send, status, data, headers=()):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'), *headers]})
+    await send({'type': 'http.response.body', 'body': json.dumps(data, ensure_ascii=False).encode()})
+
+
+async def wait_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+async def stream(scope, receive, send, board_pk, post_pk=None):
+    user, wait = await run_query(authenticate)(scope)
+    if not user.is_authenticated:
+        # 세션 인증만 쓰므로 DRF 와 같이 401 대신 403 을 돌려준다.
+        return await send_json(send, 403, {'detail': NotAuthenticated().detail})
+    if wait:
+        throttled = Throttled(wait)
+        return await send_json(send, 429, {'detail': throttled.detail},
+                               [(b'retry-after', b'%d' % throttled.wait)])
+    board_id, post_id = int(board_pk), None if post_pk is None else int(post_pk)
+    if not await run_query(exists)(board_id, post_id):
+        return await send_json(send, 404, {'detail': NotFound().detail})
+
+    # 처음 연결하면 지금 이후의 이벤트만 보낸다. 기준 id 를 구독 전에 읽어야 그 사이의 이벤트를 건너뛰지 않는다.
+    # 이어받을 때는 구독한 뒤에 로그를 읽고 겹치는 이벤트는 id 로 거른다.
+    last_id = last_event_id(scope)
+    resume = last_id is not None
+    if not resume:
+        last_id = await run_query(events.last_id)()
+    subscriber = events.Subscriber(board_id, post_id)
+    events.bus.subscribe(subscriber)
+    disconnect = asyncio.ensure_future(wait_disconnect(receive))
+    try:
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),
+        ]})
+
+        pending = []
+        if resume:
+            pending, expired = await run_query(events.replay)(board_id, post_id, last_id)
+            if expired:
+                # 로그가 잘려 빠진 이벤트가 있다. 클라이언트는 목록을 다시 받아야 한다.
+                await send({'type': 'http.response.body', 'body': b'event: reset\ndata: {}\n\n', 'more_body': True})
+
+        while True:
+            for event in pending:
+                if event.pk > last_id:
+                    await send({'type': 'http.response.body', 'body': format_event(event), 'more_body': True})
+                    last_id = event.pk
+
+            get = asyncio.ensure_future(subscriber.get(keepalive()))
+            await asyncio.wait({get, disconnect}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnect.done():
+                get.cancel()
+                return
+            pending = get.result()
+            if not pending:
+                # 조용할 때 로그를 다시 읽어 다른 프로세스에서 발행된 이벤트를 받는다.
+                pending, _ = await run_query(events.replay)(board_id, post_id, last_id)
+                if not pending:
+                    await send({'type': 'http.response.body', 'body': b': keepalive\n\n', 'more_body': True})
+    finally:
+        events.bus.unsubscribe(subscriber)
+        disconnect.cancel()
+
+
+class EventStreamApp:
+    # GET /board/<id>/events/, /board/<id>/post/<id>/events/ 를 text/event-stream 으로 직접 처리하고
+    # 나머지 요청은 Django 로 넘긴다. Django 3.1 의 ASGI 핸들러는 스트리밍 응답을 동기로 끝까지 읽으므로
+    # 연결을 열어 둔 채 이벤트를 흘려보낼 수 없다.
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for route in ROUTES:
+                match = route.match(scope['path'])
+                if match:
+                    return await stream(scope, receive, send, **match.groupdict())
+        return await self.app(scope, receive, send)
@@ -0,0 +1,170 @@
+from django.db import transaction
+from django.db.models import Case, Count, DateTimeField, F, IntegerField, Max, OuterRef, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Boards, BoardStats, Comment, Post
+
+COUNTERS = ('post_count', 'comment_count', 'like_count')
+
+
+def add(deltas, board_id, last_activity_at=None, **counts):
+    delta = deltas.setdefault(board_id, {})
+    for name, count in counts.items():
+        delta[name] = delta.get(name, 0) + (count or 0)
+    if last_activity_at is not None:
+        delta['last_activity_at'] = max(filter(None, [delta.get('last_activity_at'), last_activity_at]))
+    return deltas
+
+
+def record(deltas):
+    # deltas: {board_id: {'post_count': 증감, ..., 'last_activity_at': 시각}}
+    # 호출한 쪽의 트랜잭션 안에서 UPDATE 한 번으로 반영한다.
+    # 통계 행은 게시판을 만들 때(기존 게시판은 0010 마이그레이션이) 만들고, import 로 넣은 게시판은
+    # reconcile_board_stats 가 채운다.
+    deltas = {pk: delta for pk, delta in deltas.items() if any(delta.values())}
+    if not deltas:
+        return
+
+    updates = {}
+    for name in COUNTERS:
+        whens = [When(board_id=pk, then=Value(delta[name])) for pk, delta in deltas.items() if delta.get(name)]
+        if whens:
+            change = Case(*whens, default=Value(0), output_field=IntegerField())
+            updates[name] = Greatest(F(name) + change, Value(0))
+    whens = []
+    for pk, delta in deltas.items():
+        if delta.get('last_activity_at'):
+            at = Value(delta['last_activity_at'], output_field=DateTimeField())
+            whens.append(When(board_id=pk, then=Greatest(Coalesce(F('last_activity_at'), at), at)))
+    if whens:
+        updates['last_activity_at'] = Case(*whens, default=F('last_activity_at'))
+
+    BoardStats.objects.filter(board_id__in=list(deltas)).update(**updates, updated_at=timezone.now())
+
+    # likes -> stats -> cache -> likes 순환 import
+    from . import cache
+    cache.invalidate('boards')
+
+
+def record_created(model, objs):
+    # bulk_create 는 post_save 를 보내지 않으므로 일괄 생성 뒤에 직접 부른다.
+    deltas = {}
+    if model is Post:
+        for obj in objs:
+            add(deltas, obj.board_id, post_count=1, last_activity_at=obj.created_at)
+    elif model is Comment:
+        # 삭제 표시된 글의 댓글은 세지 않는다.
+        boards = dict(
+            Post.objects.filter(pk__in={obj.post_id for obj in objs}).values_list('pk', 'board_id')
+        )
+        for obj in objs:
+            if obj.post_id in boards:
+                add(deltas, boards[obj.post_id], comment_count=1, last_activity_at=obj.created_at)
+    record(deltas)
+
+
+def record_likes(model, added, removed):
+    changes = {**{pk: 1 for pk in added}, **{pk: -1 for pk in removed}}
+    if not changes:
+        return
+    if model is Post:
+        rows = Post.objects.filter(pk__in=list(changes)).values_list('pk', 'board_id')
+    else:
+        rows = (Comment.objects.filter(pk__in=list(changes), post__deleted_at__isnull=True)
+                .values_list('pk', 'post__board_id'))
+    deltas = {}
+    for pk, board_id in rows:
+        add(deltas, board_id, like_count=changes[pk])
+    record(deltas)
+
+
+def subtree_deltas(model, pks, sign):
+    # 살아 있는 글/댓글(글이면 그 아래 댓글까지)이 집계에서 차지하는 몫. 삭제할 때는 -1, 되살린 뒤에는 +1 로 부른다.
+    deltas = {}
+    if model is Post:
+        posts = Post.objects.filter(pk__in=pks).order_by().values('board_id')
+        for row in posts.annotate(count=Count('pk'), likes=Sum('like_count')):
+            add(deltas, row['board_id'], post_count=sign * row['count'], like_count=sign * row['likes'])
+        comments = Comment.objects.filter(post_id__in=pks)
+    elif model is Comment:
+        comments = Comment.objects.filter(pk__in=pks, post__deleted_at__isnull=True)
+    else:
+        return deltas
+
+    for row in comments.order_by().values('post__board_id').annotate(count=Count('pk'), likes=Sum('like_count')):
+        add(deltas, row['post__board_id'], comment_count=sign * row['count'], like_count=sign * row['likes'])
+    return deltas
+
+
+def rebuild(board_ids=None):
+    # 모든(또는 고른) 게시판의 통계를 상관 서브쿼리 UPDATE 한 번으로 다시 센다. 다시 센 행 수
+    return rebuild_models(Boards, BoardStats, Post, Comment, board_ids)
+
+
+def rebuild_models(Boards, BoardStats, Post, Comment, board_ids=None):
+    # 마이그레이션(0010)은 이력 모델을 넘긴다. 이력 모델에는 LiveManager 가 없으므로
+    # _base_manager 로 읽고 삭제 표시는 직접 거른다.
+    boards = Boards._base_manager.all()
+    stats = BoardStats._base_manager.all()
+    if board_ids is not None:
+        boards = boards.filter(pk__in=board_ids)
+        stats = stats.filter(board_id__in=board_ids)
+
+    missing = boards.filter(stats__isnull=True).values_list('pk', flat=True)
+    BoardStats._base_manager.bulk_create([BoardStats(board_id=pk) for pk in missing], batch_size=500,
+                                         ignore_conflicts=True)
+
+    def aggregate(queryset, group, expression):
+        return Subquery(
+            queryset.filter(**{group: OuterRef('board_id')}).order_by().values(group)
+            .annotate(value=expression).values('value')
+        )
+
+    posts = Post._base_manager.filter(deleted_at__isnull=True)
+    comments = Comment._base_manager.filter(deleted_at__isnull=True, post__deleted_at__isnull=True)
+    # 마지막 활동은 게시판 생성과 삭제된 글/댓글도 포함한다. (증분 갱신도 삭제할 때 되돌리지 않는다)
+    created = Subquery(Boards._base_manager.filter(pk=OuterRef('board_id')).values('created_at'))
+    last_post = Coalesce(aggregate(Post._base_manager.all(), 'board_id', Max('created_at')), created)
+    last_comment = Coalesce(aggregate(Comment._base_manager.all(), 'post__board_id', Max('created_at')), created)
+    with transaction.atomic():
+        return stats.update(
+            post_count=Coalesce(aggregate(posts, 'board_id', Count('pk')), 0),
+            comment_count=Coalesce(aggregate(comments, 'post__board_id', Count('pk')), 0),
+            like_count=(
+                Coalesce(aggregate(posts, 'board_id', Sum('like_count')), 0)
+                + Coalesce(aggregate(comments, 'post__board_id', Sum('like_count')), 0)
+            ),
+            last_activity_at=Greatest(last_post, last_comment),
+            updated_at=timezone.now(),
+        )
+
+
+@receiver(post_save, sender=Boards)
+def create_stats(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        BoardStats.objects.create(board=instance, last_activity_at=instance.created_at)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Comment)
+def count_created(sender, instance, created=False, raw=False, **kwargs):
+    if created and not raw:
+        record_created(sender, [instance])
+
+
+@receiver(post_delete, sender=Post)
+def count_deleted_post(sender, instance, **kwargs):
+    # 삭제 표시된 글은 표시할 때 이미 뺐다. 댓글은 각자 post_delete 로 빠진다.
+    if instance.deleted_at is None:
+        record({instance.board_id: {'post_count': -1, 'like_count': -instance.like_count}})
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if instance.deleted_at is None:
+        post = Post.all_objects.filter(pk=instance.post_id).values('board_id', 'deleted_at').first()
+        if post is not None and post['deleted_at'] is None:
+            record({post['board_id']: {'comment_count': -1, 'like_count': -instance.like_count}})
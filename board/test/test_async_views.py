@@ -0,0 +1,79 @@
+import asyncio
+
+from django.contrib.auth import get_user_model
+from django.test import AsyncClient, Client, TransactionTestCase
+
+from board.models import Boards, Post, Comment
+
+
+class AsyncReadViewTestCase(TransactionTestCase):
+    # 비동기 뷰는 다른 스레드의 DB 연결로 조회하므로 커밋된 데이터가 필요하다.
+    # 트랜잭션 밖의 동기 조회 뷰는 읽기 연결(read)을 쓴다.
+    databases = {'default', 'read'}
+
+    def setUp(self):
+        User = get_user_model()
+        self.user1 = User.objects.create_user(username='user1', password='strong_password_1')
+        self.user2 = User.objects.create_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.posts = [
+            Post.objects.create(author=self.user1 if i % 2 else self.user2, board=self.board,
+                                title=f'title {i}', content='content')
+            for i in range(15)
+        ]
+        self.posts[-1].like_post.add(self.user1)
+        Post.objects.filter(pk=self.posts[-1].pk).update(like_count=1)
+        self.comment = Comment.objects.create(author=self.user2, post=self.posts[-1], text='text')
+
+        self.client = Client()
+        self.client.force_login(self.user1)
+
+    def paths(self):
+        board, post = self.board.pk, self.posts[-1].pk
+        return [
+            '/board/',
+            f'/board/{board}/',
+            f'/board/{board}/post/',
+            f'/board/{board}/post/?limit=5&offset=5',
+            f'/board/{board}/post/{post}/',
+            f'/board/{board}/post/{post}/like/',
+            f'/board/{board}/post/{self.posts[0].pk}/like/',
+            f'/board/{board}/post/999/',
+            f'/board/{board}/post/{post}/comment/',
+            f'/board/{board}/post/{post}/comment/{self.comment.pk}/',
+        ]
+
+    def without_prefix(self, data):
+        # 페이지 링크만 /async 경로를 가리킨다.
+        if isinstance(data, dict):
+            for key in ('next', 'previous'):
+                if data.get(key):
+                    data[key] = data[key].replace('/async/', '/')
+        return data
+
+    def test_same_response_as_sync_views(self):
+        for path in self.paths():
+            expected = self.client.get(path)
+            actual = self.client.get(f'/async{path}')
+            self.assertEqual(actual.status_code, expected.status_code, path)
+            self.assertEqual(self.without_prefix(actual.json()), expected.json(), path)
+
+        next_url = self.client.get(f'/async/board/{self.board.pk}/post/').json()['next']
+        self.assertIn(f'/async/board/{self.board.pk}/post/?limit=10&offset=10', next_url)
+
+    def test_anonymous(self):
+        response = Client().get(f'/async/board/{self.board.pk}/post/')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.json(), Client().get(f'/board/{self.board.pk}/post/').json())
+
+    async def test_concurrent_requests(self):
+        client = AsyncClient()
+        client.cookies = self.client.cookies
+        url = f'/async/board/{self.board.pk}/post/'
+
+        responses = await asyncio.gather(*(client.get(url) for _ in range(8)))
+        self.assertEqual({response.status_code for response in responses}, {200})
+        results = responses[0].json()['results']
+        self.assertEqual(results[0]['pk'], self.posts[-1].pk)
+        self.assertTrue(results[0]['is_like'])
+        self.assertEqual(responses[0].json()['count'], 15)
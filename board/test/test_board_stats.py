@@ -0,0 +1,141 @@
+from datetime import timedelta
+from importlib import import_module
+from io import StringIO
+
+from django.apps import apps as django_apps
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+from test_plus import APITestCase
+
+from board.models import Boards, BoardStats, Post, Comment
+
+JSON = {'format': 'json'}
+
+
+class BoardStatsTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.other_board = Boards.objects.create(author=self.user1, title='other')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user2, post=self.post_obj, text='text')
+        self.posts_url = f'/board/{self.board.pk}/post/'
+
+    def counts(self, board=None):
+        stats = BoardStats.objects.get(board=board or self.board)
+        return stats.post_count, stats.comment_count, stats.like_count
+
+    def test_counts_follow_writes(self):
+        self.assertEqual(self.counts(), (1, 1, 0))
+        self.assertEqual(self.counts(self.other_board), (0, 0, 0))
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+            self.post(f'{self.posts_url}{self.post_obj.pk}/comment/{self.comment.pk}/like/')
+            self.assertEqual(self.counts(), (1, 1, 2))
+
+            self.post(f'{self.posts_url}bulk/', data=[{'title': 't', 'content': 'c'}] * 3, extra=JSON)
+            self.assertEqual(self.counts(), (4, 1, 2))
+
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/comment/{self.comment.pk}/like/')
+            self.assertEqual(self.counts(), (4, 1, 1))
+
+        with self.login(username='user1', password='strong_password_1'):
+            # 글을 지우면 그 아래 댓글과 좋아요도 빠지고, 되살리면 돌아온다.
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/')
+            self.assertEqual(self.counts(), (3, 0, 0))
+            self.post(f'{self.posts_url}{self.post_obj.pk}/restore/')
+            self.assertEqual(self.counts(), (4, 1, 1))
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/comment/{self.comment.pk}/')
+            self.assertEqual(self.counts(), (4, 0, 1))
+
+    def test_last_activity(self):
+        created = BoardStats.objects.get(board=self.other_board).last_activity_at
+        self.assertEqual(created, self.other_board.created_at)
+
+        comment = Comment.objects.create(author=self.user2, post=self.post_obj, text='later')
+        self.assertEqual(BoardStats.objects.get(board=self.board).last_activity_at, comment.created_at)
+
+        # 지워도 마지막 활동 시각은 내려가지 않는다.
+        comment.delete()
+        self.assertEqual(BoardStats.objects.get(board=self.board).last_activity_at, comment.created_at)
+
+    def test_serialized(self):
+        Post.objects.filter(pk=self.post_obj.pk).update(like_count=1)
+        call_command('reconcile_board_stats', stdout=StringIO())
+
+        with self.login(username='user1', password='strong_password_1'):
+            board = self.get_check_200(f'/board/{self.board.pk}/').data
+            listed = self.get_check_200('/board/?fields=title,stats').data['results']
+            with override_settings(BOARD_LEAN_LIST=True):
+                lean = self.get_check_200('/board/').json()['results']
+
+        self.assertEqual(board['stats']['post_count'], 1)
+        self.assertEqual(board['stats']['comment_count'], 1)
+        self.assertEqual(board['stats']['like_count'], 1)
+        self.assertEqual(listed[-1]['stats'], board['stats'])
+        self.assertEqual(lean[-1]['stats'], board['stats'])
+
+    def test_ordering_by_activity(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.assertEqual([board['pk'] for board in self.get_check_200('/board/').data['results']],
+                             [self.other_board.pk, self.board.pk])
+            ordered = self.get_check_200('/board/?ordering=activity').data['results']
+            self.assertEqual([board['pk'] for board in ordered], [self.board.pk, self.other_board.pk])
+
+            Post.objects.create(author=self.user1, board=self.other_board, title='title', content='content')
+            ordered = self.get_check_200('/board/?ordering=activity').data['results']
+            self.assertEqual([board['pk'] for board in ordered], [self.other_board.pk, self.board.pk])
+
+            self.get('/board/?ordering=title')
+            self.assert_http_400_bad_request()
+
+    def test_activity_ordering_uses_index(self):
+        from board.views import BoardViewSet
+
+        queryset = BoardViewSet.queryset.filter(stats__last_activity_at__isnull=False)
+        queryset = queryset.order_by('-stats__last_activity_at', '-stats__board_id')[:10]
+        sql, params = queryset.query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            plan = ' '.join(str(row[-1]) for row in cursor.fetchall())
+        self.assertIn('board_stats_activity_idx', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_reconcile(self):
+        past = timezone.now() - timedelta(days=1)
+        BoardStats.objects.filter(board=self.board).update(post_count=10, comment_count=0, like_count=5,
+                                                           last_activity_at=past)
+        BoardStats.objects.filter(board=self.other_board).delete()
+        Post.objects.filter(pk=self.post_obj.pk).update(like_count=1)
+
+        out = StringIO()
+        call_command('reconcile_board_stats', '--board', str(self.board.pk), stdout=out)
+        self.assertIn('1 boards reconciled', out.getvalue())
+        self.assertEqual(self.counts(), (1, 1, 1))
+        self.assertEqual(BoardStats.objects.get(board=self.board).last_activity_at, self.comment.created_at)
+        self.assertFalse(BoardStats.objects.filter(board=self.other_board).exists())
+
+        call_command('reconcile_board_stats', stdout=out)
+        self.assertEqual(self.counts(self.other_board), (0, 0, 0))
+
+    def test_migration_fills_existing_boards(self):
+        # 0010 이전에 있던 게시판은 통계 행이 없다. 마이그레이션이 삭제 표시된 글을 빼고 센다.
+        deleted = Post.objects.create(author=self.user1, board=self.board, title='gone', content='content')
+        Comment.objects.create(author=self.user2, post=deleted, text='text')
+        Post.all_objects.filter(pk=deleted.pk).update(deleted_at=timezone.now(), like_count=3)
+        Post.objects.filter(pk=self.post_obj.pk).update(like_count=2)
+        BoardStats.objects.all().delete()
+
+        migration = import_module('board.migrations.0010_board_stats')
+        migration.fill_stats(django_apps, None)
+        self.assertEqual(self.counts(), (1, 1, 2))
+        self.assertEqual(self.counts(self.other_board), (0, 0, 0))
+        self.assertEqual(BoardStats.objects.get(board=self.other_board).last_activity_at,
+                         self.other_board.created_at)
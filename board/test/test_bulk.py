@@ -0,0 +1,108 @@
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+JSON = {'format': 'json'}
+
+
+class BulkAPITestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.posts_url = f'/board/{self.board.pk}/post/bulk/'
+
+    def test_bulk_create_posts(self):
+        Post.objects.create(author=self.user1, board=self.board, title='existing', content='content')
+        items = [{'title': f'title {i}', 'content': f'content {i}'} for i in range(5)]
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(self.posts_url, data=items, extra=JSON)
+            self.assert_http_201_created()
+
+        self.assertEqual(Post.objects.filter(board=self.board).count(), 6)
+        self.assertEqual([item['title'] for item in response.data], [f'title {i}' for i in range(5)])
+        for item in response.data:
+            post = Post.objects.get(pk=item['pk'])
+            self.assertEqual(post.title, item['title'])
+            self.assertEqual(post.author, self.user1)
+            self.assertTrue(item['is_author'])
+
+    def test_bulk_create_validation(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(self.posts_url, data=[{'title': 'ok', 'content': 'ok'}, {'title': 'no content'}], extra=JSON)
+            self.assert_http_400_bad_request()
+            self.assertIn('content', response.data[1])
+            self.assertFalse(Post.objects.exists())
+
+            self.post(self.posts_url, data={'title': 'not a list'}, extra=JSON)
+            self.assert_http_400_bad_request()
+
+            self.post('/board/999/post/bulk/', data=[{'title': 'title', 'content': 'content'}], extra=JSON)
+            self.assert_http_404_not_found()
+
+        self.post(self.posts_url, data=[{'title': 'title', 'content': 'content'}], extra=JSON)
+        self.assert_http_403_forbidden()
+
+    def test_bulk_update_posts(self):
+        mine = Post.objects.create(author=self.user1, board=self.board, title='mine', content='content')
+        other = Post.objects.create(author=self.user2, board=self.board, title='other', content='content')
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.patch(self.posts_url, data=[
+                {'pk': mine.pk, 'title': 'fix'},
+                {'pk': other.pk, 'title': 'fix'},
+                {'pk': 999, 'title': 'fix'},
+                {'pk': mine.pk, 'title': 'x' * 100},
+            ], extra=JSON)
+            self.assert_http_200_ok()
+
+        self.assertEqual([result['status'] for result in response.data], [200, 403, 404, 400])
+        self.assertEqual(response.data[0]['data']['title'], 'fix')
+        mine.refresh_from_db()
+        other.refresh_from_db()
+        self.assertEqual(mine.title, 'fix')
+        self.assertEqual(other.title, 'other')
+
+    def test_bulk_delete_posts(self):
+        mine = Post.objects.create(author=self.user1, board=self.board, title='mine', content='content')
+        other = Post.objects.create(author=self.user2, board=self.board, title='other', content='content')
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.delete(self.posts_url, data=[mine.pk, other.pk, 999], extra=JSON)
+            self.assert_http_200_ok()
+
+            self.delete(self.posts_url, data=['a'], extra=JSON)
+            self.assert_http_400_bad_request()
+
+        self.assertEqual([result['status'] for result in response.data], [204, 403, 404])
+        self.assertEqual(list(Post.objects.values_list('title', flat=True)), ['other'])
+
+    def test_bulk_comments(self):
+        post = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        url = f'/board/{self.board.pk}/post/{post.pk}/comment/bulk/'
+
+        with self.login(username='user2', password='strong_password_2'):
+            response = self.post(url, data=[{'text': f'text {i}'} for i in range(3)], extra=JSON)
+            self.assert_http_201_created()
+            pks = [item['pk'] for item in response.data]
+            self.assertEqual(list(Comment.objects.filter(pk__in=pks).values_list('text', flat=True)),
+                             ['text 2', 'text 1', 'text 0'])
+
+            response = self.patch(url, data=[{'pk': pks[0], 'text': 'fix'}], extra=JSON)
+            self.assertEqual(response.data[0]['data']['text'], 'fix')
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.delete(url, data=pks, extra=JSON)
+            self.assertEqual({result['status'] for result in response.data}, {403})
+            self.assertEqual(Comment.objects.count(), 3)
+
+    def test_bulk_create_query_count(self):
+        with self.login(username='user1', password='strong_password_1'):
+            items = [{'title': f'title {i}', 'content': 'content'} for i in range(100)]
+            # session, user, board, savepoint, insert, ids, 검색 색인(select, delete, insert), 게시판 통계, release,
+            # 실시간 이벤트(select, savepoint, insert, ids, release), liked ids
+            with self.assertNumQueries(17):
+                self.post(self.posts_url, data=items, extra=JSON)
+            self.assert_http_201_created()
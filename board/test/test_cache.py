@@ -0,0 +1,104 @@
+import tempfile
+
+from django.core.cache import cache as default_cache
+from django.test import override_settings
+from test_plus import APITestCase
+
+from board import cache
+from board.models import Boards, Post, Comment
+
+
+@override_settings(BOARD_CACHE_ENABLED=True)
+class VersionedCacheTestCase(APITestCase):
+
+    def setUp(self):
+        default_cache.clear()
+        cache.stats.reset()
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='text')
+        self.posts_url = f'/board/{self.board.pk}/post/'
+        self.comments_url = f'{self.posts_url}{self.post_obj.pk}/comment/'
+
+    def test_list_hit(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(self.posts_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+
+            # session, user, ETag 집계, liked ids
+            with self.assertNumQueries(4):
+                response = self.get_check_200(self.posts_url)
+            self.assertEqual(response['X-Cache'], 'HIT')
+            self.assertEqual(response.data['results'][0]['title'], 'title')
+
+        self.assertEqual(cache.stats.summary()['post.list'], {'hits': 1, 'misses': 1})
+
+    def test_per_user_overlay(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+            response = self.get_check_200(self.posts_url)
+            self.assertTrue(response.data['results'][0]['is_author'])
+            self.assertTrue(response.data['results'][0]['is_like'])
+
+        with self.login(username='user2', password='strong_password_2'):
+            response = self.get_check_200(self.posts_url)
+            self.assertEqual(response['X-Cache'], 'HIT')
+            self.assertFalse(response.data['results'][0]['is_author'])
+            self.assertFalse(response.data['results'][0]['is_like'])
+            self.assertEqual(response.data['results'][0]['like_count'], 1)
+
+            response = self.get_check_200(f'/board/{self.board.pk}/')
+            response = self.get_check_200(f'/board/{self.board.pk}/')
+            self.assertEqual(response['X-Cache'], 'HIT')
+            self.assertFalse(response.data['is_author'])
+
+    def test_write_invalidates(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.get_check_200(self.posts_url)
+            self.post(self.posts_url, data={'title': 'second', 'content': 'content'})
+            response = self.get_check_200(self.posts_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual(response.data['count'], 2)
+
+            self.get_check_200(self.comments_url)
+            self.patch(f'{self.comments_url}{self.comment.pk}/', data={'text': 'fix'})
+            response = self.get_check_200(self.comments_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual(response.data['results'][0]['text'], 'fix')
+
+    def test_like_invalidates(self):
+        with self.login(username='user2', password='strong_password_2'):
+            self.get_check_200(self.comments_url)
+            self.post(f'{self.comments_url}{self.comment.pk}/like/')
+            response = self.get_check_200(self.comments_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual(response.data['results'][0]['like_count'], 1)
+            self.assertTrue(response.data['results'][0]['is_like'])
+
+    def test_board_delete_invalidates_children(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.get_check_200(self.comments_url)
+            self.delete(f'/board/{self.board.pk}/')
+            response = self.get_check_200(self.comments_url)
+            self.assertEqual(response['X-Cache'], 'MISS')
+            self.assertEqual(response.data['results'], [])
+
+    def test_file_backend(self):
+        with tempfile.TemporaryDirectory() as location:
+            caches = {'default': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': location}}
+            with override_settings(CACHES=caches):
+                with self.login(username='user1', password='strong_password_1'):
+                    self.get_check_200(self.posts_url)
+                    response = self.get_check_200(self.posts_url)
+                    self.assertEqual(response['X-Cache'], 'HIT')
+
+
+class CacheDisabledTestCase(APITestCase):
+
+    def test_no_cache_header(self):
+        self.make_user(username='user1', password='strong_password_1')
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200('/board/')
+        self.assertFalse(response.has_header('X-Cache'))
@@ -0,0 +1,135 @@
+from django.utils.http import http_date
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class ConditionalGetTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='text')
+        self.comments_url = f'/board/{self.board.pk}/post/{self.post_obj.pk}/comment/'
+
+    def get_conditional(self, url, etag):
+        return self.get(url, extra={'HTTP_IF_NONE_MATCH': etag})
+
+    def test_list_not_modified(self):
+        with self.login(username='user1', password='strong_password_1'):
+            etag = self.get_check_200(self.comments_url)['ETag']
+
+            # session, user, ETag 집계
+            with self.assertNumQueries(3):
+                response = self.get_conditional(self.comments_url, etag)
+            self.assert_http_304_not_modified()
+            self.assertEqual(response.content, b'')
+            self.assertEqual(response['ETag'], etag)
+
+            self.post(self.comments_url, data={'text': 'new'})
+            response = self.get_conditional(self.comments_url, etag)
+            self.assert_http_200_ok()
+            self.assertNotEqual(response['ETag'], etag)
+
+    def test_like_changes_etag(self):
+        with self.login(username='user2', password='strong_password_2'):
+            etag = self.get_check_200(self.comments_url)['ETag']
+            self.post(f'{self.comments_url}{self.comment.pk}/like/')
+            response = self.get_conditional(self.comments_url, etag)
+            self.assert_http_200_ok()
+            self.assertTrue(response.data['results'][0]['is_like'])
+
+    def test_etag_per_user(self):
+        with self.login(username='user1', password='strong_password_1'):
+            etag = self.get_check_200(self.comments_url)['ETag']
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.get_conditional(self.comments_url, etag)
+            self.assert_http_200_ok()
+
+    def test_detail_not_modified(self):
+        url = f'/board/{self.board.pk}/post/{self.post_obj.pk}/'
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(url)
+            etag = response['ETag']
+
+            self.get_conditional(url, etag)
+            self.assert_http_304_not_modified()
+
+            self.patch(url, data={'title': 'fix'})
+            response = self.get_conditional(url, etag)
+            self.assert_http_200_ok()
+            self.assertEqual(response.data['title'], 'fix')
+
+            self.get_conditional(f'/board/{self.board.pk}/post/999/', etag)
+            self.assert_http_404_not_found()
+
+    def test_if_modified_since_ignored(self):
+        # 좋아요/삭제는 updated_at 을 바꾸지 않으므로 Last-Modified 를 보내지 않고 If-Modified-Since 도 보지 않는다.
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200('/board/')
+            self.assertNotIn('Last-Modified', response)
+
+            self.get('/board/', extra={'HTTP_IF_MODIFIED_SINCE': http_date()})
+            self.assert_http_200_ok()
+
+    def test_like_changes_validators(self):
+        posts_url = f'/board/{self.board.pk}/post/'
+        detail_url = f'{posts_url}{self.post_obj.pk}/'
+        with self.login(username='user2', password='strong_password_2'):
+            list_etag = self.get_check_200(posts_url)['ETag']
+            detail_etag = self.get_check_200(detail_url)['ETag']
+            self.post(f'{detail_url}like/')
+            self.assert_http_201_created()
+
+            response = self.get_conditional(posts_url, list_etag)
+            self.assert_http_200_ok()
+            self.assertEqual(response.data['results'][0]['like_count'], 1)
+            self.assertTrue(response.data['results'][0]['is_like'])
+            response = self.get_conditional(detail_url, detail_etag)
+            self.assert_http_200_ok()
+            self.assertTrue(response.data['is_like'])
+
+    def test_etag_tracks_rows(self):
+        other = Post.objects.create(author=self.user1, board=self.board, title='other', content='content')
+        other.like_post.add(self.user2)
+        Post.objects.filter(pk=other.pk).update(like_count=1)
+        posts_url = f'/board/{self.board.pk}/post/'
+
+        with self.login(username='user1', password='strong_password_1'):
+            etag = self.get_check_200(posts_url)['ETag']
+
+            # 한 글의 좋아요가 늘고 다른 글의 좋아요가 줄어도 (합계는 같다) ETag 가 바뀐다.
+            other.like_post.remove(self.user2)
+            self.post_obj.like_post.add(self.user2)
+            Post.objects.filter(pk=other.pk).update(like_count=0)
+            Post.objects.filter(pk=self.post_obj.pk).update(like_count=1)
+            self.get_conditional(posts_url, etag)
+            self.assert_http_200_ok()
+            etag = self.last_response['ETag']
+
+            # like_count 가 그대로여도 본인의 좋아요 여부가 바뀌면 ETag 가 바뀐다.
+            self.post_obj.like_post.remove(self.user2)
+            self.post_obj.like_post.add(self.user1)
+            response = self.get_conditional(posts_url, etag)
+            self.assert_http_200_ok()
+            self.assertEqual([post['is_like'] for post in response.data['results']], [False, True])
+
+    def test_keyset_page_etag(self):
+        for i in range(15):
+            Comment.objects.create(author=self.user1, post=self.post_obj, text=f'text {i}')
+
+        with self.login(username='user1', password='strong_password_1'):
+            first = self.get_check_200(f'{self.comments_url}?pagination=keyset')
+            second_url = first.data['next']
+            etag = self.get_check_200(second_url)['ETag']
+
+            # 첫 페이지에 새 댓글이 생겨도 두 번째 페이지의 범위는 그대로다.
+            Comment.objects.create(author=self.user1, post=self.post_obj, text='newest')
+            self.get_conditional(second_url, etag)
+            self.assert_http_304_not_modified()
+
+            self.get_conditional(f'{self.comments_url}?pagination=keyset', first['ETag'])
+            self.assert_http_200_ok()
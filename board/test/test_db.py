@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connection, connections, transaction
+from django.test import TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from test_plus import APITestCase
+
+from board import db
+from board.models import Boards, Post
+
+
+class SqliteProfileTestCase(APITestCase):
+
+    def test_pragmas_applied(self):
+        connection.close()
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA busy_timeout')
+            self.assertEqual(cursor.fetchone()[0], 5000)
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+    @override_settings(BOARD_DB_PROFILE='stock', BOARD_DB_PRAGMAS={'cache_size': -1000})
+    def test_profile_override(self):
+        self.assertEqual(db.get_pragmas(), {'cache_size': -1000})
+
+
+class ReadRoutingTestCase(TransactionTestCase):
+    databases = {'default', 'read'}
+
+    def setUp(self):
+        self.user = get_user_model().objects.create_user(username='user1', password='strong_password_1')
+        self.board = Boards.objects.create(author=self.user, title='board')
+        Post.objects.create(author=self.user, board=self.board, title='title', content='content')
+        self.client.force_login(self.user)
+
+    def test_list_reads_from_read_alias(self):
+        with CaptureQueriesContext(connections['read']) as read:
+            response = self.client.get(f'/board/{self.board.pk}/post/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 1)
+        self.assertTrue(any('"post"' in query['sql'] for query in read.captured_queries))
+
+    def test_writes_stay_on_default(self):
+        with CaptureQueriesContext(connections['read']) as read:
+            response = self.client.post(f'/board/{self.board.pk}/post/', {'title': 'new', 'content': 'content'})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(read.captured_queries, [])
+
+    def test_atomic_block_reads_default(self):
+        token = db.activate_read()
+        try:
+            self.assertEqual(db.ReadRouter().db_for_read(Post), 'read')
+            with transaction.atomic():
+                self.assertIsNone(db.ReadRouter().db_for_read(Post))
+        finally:
+            db.deactivate_read(token)
+        self.assertIsNone(db.ReadRouter().db_for_read(Post))
+
+    def test_read_connection_is_query_only(self):
+        connections['read'].close()
+        with self.assertRaises(OperationalError):
+            with connections['read'].cursor() as cursor:
+                cursor.execute('DELETE FROM post')
+        self.assertEqual(Post.objects.count(), 1)
@@ -0,0 +1,179 @@
+import json
+
+from asgiref.sync import sync_to_async
+from asgiref.testing import ApplicationCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.test import Client, TransactionTestCase, override_settings
+
+from board import events, throttling
+from board.models import Boards, BoardEvent, Post
+from board.sse import EventStreamApp
+
+JSON = 'application/json'
+
+
+async def not_found(scope, receive, send):
+    await send({'type': 'http.response.start', 'status': 404, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b''})
+
+
+def parse(body):
+    # SSE 본문을 [(event, id, data)] 로
+    parsed = []
+    for block in body.decode().split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.split('\n') if line and not line.startswith(':'))
+        if fields:
+            parsed.append((fields.get('event'), fields.get('id'), json.loads(fields.get('data', '{}'))))
+    return parsed
+
+
+@override_settings(BOARD_EVENT_LIKE_WINDOW=0, BOARD_EVENT_KEEPALIVE=0.2)
+class EventStreamTestCase(TransactionTestCase):
+    # 스트림은 다른 스레드의 DB 연결로 조회하므로 커밋된 데이터가 필요하다.
+    databases = {'default', 'read'}
+
+    def setUp(self):
+        User = get_user_model()
+        self.user1 = User.objects.create_user(username='user1', password='strong_password_1')
+        self.user2 = User.objects.create_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.other = Post.objects.create(author=self.user1, board=self.board, title='other', content='content')
+        self.posts_url = f'/board/{self.board.pk}/post/'
+        self.comments_url = f'{self.posts_url}{self.post_obj.pk}/comment/'
+
+        self.client = Client()
+        self.client.force_login(self.user2)
+
+    def kinds(self):
+        return list(BoardEvent.objects.order_by('pk').values_list('kind', flat=True))
+
+    def open_stream(self, path, headers=(), client=None):
+        client = client or self.client
+        cookie = f'{settings.SESSION_COOKIE_NAME}={client.cookies[settings.SESSION_COOKIE_NAME].value}'
+        scope = {
+            'type': 'http', 'method': 'GET', 'path': path, 'query_string': b'', 'scheme': 'http',
+            'server': ('testserver', 80), 'headers': [(b'cookie', cookie.encode()), *headers],
+        }
+        communicator = ApplicationCommunicator(EventStreamApp(not_found), scope)
+        return communicator
+
+    async def read_events(self, communicator, count):
+        received = []
+        while len(received) < count:
+            message = await communicator.receive_output(timeout=5)
+            if message['type'] == 'http.response.body':
+                received.extend(parse(message['body']))
+        return received
+
+    async def close(self, communicator):
+        await communicator.send_input({'type': 'http.disconnect'})
+        await communicator.wait(timeout=5)
+
+    def test_writes_are_logged(self):
+        response = self.client.post(self.comments_url, {'text': '댓글'}, content_type=JSON)
+        comment = response.json()['pk']
+        self.client.patch(f'{self.comments_url}{comment}/', {'text': '고친 댓글'}, content_type=JSON)
+        self.client.post(f'{self.comments_url}{comment}/like/')
+        self.client.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+        self.client.delete(f'{self.comments_url}{comment}/')
+
+        self.assertEqual(self.kinds(), ['comment.created', 'comment.updated', 'comment.like', 'post.like',
+                                        'comment.deleted'])
+        created, updated, liked = [
+            json.loads(data) for data in BoardEvent.objects.order_by('pk').values_list('data', flat=True)[:3]
+        ]
+        self.assertEqual(created['text'], '댓글')
+        self.assertEqual(created['author'], {'username': 'user2'})
+        self.assertEqual((created['board'], created['post']), (self.board.pk, self.post_obj.pk))
+        self.assertEqual(updated['text'], '고친 댓글')
+        self.assertEqual(liked, {'pk': comment, 'board': self.board.pk, 'post': self.post_obj.pk, 'like_count': 1})
+
+    @override_settings(BOARD_EVENT_LIKE_WINDOW=60)
+    def test_likes_are_coalesced(self):
+        self.client.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+        self.client.delete(f'{self.posts_url}{self.post_obj.pk}/like/')
+        other = Client()
+        other.force_login(self.user1)
+        other.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+        other.post(f'{self.posts_url}likes/', [{'pk': self.other.pk, 'like': True}], content_type=JSON)
+        self.assertEqual(self.kinds(), [])
+
+        self.assertEqual(events.flush_likes(), 2)
+        counts = {
+            event.object_id: json.loads(event.data)['like_count'] for event in BoardEvent.objects.all()
+        }
+        self.assertEqual(counts, {self.post_obj.pk: 1, self.other.pk: 1})
+        self.assertEqual(events.flush_likes(), 0)
+
+    async def test_stream(self):
+        communicator = self.open_stream(f'{self.posts_url}{self.post_obj.pk}/events/')
+        await communicator.send_input({'type': 'http.request', 'body': b''})
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 200)
+        self.assertIn((b'content-type', b'text/event-stream'), start['headers'])
+
+        # 다른 게시글의 이벤트는 받지 않는다.
+        await sync_to_async(self.client.post)(f'{self.posts_url}{self.other.pk}/like/')
+        await sync_to_async(self.client.post)(self.comments_url, {'text': '댓글'}, content_type=JSON)
+        await sync_to_async(self.client.post)(f'{self.posts_url}{self.post_obj.pk}/like/')
+        received = await self.read_events(communicator, 2)
+        self.assertEqual([(kind, data['pk']) for kind, _, data in received],
+                         [('comment.created', received[0][2]['pk']), ('post.like', self.post_obj.pk)])
+        self.assertEqual(received[1][2]['like_count'], 1)
+        await self.close(communicator)
+
+        # 마지막으로 받은 id 뒤부터 이어받는다. 게시판 스트림은 게시판의 모든 글을 받는다.
+        last_id = received[0][1]
+        communicator = self.open_stream(f'/board/{self.board.pk}/events/', [(b'last-event-id', last_id.encode())])
+        resumed = await self.read_events(communicator, 1)
+        self.assertEqual([kind for kind, _, _ in resumed], ['post.like'])
+        self.assertEqual(resumed[0][1], received[1][1])
+
+        # 조용하면 keep-alive 주석을 보낸다.
+        message = await communicator.receive_output(timeout=5)
+        self.assertEqual(message['body'], b': keepalive\n\n')
+        await self.close(communicator)
+
+    @override_settings(BOARD_EVENT_LOG_SIZE=10)
+    async def test_expired_resume(self):
+        items = [{'text': f'text {i}'} for i in range(120)]
+        await sync_to_async(self.client.post)(f'{self.comments_url}bulk/', items, content_type=JSON)
+        self.assertEqual(await sync_to_async(BoardEvent.objects.count)(), 10)
+
+        communicator = self.open_stream(f'{self.posts_url}{self.post_obj.pk}/events/', [(b'last-event-id', b'1')])
+        received = await self.read_events(communicator, 11)
+        self.assertEqual(received[0][0], 'reset')
+        self.assertEqual([data['text'] for _, _, data in received[1:]], [f'text {i}' for i in range(110, 120)])
+        await self.close(communicator)
+
+    async def test_forbidden_and_missing(self):
+        anonymous = Client()
+        anonymous.cookies[settings.SESSION_COOKIE_NAME] = 'missing'
+        paths = [
+            (f'/board/{self.board.pk}/events/', anonymous, 403),
+            ('/board/999/events/', self.client, 404),
+            (f'/board/{self.board.pk}/post/999/events/', self.client, 404),
+        ]
+        for path, client, status in paths:
+            communicator = self.open_stream(path, client=client)
+            start = await communicator.receive_output(timeout=5)
+            self.assertEqual(start['status'], status, path)
+            await communicator.wait(timeout=5)
+
+    @override_settings(BOARD_THROTTLE='local', BOARD_THROTTLE_RATES={'read': '1/m'}, BOARD_THROTTLE_BURST={'read': 1})
+    async def test_throttled(self):
+        # 연결마다 읽기 토큰을 하나 쓴다.
+        throttling.get_store().clear()
+        path = f'/board/{self.board.pk}/events/'
+        communicator = self.open_stream(path)
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 200)
+        await self.close(communicator)
+
+        communicator = self.open_stream(path)
+        start = await communicator.receive_output(timeout=5)
+        self.assertEqual(start['status'], 429)
+        self.assertIn((b'retry-after', b'60'), start['headers'])
+        await communicator.wait(timeout=5)
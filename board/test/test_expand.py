@@ -0,0 +1,83 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class ExpandCommentsTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.posts = [
+            Post.objects.create(author=self.user1, board=self.board, title=f'title {i}', content='content')
+            for i in range(12)
+        ]
+        self.url = f'/board/{self.board.pk}/post/?expand=comments'
+
+    def test_count_and_latest_comments(self):
+        post = self.posts[-1]
+        comments = [Comment.objects.create(author=self.user2, post=post, text=f'text {i}') for i in range(5)]
+        comments[4].like_comment.add(self.user1)
+
+        with self.login(username='user1', password='strong_password_1'):
+            results = self.get_check_200(self.url).data['results']
+
+        self.assertEqual(results[0]['pk'], post.pk)
+        self.assertEqual(results[0]['comment_count'], 5)
+        self.assertEqual([comment['text'] for comment in results[0]['comments']], ['text 4', 'text 3', 'text 2'])
+        self.assertEqual([comment['is_like'] for comment in results[0]['comments']], [True, False, False])
+        self.assertFalse(results[0]['comments'][0]['is_author'])
+        self.assertEqual(results[1]['comment_count'], 0)
+        self.assertEqual(results[1]['comments'], [])
+
+    def test_without_expand(self):
+        with self.login(username='user1', password='strong_password_1'):
+            results = self.get_check_200(f'/board/{self.board.pk}/post/').data['results']
+        self.assertNotIn('comments', results[0])
+        self.assertNotIn('comment_count', results[0])
+
+    def test_constant_queries(self):
+        def run(limit):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.get(f'{self.url}&limit={limit}')
+            self.assertEqual(len(response.data['results']), limit)
+            return len(ctx.captured_queries)
+
+        for post in self.posts:
+            for i in range(4):
+                Comment.objects.create(author=self.user2, post=post, text=f'text {i}')
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.assertEqual(run(2), run(12))
+            # session, user, ETag(페이지 범위), 펼친 댓글 validator, page, liked ids, 최신 댓글, 댓글 liked ids
+            with self.assertNumQueries(8):
+                self.get(self.url)
+
+            response = self.get(f'{self.url}&pagination=keyset')
+            self.assertEqual(response.data['results'][0]['comment_count'], 4)
+
+    def test_new_comment_changes_etag(self):
+        with self.login(username='user1', password='strong_password_1'):
+            etag = self.get_check_200(self.url)['ETag']
+            self.get(self.url, extra={'HTTP_IF_NONE_MATCH': etag})
+            self.assert_http_304_not_modified()
+
+            # 현재 페이지 밖 게시글의 댓글은 ETag 에 들어가지 않는다.
+            Comment.objects.create(author=self.user2, post=self.posts[0], text='old')
+            self.get(self.url, extra={'HTTP_IF_NONE_MATCH': etag})
+            self.assert_http_304_not_modified()
+
+            comment = Comment.objects.create(author=self.user2, post=self.posts[-1], text='new')
+            response = self.get(self.url, extra={'HTTP_IF_NONE_MATCH': etag})
+            self.assert_http_200_ok()
+            self.assertNotEqual(response['ETag'], etag)
+
+            etag = response['ETag']
+            comment.like_comment.add(self.user1)
+            Comment.objects.filter(pk=comment.pk).update(like_count=1)
+            response = self.get(self.url, extra={'HTTP_IF_NONE_MATCH': etag})
+            self.assert_http_200_ok()
+            self.assertTrue(response.data['results'][0]['comments'][0]['is_like'])
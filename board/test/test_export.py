@@ -0,0 +1,108 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class ExportTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.admin = self.make_user(username='admin', password='strong_password_2')
+        self.admin.is_staff = True
+        self.admin.save()
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.posts = [
+            Post.objects.create(author=self.user1, board=self.board, title=f'제목 {i}', content='a, "quoted"\nline')
+            for i in range(5)
+        ]
+        self.comment = Comment.objects.create(author=self.user1, post=self.posts[0], text='text')
+        self.posts[0].like_post.add(self.user1, self.admin)
+
+    def export(self, name, **params):
+        with self.login(username='admin', password='strong_password_2'):
+            response = self.get(f'/export/{name}/', data=params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        body = b''.join(response.streaming_content)
+        return response, body
+
+    def ndjson(self, name, **params):
+        _, body = self.export(name, **params)
+        return [json.loads(line) for line in body.decode().splitlines()]
+
+    def test_staff_only(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.get('/export/posts/')
+            self.response_403()
+
+    def test_ndjson(self):
+        rows = self.ndjson('posts')
+        self.assertEqual([row['id'] for row in rows], [post.pk for post in self.posts])
+        self.assertEqual(rows[0]['title'], '제목 0')
+        self.assertEqual(rows[0]['board_id'], self.board.pk)
+
+        self.assertEqual(self.ndjson('boards')[0]['title'], 'board')
+        self.assertEqual(self.ndjson('comments')[0]['post_id'], self.posts[0].pk)
+        self.assertEqual({row['user_id'] for row in self.ndjson('post_likes')}, {self.user1.pk, self.admin.pk})
+
+    @override_settings(BOARD_EXPORT_CHUNK_SIZE=2)
+    def test_csv_in_chunks(self):
+        response, body = self.export('posts', fmt='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.reader(io.StringIO(body.decode())))
+        self.assertEqual(rows[0][:3], ['id', 'board_id', 'author_id'])
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][4], 'a, "quoted"\nline')
+
+    def test_incremental(self):
+        response, _ = self.export('posts')
+        watermark = response['X-Export-Watermark']
+
+        Post.objects.filter(pk=self.posts[1].pk).update(updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual([row['id'] for row in self.ndjson('posts', since=watermark)], [self.posts[1].pk])
+        self.assertEqual([row['id'] for row in self.ndjson('posts', after_id=self.posts[3].pk)], [self.posts[4].pk])
+
+        # 삭제 표시도 증분으로 나온다.
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{self.board.pk}/post/{self.posts[2].pk}/')
+            self.response_204()
+        rows = self.ndjson('posts', since=watermark)
+        self.assertEqual([row['id'] for row in rows], [self.posts[1].pk, self.posts[2].pk])
+        self.assertIsNone(rows[0]['deleted_at'])
+        self.assertIsNotNone(rows[1]['deleted_at'])
+        self.assertEqual(len(self.ndjson('posts')), 5)
+
+        with self.login(username='admin', password='strong_password_2'):
+            self.get('/export/posts/', data={'since': 'yesterday'})
+            self.assert_http_400_bad_request()
+            self.get('/export/post_likes/', data={'since': watermark})
+            self.assert_http_400_bad_request()
+            self.get('/export/users/')
+            self.assert_http_404_not_found()
+
+    @override_settings(BOARD_EXPORT_CHUNK_SIZE=2)
+    def test_gzip(self):
+        response, body = self.export('posts', gzip=1)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertIn('posts.ndjson.gz', response['Content-Disposition'])
+        lines = gzip.decompress(body).decode().splitlines()
+        self.assertEqual(len(lines), 5)
+
+    def test_command(self):
+        path = os.path.join(tempfile.mkdtemp(), 'comments.csv.gz')
+        call_command('export_data', 'comments', '--fmt', 'csv', '--gzip', '--output', path, stderr=io.StringIO())
+        with gzip.open(path, 'rt') as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[1][0], str(self.comment.pk))
+        os.remove(path)
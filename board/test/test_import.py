@@ -0,0 +1,140 @@
+import csv
+import io
+import json
+import os
+import tempfile
+from datetime import datetime, timezone
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment, ImportCheckpoint, ImportIdMap
+
+
+class ImportTestCase(APITestCase):
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        # 이관 전부터 있던 데이터와 id 가 겹치도록 둔다.
+        self.existing = self.make_user(username='existing', password='strong_password_1')
+        Boards.objects.create(author=self.existing, title='existing')
+
+    def tearDown(self):
+        for name in os.listdir(self.dir):
+            os.remove(os.path.join(self.dir, name))
+        os.rmdir(self.dir)
+
+    def write_ndjson(self, name, records):
+        path = os.path.join(self.dir, f'{name}.ndjson')
+        with open(path, 'w') as f:
+            f.writelines(json.dumps(record) + '\n' for record in records)
+        return path
+
+    def write_csv(self, name, records):
+        path = os.path.join(self.dir, f'{name}.csv')
+        with open(path, 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=list(records[0]))
+            writer.writeheader()
+            writer.writerows(records)
+        return path
+
+    def run_import(self, kind, path, *args, stderr=None):
+        out = io.StringIO()
+        call_command('import_forum_data', kind, path, '--batch-size', '2', *args, stdout=out,
+                     stderr=stderr or io.StringIO())
+        return out.getvalue()
+
+    def import_all(self):
+        self.run_import('users', self.write_ndjson('users', [
+            {'id': 1, 'username': 'old1', 'created_at': '2015-01-01T00:00:00Z'},
+            {'id': 2, 'username': 'old2', 'created_at': '2015-01-02T00:00:00Z'},
+        ]))
+        self.run_import('boards', self.write_csv('boards', [
+            {'id': 1, 'author_id': 1, 'title': 'legacy board', 'created_at': '2015-02-01T00:00:00Z'},
+        ]))
+        self.run_import('posts', self.write_ndjson('posts', [
+            {'id': 10 + i, 'board_id': 1, 'author_id': 1 + i % 2, 'title': f'post {i}', 'content': 'content',
+             'created_at': f'2016-03-0{i + 1}T00:00:00Z', 'updated_at': '2017-01-01T00:00:00Z'}
+            for i in range(5)
+        ]))
+        self.run_import('comments', self.write_csv('comments', [
+            {'id': 100, 'post_id': 10, 'author_id': 2, 'text': 'first', 'created_at': '2016-04-01T00:00:00Z'},
+            {'id': 101, 'post_id': 99, 'author_id': 2, 'text': 'orphan', 'created_at': '2016-04-01T00:00:00Z'},
+        ]))
+        self.run_import('post_likes', self.write_ndjson('post_likes', [
+            {'post_id': 10, 'user_id': 1}, {'post_id': 10, 'user_id': 2}, {'post_id': 11, 'user_id': 2},
+        ]))
+        self.run_import('comment_likes', self.write_ndjson('comment_likes', [{'comment_id': 100, 'user_id': 1}]))
+
+    def new_id(self, kind, legacy_id):
+        return ImportIdMap.objects.get(source='legacy', kind=kind, legacy_id=str(legacy_id)).new_id
+
+    def test_import(self):
+        self.import_all()
+
+        old1 = get_user_model().objects.get(username='old1')
+        self.assertEqual(self.new_id('users', 1), old1.pk)
+        self.assertFalse(old1.has_usable_password())
+
+        board = Boards.objects.get(pk=self.new_id('boards', 1))
+        self.assertEqual(board.title, 'legacy board')
+        self.assertEqual(board.author, old1)
+        self.assertEqual(board.created_at, datetime(2015, 2, 1, tzinfo=timezone.utc))
+
+        post = Post.objects.get(pk=self.new_id('posts', 10))
+        self.assertEqual((post.board, post.title), (board, 'post 0'))
+        self.assertEqual(post.created_at, datetime(2016, 3, 1, tzinfo=timezone.utc))
+        self.assertEqual(post.updated_at, datetime(2017, 1, 1, tzinfo=timezone.utc))
+        self.assertEqual(post.like_count, 2)
+        self.assertEqual(Post.objects.get(pk=self.new_id('posts', 11)).like_count, 1)
+
+        comment = Comment.objects.get()
+        self.assertEqual((comment.post, comment.text, comment.like_count), (post, 'first', 1))
+        checkpoint = ImportCheckpoint.objects.get(kind='comments')
+        self.assertEqual((checkpoint.records, checkpoint.imported, checkpoint.skipped), (2, 1, 1))
+
+        # 이관이 끝나면 auto_now 가 돌아와야 한다.
+        created = Post.objects.create(author=old1, board=board, title='new', content='content')
+        self.assertEqual(created.created_at.year, datetime.now().year)
+
+    def test_resume_and_rerun(self):
+        self.import_all()
+        path = self.write_ndjson('posts', [
+            {'id': 10 + i, 'board_id': 1, 'author_id': 1, 'title': f'post {i}', 'content': 'content'}
+            for i in range(7)
+        ])
+        # 체크포인트 이후(5번째 레코드부터)만 읽는다.
+        self.assertIn('2 imported, 0 skipped', self.run_import('posts', path))
+        self.assertEqual(Post.objects.count(), 7)
+
+        # 처음부터 다시 읽어도 이미 옮긴 id 는 건너뛴다.
+        self.assertIn('0 imported, 7 skipped', self.run_import('posts', path, '--restart'))
+        self.assertEqual(Post.objects.count(), 7)
+
+    def test_sources_are_separate(self):
+        path = self.write_ndjson('users', [{'id': 1, 'username': 'other1'}])
+        self.run_import('users', path, '--source', 'other')
+        self.assertEqual(ImportIdMap.objects.get(source='other', kind='users').legacy_id, '1')
+
+        out = self.run_import('boards', self.write_ndjson('boards', [{'id': 1, 'author_id': 1, 'title': 'b'}]))
+        self.assertIn('0 imported, 1 skipped', out)
+
+    def test_username_conflicts(self):
+        # 이미 있거나 파일 안에서 겹치는 username 은 그 행만 건너뛰고 알린다.
+        err = io.StringIO()
+        out = self.run_import('users', self.write_ndjson('users', [
+            {'id': 1, 'username': 'old1'},
+            {'id': 2, 'username': 'existing'},
+            {'id': 3, 'username': 'old3'},
+            {'id': 4, 'username': 'old3'},
+        ]), stderr=err)
+        self.assertIn('2 imported, 2 skipped', out)
+        self.assertIn("users 2: skipped, username 'existing' already exists", err.getvalue())
+        self.assertIn("users 4: skipped, username 'old3' already exists", err.getvalue())
+
+        User = get_user_model()
+        self.assertEqual(self.new_id('users', 1), User.objects.get(username='old1').pk)
+        self.assertEqual(self.new_id('users', 3), User.objects.get(username='old3').pk)
+        self.assertFalse(ImportIdMap.objects.filter(kind='users', legacy_id__in=['2', '4']).exists())
+        self.assertEqual(User.objects.get(username='existing'), self.existing)
@@ -0,0 +1,88 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+JSON = {'format': 'json'}
+
+
+class LikeBatchTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.other_board = Boards.objects.create(author=self.user1, title='other')
+        self.posts = [
+            Post.objects.create(author=self.user1, board=self.board, title=f'title {i}', content='content')
+            for i in range(25)
+        ]
+        self.url = f'/board/{self.board.pk}/post/likes/'
+
+    def test_like_and_unlike(self):
+        first, second, third = self.posts[:3]
+        second.like_post.add(self.user2)
+        Post.objects.filter(pk=second.pk).update(like_count=1)
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(self.url, data=[
+                {'pk': first.pk, 'like': True},
+                {'pk': second.pk, 'like': True},
+                {'pk': third.pk, 'like': False},
+            ], extra=JSON)
+            self.assert_http_200_ok()
+
+            self.assertEqual(response.data, [
+                {'pk': first.pk, 'status': 200, 'is_like': True, 'like_count': 1},
+                {'pk': second.pk, 'status': 200, 'is_like': True, 'like_count': 2},
+                {'pk': third.pk, 'status': 200, 'is_like': False, 'like_count': 0},
+            ])
+
+            # 단건 API 와 같은 상태를 본다.
+            self.post(f'/board/{self.board.pk}/post/{first.pk}/like/')
+            self.assert_http_400_bad_request()
+
+            response = self.post(self.url, data=[{'pk': second.pk, 'like': False}], extra=JSON)
+            self.assertEqual(response.data[0]['like_count'], 1)
+
+        self.assertEqual(list(second.like_post.all()), [self.user2])
+        self.assertTrue(first.like_post.filter(pk=self.user1.pk).exists())
+
+    def test_repeated_batch_is_idempotent(self):
+        items = [{'pk': post.pk, 'like': True} for post in self.posts[:5]]
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(self.url, data=items, extra=JSON)
+            response = self.post(self.url, data=items, extra=JSON)
+
+        self.assertEqual({result['like_count'] for result in response.data}, {1})
+        self.assertEqual(Post.like_post.through.objects.count(), 5)
+
+    def test_unknown_or_other_board(self):
+        foreign = Post.objects.create(author=self.user1, board=self.other_board, title='foreign', content='content')
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(self.url, data=[{'pk': foreign.pk, 'like': True}, {'pk': 999, 'like': True}], extra=JSON)
+            self.assertEqual([result['status'] for result in response.data], [404, 404])
+
+            self.post(self.url, data=[{'pk': self.posts[0].pk, 'like': 'yes'}], extra=JSON)
+            self.assert_http_400_bad_request()
+
+        self.assertFalse(foreign.like_post.exists())
+
+    def test_constant_queries(self):
+        def run(posts):
+            with CaptureQueriesContext(connection) as ctx:
+                self.post(self.url, data=[{'pk': post.pk, 'like': True} for post in posts], extra=JSON)
+            return len(ctx.captured_queries)
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.assertEqual(run(self.posts[:3]), run(self.posts[3:25]))
+
+    def test_comment_batch(self):
+        comments = [Comment.objects.create(author=self.user1, post=self.posts[0], text=f'text {i}') for i in range(3)]
+        url = f'/board/{self.board.pk}/post/{self.posts[0].pk}/comment/likes/'
+        with self.login(username='user2', password='strong_password_2'):
+            response = self.post(url, data=[{'pk': comment.pk, 'like': True} for comment in comments], extra=JSON)
+
+        self.assertEqual({result['like_count'] for result in response.data}, {1})
+        self.assertEqual(Comment.like_comment.through.objects.filter(user=self.user2).count(), 3)
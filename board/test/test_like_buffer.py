@@ -0,0 +1,167 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache as default_cache
+from django.core.management import call_command
+from django.test import override_settings
+from test_plus import APITestCase
+
+from board import like_buffer, likes
+from board.models import Boards, Post, Comment
+
+JSON = {'format': 'json'}
+
+
+@override_settings(BOARD_LIKE_BUFFER='local', BOARD_LIKE_BUFFER_FLUSH_INTERVAL=0)
+class LikeBufferTestCase(APITestCase):
+
+    def setUp(self):
+        like_buffer.get_buffer().clear()
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='text')
+        self.posts_url = f'/board/{self.board.pk}/post/'
+        self.post_url = f'{self.posts_url}{self.post_obj.pk}/'
+        self.comment_url = f'{self.post_url}comment/{self.comment.pk}/'
+
+    def test_like_is_buffered(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.assert_http_201_created()
+            self.post(f'{self.post_url}like/')
+            self.assert_http_400_bad_request()
+
+        self.assertFalse(Post.like_post.through.objects.exists())
+        self.assertEqual(Post.objects.get(pk=self.post_obj.pk).like_count, 0)
+
+    def test_read_your_writes(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.post(f'{self.comment_url}like/')
+
+            post = self.get_check_200(self.post_url).data
+            self.assertEqual((post['is_like'], post['like_count']), (True, 1))
+            listed = self.get_check_200(self.posts_url).data['results'][0]
+            self.assertEqual((listed['is_like'], listed['like_count']), (True, 1))
+            comment = self.get_check_200(self.comment_url).data
+            self.assertEqual((comment['is_like'], comment['like_count']), (True, 1))
+
+        with self.login(username='user2', password='strong_password_2'):
+            post = self.get_check_200(self.post_url).data
+            self.assertEqual((post['is_like'], post['like_count']), (False, 1))
+
+    def test_unlike_before_flush_cancels_out(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.delete(f'{self.post_url}like/')
+            self.assert_http_204_no_content()
+            self.delete(f'{self.post_url}like/')
+            self.assert_http_400_bad_request()
+            self.assertEqual(self.get_check_200(self.post_url).data['like_count'], 0)
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertFalse(Post.like_post.through.objects.exists())
+
+    def test_flush_applies_intents(self):
+        self.post_obj.like_post.add(self.user2)
+        Post.objects.filter(pk=self.post_obj.pk).update(like_count=1)
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.post(f'{self.comment_url}like/')
+        with self.login(username='user2', password='strong_password_2'):
+            self.delete(f'{self.post_url}like/')
+
+        out = StringIO()
+        call_command('flush_likes', stdout=out)
+        self.assertIn('3 intents flushed', out.getvalue())
+
+        self.assertEqual(list(self.post_obj.like_post.all()), [self.user1])
+        self.assertEqual(Post.objects.get(pk=self.post_obj.pk).like_count, 1)
+        self.assertEqual(Comment.objects.get(pk=self.comment.pk).like_count, 1)
+        self.assertEqual(like_buffer.flush(), 0)
+
+        with self.login(username='user1', password='strong_password_1'):
+            post = self.get_check_200(self.post_url).data
+            self.assertEqual((post['is_like'], post['like_count']), (True, 1))
+
+    def test_toggle_during_flush(self):
+        # 비우는 동안 다시 토글한 의도는 반영된 상태를 기준으로 남는다.
+        apply_likes = likes.apply_likes
+
+        def unlike_while_applying(*args):
+            result = apply_likes(*args)
+            like_buffer.toggle(Post, self.post_obj.pk, self.user1, False)
+            return result
+
+        like_buffer.toggle(Post, self.post_obj.pk, self.user1, True)
+        with mock.patch('board.likes.apply_likes', unlike_while_applying):
+            self.assertEqual(like_buffer.flush(), 1)
+
+        self.assertEqual(Post.objects.get(pk=self.post_obj.pk).like_count, 1)
+        self.assertEqual(like_buffer.count_deltas(Post, [self.post_obj.pk]), {self.post_obj.pk: -1})
+        with self.login(username='user1', password='strong_password_1'):
+            post = self.get_check_200(self.post_url).data
+            self.assertEqual((post['is_like'], post['like_count']), (False, 0))
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertEqual(Post.objects.get(pk=self.post_obj.pk).like_count, 0)
+        self.assertEqual(like_buffer.get_buffer().snapshot(), {})
+
+    def test_flush_skips_deleted(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+        self.post_obj.delete()
+
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertFalse(Post.like_post.through.objects.exists())
+
+    def test_batch_and_lean_list(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(f'{self.posts_url}likes/', data=[{'pk': self.post_obj.pk, 'like': True}], extra=JSON)
+            self.assertEqual(response.data[0]['like_count'], 1)
+
+            with override_settings(BOARD_LEAN_LIST=True):
+                listed = self.get_check_200(self.posts_url).data['results'][0]
+            self.assertEqual((listed['is_like'], listed['like_count']), (True, 1))
+
+        self.assertFalse(Post.like_post.through.objects.exists())
+
+    def test_etag_changes(self):
+        with self.login(username='user1', password='strong_password_1'):
+            etag = self.get_check_200(self.posts_url)['ETag']
+            self.post(f'{self.post_url}like/')
+            self.get(self.posts_url, extra={'HTTP_IF_NONE_MATCH': etag})
+            self.response_200()
+
+    @override_settings(BOARD_LIKE_BUFFER='cache')
+    def test_cache_buffer(self):
+        default_cache.clear()
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.assertEqual(self.get_check_200(self.post_url).data['like_count'], 1)
+
+        self.assertIsInstance(like_buffer.get_buffer(), like_buffer.CacheLikeBuffer)
+        self.assertEqual(like_buffer.flush(), 1)
+        self.assertTrue(self.post_obj.like_post.filter(pk=self.user1.pk).exists())
+
+    @override_settings(BOARD_LIKE_BUFFER='cache')
+    def test_cache_buffer_reads_page_keys(self):
+        # 조회는 전체 버퍼를 읽지 않고 페이지의 (모델, pk) / (모델, 사용자) 색인만 읽는다.
+        default_cache.clear()
+        other = Post.objects.create(author=self.user1, board=self.board, title='other', content='content')
+        like_buffer.toggle(Post, other.pk, self.user2, True)
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            with mock.patch.object(like_buffer.CacheLikeBuffer, 'snapshot', side_effect=AssertionError):
+                post = self.get_check_200(self.post_url).data
+                listed = {row['pk']: row for row in self.get_check_200(self.posts_url).data['results']}
+        self.assertEqual((post['is_like'], post['like_count']), (True, 1))
+        self.assertEqual((listed[other.pk]['is_like'], listed[other.pk]['like_count']), (False, 1))
+
+        self.assertEqual(like_buffer.flush(), 2)
+        buffer = like_buffer.get_buffer()
+        self.assertIsNone(default_cache.get(buffer.object_key('board.post', other.pk)))
+        self.assertIsNone(default_cache.get(buffer.user_key('board.post', self.user1.pk)))
@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.core.management import call_command
+from test_plus import APITestCase
+
+from board import likes
+from board.models import Boards, BoardStats, Post, Comment
+
+
+class LikeCountTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='text')
+        self.post_url = f'/board/{self.board.pk}/post/{self.post_obj.pk}/'
+        self.comment_url = f'{self.post_url}comment/{self.comment.pk}/'
+
+    def test_post_like_count(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.assert_http_201_created()
+            self.post(f'{self.post_url}like/')
+            self.assert_http_400_bad_request()
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.post(f'{self.post_url}like/')
+            self.post_obj.refresh_from_db()
+            self.assertEqual(self.post_obj.like_count, 2)
+
+            self.delete(f'{self.post_url}like/')
+            self.assert_http_204_no_content()
+            self.delete(f'{self.post_url}like/')
+            self.assert_http_400_bad_request()
+            self.post_obj.refresh_from_db()
+            self.assertEqual(self.post_obj.like_count, 1)
+
+    def test_set_like_counts_inserted_rows(self):
+        # 같은 사용자의 다른 요청이 먼저 through 행을 넣었다면 이 요청은 좋아요를 다시 세지 않는다.
+        self.post_obj.like_post.add(self.user1)
+        Post.objects.filter(pk=self.post_obj.pk).update(like_count=1)
+        stats = BoardStats.objects.get(board=self.board).like_count
+
+        self.assertFalse(likes.set_like(Post, self.post_obj.pk, self.user1, True))
+        self.assertTrue(likes.set_like(Post, self.post_obj.pk, self.user2, True))
+        self.post_obj.refresh_from_db()
+        self.assertEqual(self.post_obj.like_count, 2)
+        self.assertEqual(BoardStats.objects.get(board=self.board).like_count, stats + 1)
+
+        self.assertTrue(likes.set_like(Post, self.post_obj.pk, self.user2, False))
+        self.assertFalse(likes.set_like(Post, self.post_obj.pk, self.user2, False))
+        self.post_obj.refresh_from_db()
+        self.assertEqual(self.post_obj.like_count, 1)
+        self.assertEqual(BoardStats.objects.get(board=self.board).like_count, stats)
+
+    def test_comment_like_count(self):
+        with self.login(username='user2', password='strong_password_2'):
+            self.post(f'{self.comment_url}like/')
+            self.comment.refresh_from_db()
+            self.assertEqual(self.comment.like_count, 1)
+
+            self.delete(f'{self.comment_url}like/')
+            self.comment.refresh_from_db()
+            self.assertEqual(self.comment.like_count, 0)
+
+    def test_update_keeps_like_count(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'{self.post_url}like/')
+            self.patch(self.post_url, data={'title': 'fix', 'like_count': 100})
+            self.assert_http_200_ok()
+            self.post_obj.refresh_from_db()
+            self.assertEqual(self.post_obj.title, 'fix')
+            self.assertEqual(self.post_obj.like_count, 1)
+
+    def test_refresh_like_count_command(self):
+        self.post_obj.like_post.add(self.user1, self.user2)
+        self.comment.like_comment.add(self.user2)
+        Post.objects.update(like_count=7)
+
+        out = StringIO()
+        call_command('refresh_like_count', '--check', stdout=out)
+        self.assertIn('post: 1 drifted', out.getvalue())
+        self.assertIn('comment: 1 drifted', out.getvalue())
+        self.post_obj.refresh_from_db()
+        self.assertEqual(self.post_obj.like_count, 7)
+
+        call_command('refresh_like_count', '--batch-size', '1', stdout=StringIO())
+        self.post_obj.refresh_from_db()
+        self.comment.refresh_from_db()
+        self.assertEqual(self.post_obj.like_count, 2)
+        self.assertEqual(self.comment.like_count, 1)
@@ -0,0 +1,63 @@
+from django.test import override_settings
+from test_plus import APITestCase
+
+from board import metrics
+from board.models import Boards, Post
+
+
+@override_settings(BOARD_METRICS_ENABLED=True)
+class MetricsMiddlewareTestCase(APITestCase):
+
+    def setUp(self):
+        metrics.store.reset()
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.staff = self.make_user(username='staff', password='strong_password_2')
+        self.staff.is_staff = True
+        self.staff.save()
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+
+    def test_server_timing_header(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(f'/board/{self.board.pk}/post/')
+
+        header = response['Server-Timing']
+        self.assertIn('db;dur=', header)
+        self.assertIn('desc="5 queries"', header)
+        self.assertIn('serialize;dur=', header)
+        self.assertIn('total;dur=', header)
+
+    def test_metrics_summary(self):
+        with self.login(username='user1', password='strong_password_1'):
+            for _ in range(3):
+                self.get_check_200(f'/board/{self.board.pk}/post/')
+            self.get_check_200('/board/')
+            self.get('/metrics/')
+            self.assert_http_403_forbidden()
+
+        with self.login(username='staff', password='strong_password_2'):
+            response = self.get_check_200('/metrics/')
+
+        post_list = response.data['post.list']
+        self.assertEqual(post_list['count'], 3)
+        self.assertEqual(post_list['queries'], {'p50': 5, 'p95': 5, 'p99': 5})
+        self.assertEqual(response.data['board.list']['count'], 1)
+        self.assertLessEqual(post_list['db']['p50'], post_list['total']['p50'])
+        self.assertIn('p99', post_list['serialize'])
+
+    def test_percentile(self):
+        values = list(range(1, 101))
+        self.assertEqual(metrics.percentile(values, 50), 50)
+        self.assertEqual(metrics.percentile(values, 95), 95)
+        self.assertEqual(metrics.percentile(values, 99), 99)
+        self.assertEqual(metrics.percentile([7], 99), 7)
+
+
+class MetricsDisabledTestCase(APITestCase):
+
+    def test_no_header_when_disabled(self):
+        self.make_user(username='user1', password='strong_password_1')
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200('/board/')
+
+        self.assertFalse(response.has_header('Server-Timing'))
@@ -0,0 +1,64 @@
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class KeysetPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='first', content='content')
+        for i in range(24):
+            Post.objects.create(author=self.user1, board=self.board, title=f'title {i}', content='content')
+            Comment.objects.create(author=self.user1, post=self.post_obj, text=f'text {i}')
+
+    def walk(self, url):
+        titles = []
+        while url:
+            response = self.get_check_200(url)
+            self.assertNotIn('count', response.data)
+            titles.extend(item.get('title') or item.get('text') for item in response.data['results'])
+            url = response.data['next']
+        return titles
+
+    def test_post_keyset_pages(self):
+        with self.login(username='user1', password='strong_password_1'):
+            titles = self.walk(f'/board/{self.board.pk}/post/?pagination=keyset')
+
+        expected = list(Post.objects.filter(board=self.board).values_list('title', flat=True))
+        self.assertEqual(titles, expected)
+
+    def test_comment_keyset_pages(self):
+        with self.login(username='user1', password='strong_password_1'):
+            texts = self.walk(f'/board/{self.board.pk}/post/{self.post_obj.pk}/comment/?pagination=keyset&limit=7')
+
+        expected = list(Comment.objects.filter(post=self.post_obj).values_list('text', flat=True))
+        self.assertEqual(texts, expected)
+
+    def test_keyset_stable_under_inserts(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(f'/board/{self.board.pk}/post/?pagination=keyset')
+            first_page = [post['title'] for post in response.data['results']]
+
+            Post.objects.create(author=self.user1, board=self.board, title='new', content='content')
+            response = self.get_check_200(response.data['next'])
+            second_page = [post['title'] for post in response.data['results']]
+
+        self.assertNotIn('new', second_page)
+        self.assertFalse(set(first_page) & set(second_page))
+        self.assertEqual(second_page[0], 'title 13')
+
+    def test_keyset_skips_count_query(self):
+        with self.login(username='user1', password='strong_password_1'):
+            # session, user, ETag 집계(현재 페이지 범위), page, liked ids
+            with self.assertNumQueries(5) as ctx:
+                self.get_check_200(f'/board/{self.board.pk}/post/?pagination=keyset')
+
+        counts = [query['sql'] for query in ctx.captured_queries if 'COUNT(' in query['sql']]
+        self.assertTrue(all('LIMIT' in sql for sql in counts), counts)
+
+    def test_offset_is_default(self):
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(f'/board/{self.board.pk}/post/')
+            self.assertEqual(response.data['count'], 25)
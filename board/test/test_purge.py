@@ -0,0 +1,93 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from test_plus import APITestCase
+
+from board import purge, tombstones
+from board.models import Boards, BoardPurge, Post, Comment, PostScore
+
+
+class PurgeTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.other_board = Boards.objects.create(author=self.user1, title='other')
+        self.posts = [
+            Post.objects.create(author=self.user1, board=self.board, title=f'title {i}', content='content')
+            for i in range(3)
+        ]
+        self.comments = [
+            Comment.objects.create(author=self.user2, post=post, text='text') for post in self.posts for _ in range(2)
+        ]
+        self.posts[0].like_post.add(self.user1, self.user2)
+        self.comments[0].like_comment.add(self.user1)
+        self.kept = Post.objects.create(author=self.user1, board=self.other_board, title='kept', content='content')
+        Comment.objects.create(author=self.user2, post=self.kept, text='kept')
+
+    def search_rows(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM board_search')
+            return cursor.fetchone()[0]
+
+    def assert_purged(self):
+        self.assertFalse(Boards.all_objects.filter(pk=self.board.pk).exists())
+        self.assertEqual(list(Post.all_objects.values_list('pk', flat=True)), [self.kept.pk])
+        self.assertEqual(Comment.all_objects.count(), 1)
+        self.assertFalse(Post.like_post.through.objects.exists())
+        self.assertFalse(Comment.like_comment.through.objects.exists())
+        self.assertFalse(PostScore.objects.exclude(post=self.kept).exists())
+        self.assertEqual(self.search_rows(), 2)
+
+        board_purge = BoardPurge.objects.get(board_id=self.board.pk)
+        self.assertIsNotNone(board_purge.finished_at)
+        self.assertEqual((board_purge.posts, board_purge.comments, board_purge.likes), (3, 6, 3))
+
+    def test_delete_then_purge(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{self.board.pk}/')
+            self.assert_http_204_no_content()
+
+            # 표시만 되고 하위 행은 아직 남아 있다.
+            self.assertEqual(Post.all_objects.filter(board=self.board).count(), 3)
+            self.assertEqual([board['pk'] for board in self.get_check_200('/board/').data['results']],
+                             [self.other_board.pk])
+            self.get(f'/board/{self.board.pk}/')
+            self.assert_http_404_not_found()
+            self.post(f'/board/{self.board.pk}/post/', data={'title': 'title', 'content': 'content'})
+            self.assert_http_404_not_found()
+            self.delete(f'/board/{self.board.pk}/')
+            self.assert_http_404_not_found()
+
+        out, err = StringIO(), StringIO()
+        call_command('purge_boards', '--batch-size', '2', stdout=out, stderr=err)
+        self.assertIn('board {}: 3 posts, 6 comments, 3 likes deleted (done)'.format(self.board.pk), out.getvalue())
+        self.assertIn('1 of 1 boards purged', out.getvalue())
+        self.assertIn('2 comments deleted', err.getvalue())
+        self.assert_purged()
+
+        # 정리를 시작한 게시판은 되살릴 수 없다.
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'/board/{self.board.pk}/restore/')
+            self.assert_http_404_not_found()
+
+    def test_resume(self):
+        tombstones.soft_delete(Boards, [self.board.pk])
+        board_purge, = purge.pending()
+        # 점수 2단계, 댓글 좋아요 1단계, 댓글 2개
+        self.assertFalse(purge.run(board_purge, size=2, max_steps=4))
+        self.assertEqual(BoardPurge.objects.get(pk=board_purge.pk).comments, 2)
+
+        # 중간에 끼어든 댓글도 게시글과 함께 지운다.
+        Comment.objects.create(author=self.user1, post=self.posts[2], text='late')
+        call_command('purge_boards', stdout=StringIO(), stderr=StringIO())
+        self.assertFalse(Boards.all_objects.filter(pk=self.board.pk).exists())
+        self.assertEqual(Comment.all_objects.count(), 1)
+        self.assertEqual(BoardPurge.objects.get(pk=board_purge.pk).posts, 3)
+
+    def test_marked_without_purge_row(self):
+        Boards.objects.filter(pk=self.board.pk).update(deleted_at='2020-01-01T00:00:00Z')
+        self.assertEqual(purge.run_pending(), 1)
+        self.assertFalse(Boards.all_objects.filter(pk=self.board.pk).exists())
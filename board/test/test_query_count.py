@@ -0,0 +1,54 @@
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class ListQueryCountTestCase(APITestCase):
+    # session, user, count, page (+ liked ids)
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+
+    def seed(self, count):
+        for i in range(count):
+            Boards.objects.create(author=self.user2, title=f'board {i}')
+            post = Post.objects.create(
+                author=self.user2, board=self.board, title=f'title {i}', content='content', like_count=i % 2)
+            comment = Comment.objects.create(author=self.user2, post=self.post_obj, text=f'text {i}', like_count=i % 2)
+            if i % 2:
+                post.like_post.add(self.user1)
+                comment.like_comment.add(self.user1)
+
+    def assert_list_queries(self, url, num):
+        with self.login(username='user1', password='strong_password_1'):
+            self.seed(2)
+            with self.assertNumQueries(num):
+                self.get_check_200(url)
+
+            self.seed(10)
+            with self.assertNumQueries(num):
+                response = self.get_check_200(url)
+
+        return response.data['results']
+
+    def test_board_list_queries(self):
+        results = self.assert_list_queries('/board/', 4)
+        self.assertEqual(len(results), 10)
+        self.assertFalse(results[0]['is_author'])
+        self.assertEqual(results[0]['author']['username'], 'user2')
+
+    def test_post_list_queries(self):
+        results = self.assert_list_queries(f'/board/{self.board.pk}/post/', 5)
+        self.assertEqual(len(results), 10)
+        self.assertEqual([post['is_like'] for post in results[:4]], [True, False, True, False])
+        self.assertEqual([post['like_count'] for post in results[:4]], [1, 0, 1, 0])
+        self.assertFalse(results[0]['is_author'])
+
+    def test_comment_list_queries(self):
+        results = self.assert_list_queries(f'/board/{self.board.pk}/post/{self.post_obj.pk}/comment/', 5)
+        self.assertEqual(len(results), 10)
+        self.assertEqual([comment['is_like'] for comment in results[:4]], [True, False, True, False])
+        self.assertEqual(results[0]['author']['username'], 'user2')
@@ -0,0 +1,89 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+# 페이지 전체를 훑어야 하는 경우만 허용한다. (url 이름, 테이블)
+ALLOWED_SCANS = {
+    # 게시판 목록은 rowid 역순으로 LIMIT 만큼만 읽고, offset 페이지네이션의 COUNT(*) 는 전체를 센다.
+    ('board-list', 'board'),
+    # ETag validator 가 같은 COUNT(*) 를 스칼라 서브쿼리(별칭 U0)로 센다.
+    ('board-list', 'U0'),
+    # 전체 인기글은 점수 인덱스 순서로 LIMIT 만큼만 읽는다.
+    ('trending', 'post_score'),
+}
+
+
+class QueryPlanTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='text')
+        self.post_obj.like_post.add(self.user1, self.user2)
+        self.comment.like_comment.add(self.user1, self.user2)
+
+    def query_plans(self, url):
+        with CaptureQueriesContext(connection) as ctx:
+            self.get_check_200(url)
+
+        name = self.last_response.resolver_match.url_name
+        for query in ctx.captured_queries:
+            with connection.cursor() as cursor:
+                cursor.execute(f"EXPLAIN QUERY PLAN {query['sql']}")
+                yield name, query['sql'], [row[3] for row in cursor.fetchall()]
+
+    def assert_indexed(self, url):
+        for name, sql, plan in self.query_plans(url):
+            for step in plan:
+                self.assertNotIn('TEMP B-TREE', step, f'{url}: {sql}')
+                if step.startswith('SCAN '):
+                    table = step.split()[1]
+                    if table == 'subquery':
+                        # LIMIT 으로 잘린 서브쿼리(커서 페이지 범위 집계)를 읽는 단계
+                        continue
+                    self.assertIn((name, table), ALLOWED_SCANS, f'{url}: {step}\n{sql}')
+
+    def test_board_plans(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.assert_indexed('/board/')
+            self.assert_indexed(f'/board/{self.board.pk}/')
+
+    def test_post_plans(self):
+        base = f'/board/{self.board.pk}/post/'
+        with self.login(username='user1', password='strong_password_1'):
+            self.assert_indexed(base)
+            self.assert_indexed(f'{base}?pagination=keyset')
+            self.assert_indexed(f'{base}{self.post_obj.pk}/')
+            self.assert_indexed(f'{base}{self.post_obj.pk}/like/')
+
+    def test_comment_plans(self):
+        base = f'/board/{self.board.pk}/post/{self.post_obj.pk}/comment/'
+        with self.login(username='user1', password='strong_password_1'):
+            self.assert_indexed(base)
+            self.assert_indexed(f'{base}?pagination=keyset')
+            self.assert_indexed(f'{base}{self.comment.pk}/')
+            self.assert_indexed(f'{base}{self.comment.pk}/like/')
+
+    def test_list_uses_composite_index(self):
+        with self.login(username='user1', password='strong_password_1'):
+            post_plans = [step for *_, plan in self.query_plans(f'/board/{self.board.pk}/post/') for step in plan]
+            comment_plans = [
+                step for *_, plan in self.query_plans(f'/board/{self.board.pk}/post/{self.post_obj.pk}/comment/')
+                for step in plan
+            ]
+
+        self.assertIn('SEARCH post USING INDEX post_board_live_idx (board_id=?)', post_plans)
+        self.assertIn('SEARCH comment USING INDEX comment_post_live_idx (post_id=?)', comment_plans)
+
+    def test_trending_plans(self):
+        # 댓글 생성 signal 로 점수 행이 생겨 있다.
+        with self.login(username='user1', password='strong_password_1'):
+            self.assert_indexed('/trending/')
+            self.assert_indexed(f'/board/{self.board.pk}/trending/')
+            plans = [step for *_, plan in self.query_plans(f'/board/{self.board.pk}/trending/') for step in plan]
+
+        self.assertIn('SEARCH post_score USING INDEX post_score_board_idx (board_id=? AND rank>?)', plans)
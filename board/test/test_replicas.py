@@ -0,0 +1,115 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.db import OperationalError, connections
+from django.test import TransactionTestCase, override_settings
+
+from board import db
+from board.models import Boards, Post
+
+REPLICAS = ('replica1', 'replica2')
+
+
+@override_settings(BOARD_DB_REPLICAS=list(REPLICAS), BOARD_DB_REPLICA_CHECK_INTERVAL=60)
+class ReplicaRoutingTestCase(TransactionTestCase):
+    # 로컬 SQLite 파일 두 개를 복제본으로 쓰고, replicate() 로 primary 의 현재 내용을 복사해 복제를 흉내 낸다.
+    databases = {'default', *REPLICAS}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tempdir = tempfile.mkdtemp()
+        for alias in REPLICAS:
+            connections.databases[alias] = {
+                'ENGINE': 'django.db.backends.sqlite3',
+                'NAME': os.path.join(cls.tempdir, f'{alias}.sqlite3'),
+                # 테스트 끝의 flush 대상에서 빠진다. (복제본은 query_only 로 열린다)
+                'TEST': {'MIRROR': 'default'},
+            }
+            connections.ensure_defaults(alias)
+            connections.prepare_test_settings(alias)
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        for alias in REPLICAS:
+            connections[alias].close()
+            del connections[alias]
+            del connections.databases[alias]
+        shutil.rmtree(cls.tempdir)
+
+    def setUp(self):
+        db.health.reset()
+        for alias in REPLICAS:
+            connections[alias].close()
+            if os.path.exists(connections[alias].settings_dict['NAME']):
+                os.remove(connections[alias].settings_dict['NAME'])
+        self.user = get_user_model().objects.create_user(username='user1', password='strong_password_1')
+        self.board = Boards.objects.create(author=self.user, title='board')
+        Post.objects.create(author=self.user, board=self.board, title='replicated', content='content')
+        self.url = f'/board/{self.board.pk}/post/'
+        self.client.force_login(self.user)
+
+    def replicate(self, *aliases):
+        connections['default'].ensure_connection()
+        for alias in aliases:
+            connections[alias].close()
+            target = sqlite3.connect(connections[alias].settings_dict['NAME'])
+            connections['default'].connection.backup(target)
+            target.close()
+
+    def titles(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return [post['title'] for post in response.data['results']]
+
+    def test_reads_go_to_replicas(self):
+        self.replicate(*REPLICAS)
+        # 아직 복제되지 않은 글
+        Post.objects.create(author=self.user, board=self.board, title='lagging', content='content')
+
+        self.assertEqual(self.titles(), ['replicated'])
+        self.assertEqual({db.choose_replica() for _ in range(50)}, set(REPLICAS))
+
+    def test_sticky_primary_after_write(self):
+        self.replicate(*REPLICAS)
+
+        response = self.client.post(self.url, {'title': 'mine', 'content': 'content'})
+        self.assertEqual(response.status_code, 201)
+        self.assertIn(db.STICKY_COOKIE, response.cookies)
+        self.assertEqual(self.titles(), ['mine', 'replicated'])
+
+        # 고정 시간이 지나면 다시 복제본에서 읽는다.
+        del self.client.cookies[db.STICKY_COOKIE]
+        self.assertEqual(self.titles(), ['replicated'])
+
+    def test_failed_write_does_not_pin(self):
+        response = self.client.post(self.url, {'title': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertNotIn(db.STICKY_COOKIE, response.cookies)
+
+    def test_unhealthy_replica_is_skipped(self):
+        self.replicate('replica1')
+
+        self.assertFalse(db.health.is_healthy('replica2'))
+        self.assertEqual({db.choose_replica() for _ in range(20)}, {'replica1'})
+
+        # 확인 결과는 BOARD_DB_REPLICA_CHECK_INTERVAL 동안 재사용된다.
+        self.replicate('replica2')
+        self.assertFalse(db.health.is_healthy('replica2'))
+        with override_settings(BOARD_DB_REPLICA_CHECK_INTERVAL=0):
+            self.assertTrue(db.health.is_healthy('replica2'))
+
+    def test_falls_back_to_primary(self):
+        Post.objects.create(author=self.user, board=self.board, title='primary only', content='content')
+        self.assertEqual(self.titles(), ['primary only', 'replicated'])
+        self.assertIsNone(db.choose_replica())
+
+    def test_replica_is_read_only(self):
+        self.replicate('replica1')
+        with self.assertRaises(OperationalError):
+            Post.objects.using('replica1').filter(title='replicated').delete()
+        self.assertEqual(Post.objects.using('replica1').count(), 1)
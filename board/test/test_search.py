@@ -0,0 +1,96 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from test_plus import APITestCase
+
+from board import search
+from board.models import Boards, Post, Comment
+
+JSON = {'format': 'json'}
+
+
+class SearchTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.other_board = Boards.objects.create(author=self.user1, title='other')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='Django 게시판 만들기',
+                                            content='게시판에서 질문합니다. <script> 태그는 escape 됩니다.')
+        self.comment = Comment.objects.create(author=self.user1, post=self.post_obj, text='저도 게시판 질문이 있어요')
+        self.other = Post.objects.create(author=self.user1, board=self.other_board, title='python', content='FTS5 search')
+
+    def search(self, url):
+        with self.login(username='user1', password='strong_password_1'):
+            return self.get_check_200(url).data
+
+    def test_korean_search(self):
+        response = self.search('/search/?q=게시판')
+        self.assertEqual({(result['type'], result['pk']) for result in response['results']},
+                         {('post', self.post_obj.pk), ('comment', self.comment.pk)})
+        # 제목에 가중치가 있으므로 게시글이 먼저 나온다.
+        self.assertEqual(response['results'][0]['type'], 'post')
+
+        post = response['results'][0]
+        self.assertEqual(post['title'], 'Django <b>게시판</b> 만들기')
+        self.assertIn('&lt;script&gt;', post['snippet'])
+
+        response = self.search('/search/?q=질문')
+        self.assertEqual(len(response['results']), 2)
+        self.assertEqual(self.search('/search/?q=판')['results'][0]['pk'], self.post_obj.pk)
+        self.assertEqual(self.search('/search/?q=게시물')['results'], [])
+
+    def test_board_scope(self):
+        response = self.search(f'/board/{self.other_board.pk}/search/?q=search')
+        self.assertEqual([result['pk'] for result in response['results']], [self.other.pk])
+
+        response = self.search(f'/board/{self.board.pk}/search/?q=search')
+        self.assertEqual(response['results'], [])
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.get('/board/999/search/?q=search')
+            self.assert_http_404_not_found()
+            self.get('/search/')
+            self.assert_http_400_bad_request()
+
+    def test_index_follows_writes(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.patch(f'/board/{self.board.pk}/post/{self.post_obj.pk}/', data={'title': 'renamed'})
+            self.assertEqual(self.get('/search/?q=renamed').data['results'][0]['pk'], self.post_obj.pk)
+
+            self.post(f'/board/{self.board.pk}/post/bulk/', data=[{'title': 'bulkword', 'content': 'c'}], extra=JSON)
+            self.assertEqual(len(self.get('/search/?q=bulkword').data['results']), 1)
+
+            self.delete(f'/board/{self.board.pk}/')
+            self.assertEqual(self.get('/search/?q=게시판').data['results'], [])
+            self.assertEqual(self.get('/search/?q=bulkword').data['results'], [])
+
+    def test_keyset_pagination(self):
+        for i in range(15):
+            Post.objects.create(author=self.user1, board=self.board, title=f'keyword {i}', content='keyword ' * (i + 1))
+
+        seen = []
+        url = '/search/?q=keyword&limit=4'
+        with self.login(username='user1', password='strong_password_1'):
+            while url:
+                response = self.get_check_200(url).data
+                seen.extend(result['pk'] for result in response['results'])
+                url = response['next']
+
+        self.assertEqual(len(seen), 15)
+        self.assertEqual(len(set(seen)), 15)
+
+    def test_rebuild_command(self):
+        search.clear()
+        self.assertEqual(self.search('/search/?q=게시판')['results'], [])
+
+        out = StringIO()
+        call_command('rebuild_search_index', batch_size=1, stdout=out)
+        self.assertIn('post: 2 indexed', out.getvalue())
+        self.assertIn('comment: 1 indexed', out.getvalue())
+        self.assertEqual(len(self.search('/search/?q=게시판')['results']), 2)
+
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT count(*) FROM board_search')
+            self.assertEqual(cursor.fetchone()[0], 3)
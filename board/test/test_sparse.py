@@ -0,0 +1,79 @@
+from django.core.cache import cache as default_cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment
+
+
+class SparseFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.posts = [
+            Post.objects.create(author=self.user1 if i % 2 else self.user2, board=self.board,
+                                title=f'title {i}', content='long content ' * 100, like_count=i % 2)
+            for i in range(12)
+        ]
+        for post in self.posts[1::2]:
+            post.like_post.add(self.user1)
+        self.url = f'/board/{self.board.pk}/post/'
+
+    def test_fields_narrow_response_and_sql(self):
+        with self.login(username='user1', password='strong_password_1'):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.get_check_200(f'{self.url}?fields=title,is_author')
+
+        self.assertEqual(set(response.data['results'][0]), {'pk', 'title', 'is_author'})
+        page_query = next(query['sql'] for query in ctx.captured_queries if 'LIMIT' in query['sql'])
+        self.assertNotIn('"content"', page_query)
+        self.assertNotIn('"auth_user"', page_query)
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.get_check_200(f'{self.url}{self.posts[0].pk}/?fields=author')
+            self.assertEqual(response.data, {'pk': self.posts[0].pk, 'author': {'username': 'user2'}})
+
+            self.get(f'{self.url}?fields=title,password')
+            self.assert_http_400_bad_request()
+
+    def test_fields_on_boards_and_comments(self):
+        Comment.objects.create(author=self.user1, post=self.posts[0], text='text')
+        with self.login(username='user1', password='strong_password_1'):
+            boards = self.get_check_200('/board/?fields=title').data['results']
+            comments = self.get_check_200(f'{self.url}{self.posts[0].pk}/comment/?fields=text,is_like').data['results']
+
+        self.assertEqual(boards, [{'pk': self.board.pk, 'title': 'board'}])
+        self.assertEqual(comments[0]['text'], 'text')
+        self.assertEqual(set(comments[0]), {'pk', 'text', 'is_like'})
+
+    def test_lean_list_matches_serializer(self):
+        urls = [
+            self.url,
+            f'{self.url}?fields=title,author,is_like,created_at',
+            f'{self.url}?pagination=keyset&limit=5',
+            '/board/',
+        ]
+        with self.login(username='user1', password='strong_password_1'):
+            for url in urls:
+                expected = self.get_check_200(url).json()
+                with override_settings(BOARD_LEAN_LIST=True):
+                    with self.assertNumQueries(5 if 'post' in url else 4):
+                        actual = self.get_check_200(url).json()
+                self.assertEqual(actual, expected)
+
+    @override_settings(BOARD_LEAN_LIST=True, BOARD_CACHE_ENABLED=True)
+    def test_lean_list_with_cache(self):
+        default_cache.clear()
+        with self.login(username='user1', password='strong_password_1'):
+            self.get_check_200(self.url)
+            response = self.get_check_200(self.url)
+            self.assertEqual(response['X-Cache'], 'HIT')
+
+        with self.login(username='user2', password='strong_password_2'):
+            results = self.get_check_200(self.url).data['results']
+
+        self.assertEqual([item['is_author'] for item in results], [post.author == self.user2 for post in self.posts[::-1][:10]])
+        self.assertFalse(any(item['is_like'] for item in results))
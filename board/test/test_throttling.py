@@ -0,0 +1,113 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache as default_cache
+from django.test import Client, TransactionTestCase, override_settings
+from test_plus import APITestCase
+
+from board import throttling
+from board.models import Boards, Post
+
+JSON = {'format': 'json'}
+
+
+@override_settings(
+    BOARD_THROTTLE='local',
+    BOARD_THROTTLE_RATES={'read': '1/m', 'write': '1/m', 'like': '1/m'},
+    BOARD_THROTTLE_BURST={'read': 2, 'write': 1, 'like': 1},
+)
+class ThrottleTestCase(APITestCase):
+
+    def setUp(self):
+        throttling.get_store().clear()
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='title', content='content')
+        self.posts_url = f'/board/{self.board.pk}/post/'
+
+    def assert_throttled(self):
+        self.assert_http_429_too_many_requests()
+        self.assertEqual(self.last_response['Retry-After'], '60')
+
+    def test_budgets(self):
+        with self.login(username='user2', password='strong_password_2'):
+            self.get_check_200(self.posts_url)
+            self.get_check_200(f'{self.posts_url}{self.post_obj.pk}/')
+            self.get(self.posts_url)
+            self.assert_throttled()
+
+            # 쓰기와 좋아요는 읽기와 따로 센다.
+            self.post(f'{self.posts_url}{self.post_obj.pk}/comment/', data={'text': 'text'}, extra=JSON)
+            self.assert_http_201_created()
+            self.post(f'{self.posts_url}{self.post_obj.pk}/comment/', data={'text': 'text'}, extra=JSON)
+            self.assert_throttled()
+
+            self.post(f'{self.posts_url}{self.post_obj.pk}/like/')
+            self.assert_http_201_created()
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/like/')
+            self.assert_throttled()
+            self.post(f'{self.posts_url}likes/', data=[{'pk': self.post_obj.pk, 'like': False}], extra=JSON)
+            self.assert_throttled()
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.get_check_200(self.posts_url)
+
+    @override_settings(BOARD_THROTTLE=None)
+    def test_disabled(self):
+        with self.login(username='user2', password='strong_password_2'):
+            for _ in range(5):
+                self.get_check_200(self.posts_url)
+
+
+@override_settings(BOARD_THROTTLE='local', BOARD_THROTTLE_RATES={'read': '1/m'}, BOARD_THROTTLE_BURST={'read': 2})
+class AsyncThrottleTestCase(TransactionTestCase):
+    # 비동기 뷰는 다른 스레드의 DB 연결로 조회하므로 커밋된 데이터가 필요하다.
+    databases = {'default', 'read'}
+
+    def setUp(self):
+        throttling.get_store().clear()
+        user = get_user_model().objects.create_user(username='user1', password='strong_password_1')
+        self.board = Boards.objects.create(author=user, title='board')
+        self.client = Client()
+        self.client.force_login(user)
+
+    def test_async_reads(self):
+        # /async/ 조회 뷰도 같은 읽기 예산을 쓴다.
+        posts_url = f'/board/{self.board.pk}/post/'
+        self.assertEqual(self.client.get(f'/async{posts_url}').status_code, 200)
+        self.assertEqual(self.client.get(posts_url).status_code, 200)
+        response = self.client.get(f'/async{posts_url}')
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '60')
+        self.assertEqual(response.json(), {'detail': 'Request was throttled. Expected available in 60 seconds.'})
+
+
+class TokenBucketTestCase(APITestCase):
+
+    def assert_refills(self, store):
+        # 초당 1개, 최대 3개
+        self.assertEqual([store.take('key', 1, 3, now=100) for _ in range(4)], [0, 0, 0, 1])
+        self.assertEqual(store.take('key', 1, 3, now=100.5), 0.5)
+        self.assertEqual(store.take('key', 1, 3, now=101), 0)
+        self.assertEqual(store.take('key', 1, 3, now=101), 1)
+        # 오래 쉬어도 버킷 크기까지만 찬다.
+        self.assertEqual([store.take('key', 1, 3, now=200) for _ in range(4)], [0, 0, 0, 1])
+        self.assertEqual(store.take('other', 1, 3, now=200), 0)
+
+    def test_local_store(self):
+        self.assert_refills(throttling.LocalThrottleStore())
+
+    def test_cache_store(self):
+        default_cache.clear()
+        self.assert_refills(throttling.CacheThrottleStore('default'))
+
+    def test_local_store_drops_full_buckets(self):
+        store = throttling.LocalThrottleStore()
+        for i in range(100):
+            store.take(f'user:{i}', 1, 3, now=i)
+        # 3초 넘게 쉰 버킷은 가득 찼으므로 버린다.
+        self.assertLessEqual(len(store), 5)
+
+    def test_parse_rate(self):
+        self.assertEqual(throttling.parse_rate('20/s'), 20)
+        self.assertEqual(throttling.parse_rate('120/min'), 2)
+        self.assertEqual(throttling.parse_rate('3600/hour'), 1)
@@ -0,0 +1,146 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Max
+from django.test import override_settings
+from django.utils import timezone
+from test_plus import APITestCase
+
+from board.models import Boards, Post, Comment, PostScore
+
+JSON = {'format': 'json'}
+
+
+class TombstoneTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.post_obj = Post.objects.create(author=self.user1, board=self.board, title='질문 게시글', content='content')
+        self.other = Post.objects.create(author=self.user1, board=self.board, title='other', content='content')
+        self.comment = Comment.objects.create(author=self.user2, post=self.post_obj, text='댓글')
+        self.post_obj.like_post.add(self.user2)
+        self.comment.like_comment.add(self.user1)
+        self.posts_url = f'/board/{self.board.pk}/post/'
+        self.comments_url = f'{self.posts_url}{self.post_obj.pk}/comment/'
+
+    def listed(self, url):
+        return [item['pk'] for item in self.get_check_200(url).data['results']]
+
+    def test_post_delete_and_restore(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/')
+            self.assert_http_204_no_content()
+
+            self.assertEqual(self.listed(self.posts_url), [self.other.pk])
+            self.get(f'{self.posts_url}{self.post_obj.pk}/')
+            self.assert_http_404_not_found()
+            self.assertEqual(self.listed(self.comments_url), [])
+            self.assertEqual(self.listed('/search/?q=질문'), [])
+            self.post(self.comments_url, data={'text': 'text'})
+            self.assert_http_404_not_found()
+
+        self.assertIsNotNone(Post.all_objects.get(pk=self.post_obj.pk).deleted_at)
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.post(f'{self.posts_url}{self.post_obj.pk}/restore/')
+            self.assert_http_403_forbidden()
+
+        with self.login(username='user1', password='strong_password_1'):
+            response = self.post(f'{self.posts_url}{self.post_obj.pk}/restore/')
+            self.assert_http_200_ok()
+            self.assertEqual(response.data['pk'], self.post_obj.pk)
+            self.assertEqual(self.listed(self.posts_url), [self.other.pk, self.post_obj.pk])
+            self.assertEqual(self.listed(self.comments_url), [self.comment.pk])
+            self.assertEqual(self.listed('/search/?q=질문'), [self.post_obj.pk])
+
+            # 살아 있는 행은 되살릴 대상이 아니다.
+            self.post(f'{self.posts_url}{self.post_obj.pk}/restore/')
+            self.assert_http_404_not_found()
+
+    def test_comment_delete_and_restore(self):
+        with self.login(username='user2', password='strong_password_2'):
+            self.delete(f'{self.comments_url}{self.comment.pk}/')
+            self.assert_http_204_no_content()
+            self.assertEqual(self.listed(self.comments_url), [])
+        self.assertEqual(PostScore.objects.get(post=self.post_obj).score, 0)
+
+        with self.login(username='user2', password='strong_password_2'):
+            self.post(f'{self.comments_url}{self.comment.pk}/restore/')
+            self.assert_http_200_ok()
+            self.assertEqual(self.listed(self.comments_url), [self.comment.pk])
+        self.assertAlmostEqual(PostScore.objects.get(post=self.post_obj).score, 2.0, places=2)
+
+    def test_board_delete_hides_children(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{self.board.pk}/')
+            self.assertEqual(self.listed(self.posts_url), [])
+            self.assertEqual(self.listed(self.comments_url), [])
+            self.assertEqual(self.listed('/trending/'), [])
+            self.post(f'{self.posts_url}{self.post_obj.pk}/restore/')
+            self.assert_http_404_not_found()
+
+            self.post(f'/board/{self.board.pk}/restore/')
+            self.assert_http_200_ok()
+            self.assertEqual(self.listed(self.posts_url), [self.other.pk, self.post_obj.pk])
+            self.assertEqual(self.listed('/trending/'), [self.post_obj.pk])
+
+    def test_board_delete_keeps_search_rows(self):
+        # 게시판 pk 와 같은 pk 의 게시글이 다른 게시판에 있어도 검색 결과에서 빠지지 않는다.
+        pk = max(Boards.objects.aggregate(last=Max('pk'))['last'], Post.objects.aggregate(last=Max('pk'))['last']) + 1
+        empty = Boards.objects.create(pk=pk, author=self.user1, title='empty')
+        same = Post.objects.create(pk=pk, author=self.user1, board=self.board, title='검색 대상', content='content')
+
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{empty.pk}/')
+            self.assert_http_204_no_content()
+            self.assertEqual(self.listed('/search/?q=검색'), [same.pk])
+
+    def test_bulk_delete(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'{self.posts_url}bulk/', data=[self.post_obj.pk, self.other.pk], extra=JSON)
+            self.assert_http_200_ok()
+        self.assertEqual(Post.objects.count(), 0)
+        self.assertEqual(Post.all_objects.count(), 2)
+
+    @override_settings(BOARD_TOMBSTONE_TTL=3600)
+    def test_purge_expired(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'{self.posts_url}{self.post_obj.pk}/')
+            self.delete(f'{self.posts_url}{self.other.pk}/')
+        other_board = Boards.objects.create(author=self.user1, title='other')
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{other_board.pk}/')
+
+        # 보존 기간 안의 tombstone 은 남긴다.
+        call_command('purge_tombstones', stdout=StringIO(), stderr=StringIO())
+        self.assertEqual(Post.all_objects.count(), 2)
+
+        expired = timezone.now() - timedelta(hours=2)
+        Post.all_objects.filter(pk=self.post_obj.pk).update(deleted_at=expired)
+        Boards.all_objects.filter(pk=other_board.pk).update(deleted_at=expired)
+        out = StringIO()
+        call_command('purge_tombstones', '--batch-size', '1', stdout=out, stderr=StringIO())
+        self.assertIn('1 comment_likes, 1 comments, 1 post_likes, 1 scores, 1 posts, 1 boards purged', out.getvalue())
+
+        self.assertEqual(list(Post.all_objects.values_list('pk', flat=True)), [self.other.pk])
+        self.assertFalse(Comment.all_objects.exists())
+        self.assertFalse(Boards.all_objects.filter(pk=other_board.pk).exists())
+        self.assertTrue(Boards.objects.filter(pk=self.board.pk).exists())
+
+    def test_tombstone_lookups_use_partial_indexes(self):
+        before = timezone.now()
+        for queryset, index in (
+            (Post.all_objects.filter(deleted_at__lt=before), 'post_deleted_idx'),
+            (Comment.all_objects.filter(deleted_at__lt=before), 'comment_deleted_idx'),
+            (Comment.all_objects.filter(post__deleted_at__lt=before), 'post_deleted_idx'),
+        ):
+            # purge 는 순서 없이 배치를 고른다.
+            sql, params = queryset.order_by().values('pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+                plan = ' '.join(row[3] for row in cursor.fetchall())
+            self.assertIn(index, plan)
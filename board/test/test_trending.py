@@ -0,0 +1,137 @@
+import time
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import override_settings
+from test_plus import APITestCase
+
+from board import tombstones, trending
+from board.models import Boards, Post, Comment, PostScore
+
+JSON = {'format': 'json'}
+
+
+class TrendingTestCase(APITestCase):
+
+    def setUp(self):
+        self.user1 = self.make_user(username='user1', password='strong_password_1')
+        self.user2 = self.make_user(username='user2', password='strong_password_2')
+        self.board = Boards.objects.create(author=self.user1, title='board')
+        self.other_board = Boards.objects.create(author=self.user1, title='other')
+        self.posts = [
+            Post.objects.create(author=self.user1, board=self.board, title=f'title {i}', content='content')
+            for i in range(3)
+        ]
+        self.foreign = Post.objects.create(author=self.user1, board=self.other_board, title='foreign', content='content')
+
+    def like(self, post, username='user1', password='strong_password_1'):
+        with self.login(username=username, password=password):
+            self.post(f'/board/{post.board_id}/post/{post.pk}/like/')
+            self.assert_http_201_created()
+
+    def comment(self, post):
+        return Comment.objects.create(author=self.user1, post=post, text='text')
+
+    def ranking(self, url):
+        with self.login(username='user1', password='strong_password_1'):
+            return [(item['pk'], item['score']) for item in self.get_check_200(url).data['results']]
+
+    def test_events_update_score(self):
+        self.like(self.posts[0])
+        self.like(self.posts[0], 'user2', 'strong_password_2')
+        self.comment(self.posts[1])
+        self.comment(self.posts[1])
+        self.like(self.posts[2])
+        self.like(self.foreign)
+
+        ranking = self.ranking(f'/board/{self.board.pk}/trending/')
+        self.assertEqual([pk for pk, _ in ranking], [self.posts[1].pk, self.posts[0].pk, self.posts[2].pk])
+        self.assertAlmostEqual(ranking[0][1], 4.0, places=2)
+
+        self.assertEqual([pk for pk, _ in self.ranking('/trending/')][:2], [self.posts[1].pk, self.posts[0].pk])
+        self.assertIn(self.foreign.pk, [pk for pk, _ in self.ranking('/trending/')])
+
+    def test_unlike_and_comment_delete_lower_score(self):
+        self.like(self.posts[0])
+        comment = self.comment(self.posts[0])
+        with self.login(username='user1', password='strong_password_1'):
+            self.delete(f'/board/{self.board.pk}/post/{self.posts[0].pk}/like/')
+        comment.delete()
+
+        self.assertEqual(self.ranking(f'/board/{self.board.pk}/trending/'), [])
+
+    def test_batch_likes_and_bulk_comments(self):
+        with self.login(username='user1', password='strong_password_1'):
+            self.post(f'/board/{self.board.pk}/post/likes/',
+                      data=[{'pk': post.pk, 'like': True} for post in self.posts[:2]], extra=JSON)
+            self.post(f'/board/{self.board.pk}/post/{self.posts[1].pk}/comment/bulk/',
+                      data=[{'text': 'a'}, {'text': 'b'}], extra=JSON)
+
+        ranking = self.ranking(f'/board/{self.board.pk}/trending/')
+        self.assertEqual([pk for pk, _ in ranking], [self.posts[1].pk, self.posts[0].pk])
+        self.assertAlmostEqual(ranking[0][1], 5.0, places=2)
+
+    @override_settings(BOARD_TRENDING_HALF_LIFE=3600)
+    def test_decay(self):
+        self.like(self.posts[0])
+        self.comment(self.posts[1])
+        # 글 0 의 점수는 두 시간 전, 글 1 은 지금 기록된 것으로 둔다.
+        PostScore.objects.filter(post=self.posts[0]).update(score=4.0, decayed_at=time.time() - 7200)
+
+        out = StringIO()
+        call_command('decay_trending', stdout=out)
+        self.assertIn('2 scores decayed, 0 pruned', out.getvalue())
+
+        scores = dict(PostScore.objects.values_list('post_id', 'score'))
+        self.assertAlmostEqual(scores[self.posts[0].pk], 1.0, places=2)
+        self.assertAlmostEqual(scores[self.posts[1].pk], 2.0, places=2)
+        self.assertEqual([pk for pk, _ in self.ranking('/trending/')], [self.posts[1].pk, self.posts[0].pk])
+
+        PostScore.objects.filter(post=self.posts[0]).update(decayed_at=time.time() - 3600 * 20)
+        trending.decay()
+        self.assertFalse(PostScore.objects.filter(post=self.posts[0]).exists())
+
+    @override_settings(BOARD_TRENDING_HALF_LIFE=3600)
+    def test_ranking_without_decay(self):
+        # 두 시간 전에 4점이던 글(지금 1점)은 감쇠를 돌리지 않아도 지금 2점인 글보다 아래에 온다.
+        self.like(self.posts[0])
+        self.comment(self.posts[1])
+        past = time.time() - 7200
+        PostScore.objects.filter(post=self.posts[0]).update(score=4.0, decayed_at=past, rank=trending.rank(4.0, past))
+
+        ranking = self.ranking('/trending/')
+        self.assertEqual([pk for pk, _ in ranking], [self.posts[1].pk, self.posts[0].pk])
+        self.assertAlmostEqual(ranking[1][1], 1.0, places=2)
+
+        # 오래된 글에 점수가 더해지면 지금 시각 기준으로 다시 비교한다.
+        self.like(self.posts[0], 'user2', 'strong_password_2')
+        self.comment(self.posts[0])
+        self.assertEqual([pk for pk, _ in self.ranking('/trending/')][:2], [self.posts[0].pk, self.posts[1].pk])
+
+    def test_rebuild(self):
+        Post.objects.filter(pk=self.posts[0].pk).update(like_count=3)
+        self.comment(self.posts[1])
+        # 삭제 표시된 게시글의 점수도 되살릴 수 있도록 다시 계산한다.
+        tombstones.soft_delete(Post, [self.posts[0].pk])
+        PostScore.objects.all().delete()
+
+        call_command('decay_trending', '--rebuild', stdout=StringIO())
+
+        scores = dict(PostScore.objects.values_list('post_id', 'score'))
+        self.assertEqual(set(scores), {self.posts[0].pk, self.posts[1].pk})
+        self.assertAlmostEqual(scores[self.posts[0].pk], 3.0, places=2)
+        self.assertAlmostEqual(scores[self.posts[1].pk], 2.0, places=2)
+
+    def test_deleting_post_removes_score(self):
+        self.comment(self.posts[0])
+        self.posts[0].delete()
+        self.assertFalse(PostScore.objects.exists())
+
+    def test_unknown_board_and_limit(self):
+        self.like(self.posts[0])
+        with self.login(username='user1', password='strong_password_1'):
+            self.get('/board/999/trending/')
+            self.assert_http_404_not_found()
+            self.get('/trending/', data={'limit': 0})
+            self.assert_http_400_bad_request()
+            self.assertEqual(len(self.get_check_200('/trending/', data={'limit': 1}).data['results']), 1)
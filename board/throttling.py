@@ -0,0 +1,146 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+# 좋아요 토글(POST/DELETE like, likes 일괄)은 쓰기와 따로 센다.
+LIKE_ACTIONS = ('like', 'delete_like', 'like_batch')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+
+def is_enabled():
+    return getattr(settings, 'BOARD_THROTTLE', None) in STORES
+
+
+def parse_rate(rate):
+    # '20/s', '120/min' -> 초당 토큰 수
+    count, period = rate.split('/')
+    return int(count) / PERIODS[period[0]]
+
+
+def get_budget(scope):
+    # (초당 채워지는 토큰, 버킷 크기). 설정이 없는 범주는 None (제한하지 않는다)
+    rate = getattr(settings, 'BOARD_THROTTLE_RATES', {}).get(scope)
+    if rate is None:
+        return None
+    rate = parse_rate(rate)
+    burst = getattr(settings, 'BOARD_THROTTLE_BURST', {}).get(scope) or max(1, round(rate))
+    return rate, burst
+
+
+def take(scope, ident):
+    # ident(사용자/IP)의 scope 예산에서 토큰 하나를 꺼낸다. 기다릴 초(통과면 0)
+    # DRF 밖의 진입점(async 조회 뷰, SSE 스트림)도 이것으로 같은 예산을 쓴다.
+    if not is_enabled():
+        return 0
+    budget = get_budget(scope)
+    if budget is None:
+        return 0
+    return get_store().take(f'{scope}:{ident}', *budget)
+
+
+def refill(bucket, rate, burst, now):
+    # bucket: (남은 토큰, 마지막으로 계산한 시각). 토큰 하나를 꺼낸 버킷과 기다릴 초(통과면 0)
+    tokens, updated_at = bucket if bucket is not None else (burst, now)
+    tokens = min(burst, tokens + max(0.0, now - updated_at) * rate)
+    if tokens >= 1:
+        return (tokens - 1, now), 0
+    return (tokens, now), (1 - tokens) / rate
+
+
+class LocalThrottleStore:
+    # 프로세스 안에서만 보이는 버킷. 여러 프로세스로 띄울 때는 cache 저장소를 쓴다.
+    # 예산마다 최근에 쓴 순서로 두고, 가득 찰 만큼 쉰 버킷(없는 것과 같다)은 앞에서부터 버린다.
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._buckets = {}
+
+    def clock(self):
+        return time.monotonic()
+
+    def take(self, key, rate, burst, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            buckets = self._buckets.setdefault((rate, burst), OrderedDict())
+            bucket, wait = refill(buckets.pop(key, None), rate, burst, now)
+            buckets[key] = bucket
+            # 한 번에 하나씩만 버려서 호출마다 O(1) 을 지킨다.
+            oldest = next(iter(buckets))
+            tokens, updated_at = buckets[oldest]
+            if oldest != key and tokens + (now - updated_at) * rate >= burst:
+                del buckets[oldest]
+        return wait
+
+    def __len__(self):
+        return sum(len(buckets) for buckets in self._buckets.values())
+
+    def clear(self):
+        with self._lock:
+            self._buckets.clear()
+
+
+class CacheThrottleStore:
+    # 캐시 백엔드에 버킷을 저장해 여러 프로세스가 같은 예산을 쓴다.
+    # 읽고 쓰는 사이에 잠그지 않으므로 동시에 들어온 요청은 토큰 하나씩 더 쓸 수 있다.
+
+    def __init__(self, alias):
+        self.cache = caches[alias]
+
+    def clock(self):
+        return time.time()
+
+    def cache_key(self, key):
+        return f'board:throttle:{key}'
+
+    def take(self, key, rate, burst, now=None):
+        now = self.clock() if now is None else now
+        cache_key = self.cache_key(key)
+        bucket, wait = refill(self.cache.get(cache_key), rate, burst, now)
+        # 가득 찰 때까지 쉬면 없는 버킷과 같으므로 그때 만료시킨다.
+        self.cache.set(cache_key, bucket, int((burst - bucket[0]) / rate) + 1)
+        return wait
+
+
+STORES = {
+    'local': lambda: LocalThrottleStore(),
+    'cache': lambda: CacheThrottleStore(getattr(settings, 'BOARD_THROTTLE_ALIAS', 'default')),
+}
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store():
+    kind = getattr(settings, 'BOARD_THROTTLE', None)
+    with _stores_lock:
+        if kind not in _stores:
+            _stores[kind] = STORES[kind]()
+        return _stores[kind]
+
+
+class BoardThrottle(BaseThrottle):
+    # 사용자(익명이면 IP)마다 읽기 / 쓰기 / 좋아요 토큰 버킷을 따로 둔다.
+    # 막히면 DRF 가 429 와 Retry-After(다음 토큰까지의 초)를 돌려준다.
+
+    def get_scope(self, request, view):
+        if request.method not in SAFE_METHODS and getattr(view, 'action', None) in LIKE_ACTIONS:
+            return 'like'
+        return 'read' if request.method in SAFE_METHODS else 'write'
+
+    def allow_request(self, request, view):
+        self.wait_seconds = 0
+        if not is_enabled():
+            return True
+        user = request.user
+        ident = f'user:{user.pk}' if user and user.is_authenticated else f'ip:{self.get_ident(request)}'
+        self.wait_seconds = take(self.get_scope(request, view), ident)
+        return not self.wait_seconds
+
+    def wait(self):
+        return self.wait_seconds
@@ -0,0 +1,73 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.generics import get_object_or_404
+from rest_framework.response import Response
+
+from . import search, stats, trending
+from .models import Comment
+
+
+def ttl():
+    return getattr(settings, 'BOARD_TOMBSTONE_TTL', 7 * 24 * 60 * 60)
+
+
+def expired_before():
+    return timezone.now() - timedelta(seconds=ttl())
+
+
+def comment_deltas(pks, weight):
+    deltas = {}
+    for post_id in Comment.all_objects.filter(pk__in=pks).values_list('post_id', flat=True):
+        deltas[post_id] = deltas.get(post_id, 0) + weight
+    return deltas
+
+
+def soft_delete(model, pks):
+    # 행은 남기고 deleted_at 만 채운다. 검색 색인에서 빼고 댓글은 인기 점수에서 뺀다.
+    # 게시판의 하위 행은 건드리지 않는다. (조회할 때 부모의 deleted_at 으로 걸러낸다)
+    now = timezone.now()
+    with transaction.atomic():
+        pks = list(model.objects.filter(pk__in=pks).values_list('pk', flat=True))
+        deltas = stats.subtree_deltas(model, pks, -1)
+        model.all_objects.filter(pk__in=pks).update(deleted_at=now, updated_at=now)
+        stats.record(deltas)
+        search.remove(model, pks)
+        if model is Comment:
+            trending.record(comment_deltas(pks, -trending.comment_weight()))
+    return pks
+
+
+def restore(model, pks):
+    now = timezone.now()
+    with transaction.atomic():
+        pks = list(model.all_objects.filter(pk__in=pks, deleted_at__isnull=False).values_list('pk', flat=True))
+        model.all_objects.filter(pk__in=pks).update(deleted_at=None, updated_at=now)
+        stats.record(stats.subtree_deltas(model, pks, 1))
+        search.index_objects(model, [model(pk=pk) for pk in pks])
+        if model is Comment:
+            trending.record(comment_deltas(pks, trending.comment_weight()))
+    return pks
+
+
+class RestoreMixin:
+    # POST <detail>/restore/ : 작성자가 보존 기간 안에 삭제를 되돌린다. 부모가 삭제된 행은 404
+    # 뷰셋은 get_parent_filters() 와 perform_restore(instance) 를 구현한다.
+
+    def get_parent_filters(self):
+        return {}
+
+    def get_tombstone_queryset(self):
+        model = self.get_queryset().model
+        return model.all_objects.filter(deleted_at__isnull=False, **self.get_parent_filters())
+
+    @action(detail=True, methods=['POST'])
+    def restore(self, request, *args, **kwargs):
+        instance = get_object_or_404(self.get_tombstone_queryset(), pk=self.kwargs['pk'])
+        self.perform_restore(instance)
+        instance = self.get_queryset().get(pk=instance.pk)
+        return Response(data=self.get_serializer(instance).data, status=status.HTTP_200_OK)
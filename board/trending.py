@@ -0,0 +1,124 @@
+import math
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Greatest, Log, NullIf, Power
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Comment, Post, PostScore
+
+
+def like_weight():
+    return getattr(settings, 'BOARD_TRENDING_LIKE_WEIGHT', 1.0)
+
+
+def comment_weight():
+    return getattr(settings, 'BOARD_TRENDING_COMMENT_WEIGHT', 2.0)
+
+
+def half_life():
+    return getattr(settings, 'BOARD_TRENDING_HALF_LIFE', 24 * 60 * 60)
+
+
+def decay_factor(since, now):
+    return 0.5 ** ((now - since) / half_life())
+
+
+def decayed_score(now):
+    # decayed_at 시점의 점수를 now 로 감쇠한 값 (SQLite 의 POWER 는 Django 가 등록한다)
+    return F('score') * Power(Value(0.5), (Value(now) - F('decayed_at')) / Value(float(half_life())))
+
+
+def rank(score, at):
+    # 시각에 따라 바뀌지 않는 순위 키. score * 0.5 ** ((now - at) / half_life) 의 log2 에 now / half_life 를 더한 값이라
+    # 어느 시각에 기록한 점수든 이 값의 순서가 지금 감쇠한 점수의 순서와 같다. 점수가 0 이면 None
+    return math.log2(score) + at / half_life() if score > 0 else None
+
+
+def rank_expression(score, at):
+    # rank() 의 SQL 식. 0 점은 NULLIF 로 NULL 이 되어 LOG 도 NULL 을 돌려준다.
+    return Log(Value(2.0), NullIf(score, Value(0.0))) + Value(at / half_life())
+
+
+def current_score(post_score, now=None):
+    return post_score.score * decay_factor(post_score.decayed_at, now or time.time())
+
+
+def record(deltas):
+    # deltas: {post_id: 점수 증감}. 행을 지금 시각으로 감쇠한 뒤 더한다.
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    now = time.time()
+
+    with transaction.atomic():
+        # 감소만 있는 글(지워지는 중인 글 포함)에는 새 행을 만들지 않는다.
+        increased = [pk for pk, delta in deltas.items() if delta > 0]
+        missing = []
+        if increased:
+            existing = set(PostScore.objects.filter(post_id__in=increased).values_list('post_id', flat=True))
+            missing = [pk for pk in increased if pk not in existing]
+        if missing:
+            PostScore.objects.bulk_create(
+                [PostScore(post_id=pk, board_id=board_id, score=0, decayed_at=now)
+                 for pk, board_id in Post.objects.filter(pk__in=missing).values_list('pk', 'board_id')],
+                ignore_conflicts=True,
+            )
+
+        delta = Case(*[When(post_id=pk, then=Value(delta)) for pk, delta in deltas.items()],
+                     default=Value(0.0), output_field=FloatField())
+        score = Greatest(decayed_score(now) + delta, Value(0.0))
+        PostScore.objects.filter(post_id__in=list(deltas)).update(
+            score=score,
+            decayed_at=now,
+            rank=rank_expression(score, now),
+        )
+
+
+def record_likes(model, added, removed):
+    if model is Post:
+        weight = like_weight()
+        record({**{pk: weight for pk in added}, **{pk: -weight for pk in removed}})
+
+
+def record_created(model, objs):
+    # bulk_create 는 post_save 를 보내지 않으므로 일괄 생성 뒤에 직접 부른다.
+    if model is Comment:
+        deltas = {}
+        for comment in objs:
+            deltas[comment.post_id] = deltas.get(comment.post_id, 0) + comment_weight()
+        record(deltas)
+
+
+def top(board_id=None, limit=10):
+    # (board, -rank) / (-rank) 인덱스를 앞에서부터 읽는다. rank 는 시각에 따라 바뀌지 않으므로 감쇠를 기다리지 않아도 된다.
+    # 삭제 표시된 게시글/게시판은 점수를 남겨 두고(되살릴 때 그대로 쓴다) 결과에서만 뺀다.
+    queryset = PostScore.objects.filter(rank__isnull=False, post__deleted_at__isnull=True,
+                                        board__deleted_at__isnull=True)
+    if board_id is not None:
+        queryset = queryset.filter(board_id=board_id)
+    return list(queryset.select_related('post__author').order_by('-rank', 'post_id')[:limit])
+
+
+def decay():
+    # 모든 행의 점수를 지금 시각 값으로 바꾸고 BOARD_TRENDING_MIN_SCORE 아래는 지운다.
+    # rank 는 감쇠해도 그대로이므로 순위에는 필요 없고, 오래된 행을 정리하는 용도다.
+    now = time.time()
+    with transaction.atomic():
+        decayed = PostScore.objects.update(score=decayed_score(now), decayed_at=now)
+        pruned, _ = PostScore.objects.filter(score__lt=getattr(settings, 'BOARD_TRENDING_MIN_SCORE', 0.01)).delete()
+    return decayed, pruned
+
+
+@receiver(post_save, sender=Comment)
+def score_saved_comment(sender, instance, created=False, **kwargs):
+    if created:
+        record({instance.post_id: comment_weight()})
+
+
+@receiver(post_delete, sender=Comment)
+def score_deleted_comment(sender, instance, **kwargs):
+    record({instance.post_id: -comment_weight()})
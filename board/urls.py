@@ -1,5 +1,6 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views as av
 from . import views as v
 
 router = DefaultRouter()
@@ -7,6 +8,27 @@ router.register('board', v.BoardViewSet, basename='board')
 router.register(r'board/(?P<board_pk>\d+)/post', v.PostViewSet, basename='post')
 router.register(r'board/(?P<board_pk>\d+)/post/(?P<post_pk>\d+)/comment', v.CommentViewSet, basename='comment')
 
+# 같은 조회 API 의 비동기 버전 (ASGI 서버에서 요청마다 스레드를 잡지 않는다)
+async_urlpatterns = [
+    path("board/", av.boards.as_view('list'), name='async-board-list'),
+    path("board/<int:pk>/", av.boards.as_view('retrieve'), name='async-board-detail'),
+    path("board/<int:board_pk>/post/", av.posts.as_view('list'), name='async-post-list'),
+    path("board/<int:board_pk>/post/<int:pk>/", av.posts.as_view('retrieve'), name='async-post-detail'),
+    path("board/<int:board_pk>/post/<int:pk>/like/", av.posts.as_view('like_list'), name='async-post-like'),
+    path("board/<int:board_pk>/post/<int:post_pk>/comment/", av.comments.as_view('list'), name='async-comment-list'),
+    path("board/<int:board_pk>/post/<int:post_pk>/comment/<int:pk>/", av.comments.as_view('retrieve'),
+         name='async-comment-detail'),
+    path("board/<int:board_pk>/post/<int:post_pk>/comment/<int:pk>/like/", av.comments.as_view('like_list'),
+         name='async-comment-like'),
+]
+
 urlpatterns = [
     path("", include(router.urls)),
+    path("search/", v.SearchView.as_view(), name='search'),
+    path("board/<int:board_pk>/search/", v.SearchView.as_view(), name='board-search'),
+    path("trending/", v.TrendingView.as_view(), name='trending'),
+    path("board/<int:board_pk>/trending/", v.TrendingView.as_view(), name='board-trending'),
+    path("async/", include(async_urlpatterns)),
+    path("metrics/", v.MetricsView.as_view(), name='metrics'),
+    path("export/<str:name>/", v.ExportView.as_view(), name='export'),
 ]
@@ -1,25 +1,65 @@
+import time
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
-from rest_framework.exceptions import PermissionDenied, ValidationError
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError
 from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import IsAdminUser
 from rest_framework.response import Response
-
-from .models import Boards, Comment, Post
-from .serializers import BoardSerializer, CommentSerializer, PostSerializer, AuthorSerializer
-
-
-class BoardViewSet(viewsets.ModelViewSet):
-    queryset = Boards.objects.all().select_related('author')
+from rest_framework.views import APIView
+
+from . import cache, db, events, export, like_buffer, likes, metrics, purge, search, tombstones, trending
+from .bulk import BulkMixin
+from .cache import VersionedCacheMixin
+from .conditional import ConditionalGetMixin
+from .db import ReadRoutingMixin
+from .expand import comment_count_subquery, comment_validator
+from .lean import LeanListMixin
+from .models import Boards, BoardPurge, Comment, Post
+from .pagination import PaginationModeMixin
+from .serializers import BoardSerializer, CommentSerializer, PostSerializer, PostExpandedSerializer, AuthorSerializer
+from .sparse import SparseFieldsMixin
+from .tombstones import RestoreMixin
+
+
+def live_posts():
+    # 게시판이 삭제된 게시글에는 댓글을 달 수 없다.
+    return Post.objects.filter(board__deleted_at__isnull=True)
+
+
+class BoardViewSet(ReadRoutingMixin, ConditionalGetMixin, VersionedCacheMixin, SparseFieldsMixin, LeanListMixin,
+                   RestoreMixin, viewsets.ModelViewSet):
+    queryset = Boards.objects.all().select_related('author', 'stats')
     serializer_class = BoardSerializer
+    validator_relations = ('stats',)
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
 
+    def get_queryset(self):
+        # ?ordering=activity : 최근 활동(게시판/글/댓글 작성) 순. board_stats_activity_idx 를 거꾸로 읽는다.
+        # last_activity_at 범위 조건이 있어야 board_live_idx 대신 이 인덱스부터 읽고,
+        # board_stats 의 rowid 가 board_id 이므로 같은 시각끼리는 정렬 없이 id 역순이 된다.
+        queryset = super().get_queryset()
+        ordering = self.request.query_params.get('ordering') if self.request else None
+        if ordering is None:
+            return queryset
+        if ordering != 'activity':
+            raise ValidationError({'ordering': 'invalid ordering'})
+        return queryset.filter(stats__last_activity_at__isnull=False).order_by('-stats__last_activity_at', '-stats__board_id')
+
+    def get_cache_scopes(self):
+        return ['boards']
+
     def perform_create(self, serializer):
         serializer.save(author=self.request.user)
+        cache.invalidate('boards')
         return super().perform_create(serializer)
 
     def perform_update(self, serializer):
@@ -27,34 +67,92 @@ class BoardViewSet(viewsets.ModelViewSet):
 
         if board.author == self.request.user:
             serializer.save()
+            cache.invalidate('boards')
             return super().perform_update(serializer)
 
         raise PermissionDenied('접근권한이 없습니다.')
 
     def perform_destroy(self, instance):
+        # 삭제 표시만 한다. 하위 행은 보존 기간이 지나면 board.purge 가 나눠서 지운다.
+        if instance.author == self.request.user:
+            tombstones.soft_delete(Boards, [instance.pk])
+            cache.invalidate('boards', f'board:{instance.pk}')
+            purge.ensure_worker()
+        else:
+            raise PermissionDenied('접근권한이 없습니다.')
+
+    def get_tombstone_queryset(self):
+        # 정리(BoardPurge)가 시작된 게시판은 되살릴 수 없다.
+        return super().get_tombstone_queryset().exclude(pk__in=BoardPurge.objects.values('board_id'))
+
+    def perform_restore(self, instance):
         if instance.author == self.request.user:
-            instance.delete()
+            tombstones.restore(Boards, [instance.pk])
+            cache.invalidate('boards', f'board:{instance.pk}')
         else:
             raise PermissionDenied('접근권한이 없습니다.')
 
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(ReadRoutingMixin, PaginationModeMixin, ConditionalGetMixin, VersionedCacheMixin, SparseFieldsMixin,
+                  LeanListMixin, BulkMixin, RestoreMixin, viewsets.ModelViewSet):
     queryset = Post.objects.all().select_related('author', 'board')
     serializer_class = PostSerializer
+    bulk_update_fields = ('title', 'content')
 
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
+        context['comment_limit'] = getattr(settings, 'BOARD_EXPAND_COMMENTS', 3)
         return context
 
+    def get_serializer_class(self):
+        if self.expand_comments():
+            return PostExpandedSerializer
+        return super().get_serializer_class()
+
     def get_queryset(self):
         qs = super().get_queryset()
-        qs = Post.objects.filter(board_id=self.kwargs['board_pk'])
+        qs = qs.filter(**self.get_parent_filters())
         return qs
 
+    def get_parent_filters(self):
+        return {'board_id': self.kwargs['board_pk'], 'board__deleted_at__isnull': True}
+
+    def expand_comments(self):
+        # ?expand=comments : 목록의 게시글마다 댓글 수와 최신 댓글을 함께 내려준다.
+        return self.action == 'list' and 'comments' in self.request.query_params.get('expand', '').split(',')
+
+    def paginate_queryset(self, queryset):
+        if self.expand_comments():
+            queryset = queryset.annotate(comment_count=comment_count_subquery())
+        return super().paginate_queryset(queryset)
+
+    def get_list_validator(self):
+        validator = super().get_list_validator()
+        if self.expand_comments():
+            post_ids = [row['id'] for row in validator['rows']]
+            validator.update(comment_validator(post_ids, self.get_serializer_context()['comment_limit'], self.request.user))
+        return validator
+
+    def is_cacheable(self, request):
+        # 댓글 쓰기는 게시판 scope 를 올리지 않으므로 펼친 목록은 캐시하지 않는다.
+        return not self.expand_comments()
+
+    def get_cache_scopes(self):
+        return [f"board:{self.kwargs['board_pk']}"]
+
+    def get_write_scopes(self):
+        return [f"board:{self.kwargs['board_pk']}"]
+
+    def get_bulk_save_kwargs(self):
+        board = get_object_or_404(Boards, pk=self.kwargs['board_pk'])
+        return {'author': self.request.user, 'board': board}
+
     def perform_create(self, serializer):
         board = get_object_or_404(Boards, pk=self.kwargs['board_pk'])
         serializer.save(author=self.request.user, board=board)
+        cache.invalidate(f'board:{board.pk}')
+        events.publish(Post, 'created', [serializer.instance.pk])
         return super().perform_create(serializer)
 
     def perform_update(self, serializer):
@@ -62,13 +160,26 @@ class PostViewSet(viewsets.ModelViewSet):
 
         if post.author == self.request.user:
             serializer.save()
+            cache.invalidate(f'board:{post.board_id}')
+            events.publish(Post, 'updated', [post.pk])
             return super().perform_update(serializer)
 
         raise PermissionDenied('접근권한이 없습니다.')
 
     def perform_destroy(self, instance):
         if instance.author == self.request.user:
-            instance.delete()
+            tombstones.soft_delete(Post, [instance.pk])
+            cache.invalidate(f'board:{instance.board_id}')
+            events.publish(Post, 'deleted', [instance.pk])
+            purge.ensure_worker()
+        else:
+            raise PermissionDenied('접근권한이 없습니다.')
+
+    def perform_restore(self, instance):
+        if instance.author == self.request.user:
+            tombstones.restore(Post, [instance.pk])
+            cache.invalidate(f'board:{instance.board_id}')
+            events.publish(Post, 'restored', [instance.pk])
         else:
             raise PermissionDenied('접근권한이 없습니다.')
 
@@ -86,8 +197,15 @@ class PostViewSet(viewsets.ModelViewSet):
 
             raise ValidationError('post like not exists')
         elif self.request.method == "POST":
-            if not post.like_post.filter(pk=user.pk).exists():
-                post.like_post.add(user)
+            if like_buffer.is_enabled():
+                if like_buffer.toggle(Post, post.pk, user, True):
+                    events.publish_likes(Post, [post.pk])
+                    cache.invalidate(f'board:{post.board_id}')
+                    return Response(status=status.HTTP_201_CREATED)
+                raise ValidationError('user exists')
+            if likes.set_like(Post, post.pk, user, True):
+                events.publish_likes(Post, [post.pk])
+                cache.invalidate(f'board:{post.board_id}')
                 return Response(status=status.HTTP_201_CREATED)
             raise ValidationError('user exists')
 
@@ -96,30 +214,55 @@ class PostViewSet(viewsets.ModelViewSet):
         post = self.get_object()
         user = self.request.user
 
-        if post.like_post.filter(pk=user.pk).exists():
-            post.like_post.remove(user)
+        if like_buffer.is_enabled():
+            if like_buffer.toggle(Post, post.pk, user, False):
+                events.publish_likes(Post, [post.pk])
+                cache.invalidate(f'board:{post.board_id}')
+                return Response(status=status.HTTP_204_NO_CONTENT)
+            raise ValidationError('user not exists')
+        if likes.set_like(Post, post.pk, user, False):
+            events.publish_likes(Post, [post.pk])
+            cache.invalidate(f'board:{post.board_id}')
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         raise ValidationError('user not exists')
 
 
-class CommentViewSet(viewsets.ModelViewSet):
+class CommentViewSet(ReadRoutingMixin, PaginationModeMixin, ConditionalGetMixin, VersionedCacheMixin, SparseFieldsMixin,
+                     LeanListMixin, BulkMixin, RestoreMixin, viewsets.ModelViewSet):
     queryset = Comment.objects.all().select_related('author', 'post')
     serializer_class = CommentSerializer
+    bulk_update_fields = ('text',)
 
     def get_queryset(self):
         qs = super().get_queryset()
-        qs = Comment.objects.filter(post_id=self.kwargs['post_pk'])
+        qs = qs.filter(**self.get_parent_filters())
         return qs
 
+    def get_parent_filters(self):
+        return {'post_id': self.kwargs['post_pk'], 'post__deleted_at__isnull': True,
+                'post__board__deleted_at__isnull': True}
+
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
         return context
 
+    def get_cache_scopes(self):
+        return [f"board:{self.kwargs['board_pk']}", f"post:{self.kwargs['post_pk']}"]
+
+    def get_write_scopes(self):
+        return [f"post:{self.kwargs['post_pk']}"]
+
+    def get_bulk_save_kwargs(self):
+        post = get_object_or_404(live_posts(), pk=self.kwargs['post_pk'])
+        return {'author': self.request.user, 'post': post}
+
     def perform_create(self, serializer):
-        post = get_object_or_404(Post, pk=self.kwargs['post_pk'])
+        post = get_object_or_404(live_posts(), pk=self.kwargs['post_pk'])
         serializer.save(author=self.request.user, post=post)
+        cache.invalidate(f'post:{post.pk}')
+        events.publish(Comment, 'created', [serializer.instance.pk])
         return super().perform_create(serializer)
 
     def perform_update(self, serializer):
@@ -127,13 +270,26 @@ class CommentViewSet(viewsets.ModelViewSet):
 
         if comment.author == self.request.user:
             serializer.save()
+            cache.invalidate(f'post:{comment.post_id}')
+            events.publish(Comment, 'updated', [comment.pk])
             return super().perform_update(serializer)
 
         raise PermissionDenied('접근권한이 없습니다.')
 
     def perform_destroy(self, instance):
         if instance.author == self.request.user:
-            instance.delete()
+            tombstones.soft_delete(Comment, [instance.pk])
+            cache.invalidate(f'post:{instance.post_id}')
+            events.publish(Comment, 'deleted', [instance.pk])
+            purge.ensure_worker()
+        else:
+            raise PermissionDenied('접근권한이 없습니다.')
+
+    def perform_restore(self, instance):
+        if instance.author == self.request.user:
+            tombstones.restore(Comment, [instance.pk])
+            cache.invalidate(f'post:{instance.post_id}')
+            events.publish(Comment, 'restored', [instance.pk])
         else:
             raise PermissionDenied('접근권한이 없습니다.')
 
@@ -151,8 +307,15 @@ class CommentViewSet(viewsets.ModelViewSet):
 
             raise ValidationError('post like not exists')
         elif self.request.method == "POST":
-            if not comment.like_comment.filter(pk=user.pk).exists():
-                comment.like_comment.add(user)
+            if like_buffer.is_enabled():
+                if like_buffer.toggle(Comment, comment.pk, user, True):
+                    events.publish_likes(Comment, [comment.pk])
+                    cache.invalidate(f'post:{comment.post_id}')
+                    return Response(status=status.HTTP_201_CREATED)
+                raise ValidationError('user exists')
+            if likes.set_like(Comment, comment.pk, user, True):
+                events.publish_likes(Comment, [comment.pk])
+                cache.invalidate(f'post:{comment.post_id}')
                 return Response(status=status.HTTP_201_CREATED)
             raise ValidationError('user exists')
 
@@ -161,8 +324,112 @@ class CommentViewSet(viewsets.ModelViewSet):
         comment = self.get_object()
         user = self.request.user
 
-        if comment.like_comment.filter(pk=user.pk).exists():
-            comment.like_comment.remove(user)
+        if like_buffer.is_enabled():
+            if like_buffer.toggle(Comment, comment.pk, user, False):
+                events.publish_likes(Comment, [comment.pk])
+                cache.invalidate(f'post:{comment.post_id}')
+                return Response(status=status.HTTP_204_NO_CONTENT)
+            raise ValidationError('user not exists')
+        if likes.set_like(Comment, comment.pk, user, False):
+            events.publish_likes(Comment, [comment.pk])
+            cache.invalidate(f'post:{comment.post_id}')
             return Response(status=status.HTTP_204_NO_CONTENT)
 
         raise ValidationError('user not exists')
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        data = metrics.store.summary()
+        data['cache'] = cache.stats.summary()
+        return Response(data=data, status=status.HTTP_200_OK)
+
+
+def get_limit(request, max_limit, default=10):
+    try:
+        limit = min(int(request.query_params.get('limit', default)), max_limit)
+    except ValueError:
+        raise ValidationError('invalid limit')
+    if limit < 1:
+        raise ValidationError('invalid limit')
+    return limit
+
+
+class SearchView(APIView):
+    max_limit = 100
+
+    def get(self, request, board_pk=None, *args, **kwargs):
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError('q is required')
+        limit = get_limit(request, self.max_limit)
+
+        if board_pk is not None:
+            get_object_or_404(Boards, pk=board_pk)
+        results, cursor = search.search(query, board_id=board_pk, cursor=request.query_params.get('cursor'),
+                                        limit=limit)
+
+        next_url = None
+        if cursor:
+            params = request.query_params.copy()
+            params['cursor'] = cursor
+            next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+        return Response(data={'next': next_url, 'results': results}, status=status.HTTP_200_OK)
+
+
+class TrendingView(APIView):
+    # 감쇠한 좋아요/댓글 점수(PostScore) 순위. 게시판별 또는 전체
+    max_limit = 100
+
+    def get(self, request, board_pk=None, *args, **kwargs):
+        limit = get_limit(request, self.max_limit)
+        if board_pk is not None:
+            get_object_or_404(Boards, pk=board_pk)
+
+        scores = trending.top(board_id=board_pk, limit=limit)
+        serializer = PostSerializer([score.post for score in scores], many=True, context={'request': request})
+        now = time.time()
+        results = [
+            {**item, 'board': score.board_id, 'score': round(trending.current_score(score, now), 4)}
+            for item, score in zip(serializer.data, scores)
+        ]
+        return Response(data={'results': results}, status=status.HTTP_200_OK)
+
+
+class ExportView(APIView):
+    # 전체/증분 덤프를 스트리밍으로 내보낸다. (?fmt=ndjson|csv, ?since=, ?after_id=, ?gzip=1)
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, name, *args, **kwargs):
+        if name not in export.EXPORTS:
+            raise NotFound()
+        fmt = request.query_params.get('fmt', 'ndjson')
+        if fmt not in export.FORMATS:
+            raise ValidationError('invalid fmt')
+
+        since = request.query_params.get('since')
+        if since is not None:
+            since = export.parse_since(since)
+            if since is None or not export.supports_since(name):
+                raise ValidationError('invalid since')
+        after_id = request.query_params.get('after_id')
+        if after_id is not None:
+            try:
+                after_id = int(after_id)
+            except ValueError:
+                raise ValidationError('invalid after_id')
+
+        compress = request.query_params.get('gzip') in ('1', 'true')
+        # 다음 증분 내보내기의 since 로 쓴다. 내보내는 동안 바뀐 행은 다음에도 다시 나올 수 있다.
+        watermark = timezone.now()
+        using = db.replica_for(request) or 'default'
+        response = StreamingHttpResponse(
+            export.stream(name, fmt, since, after_id, using=using, compress=compress),
+            content_type='application/gzip' if compress else f'{export.FORMATS[fmt]}; charset=utf-8',
+        )
+        filename = f'{name}.{fmt}.gz' if compress else f'{name}.{fmt}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        response['X-Export-Watermark'] = watermark.isoformat()
+        return response
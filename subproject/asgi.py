@@ -13,4 +13,9 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'subproject.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# 게시판/게시글 이벤트 스트림(SSE)은 Django 를 거치지 않고 board.sse 가 처리한다. (setup 뒤에 import)
+from board.sse import EventStreamApp  # noqa: E402
+
+application = EventStreamApp(django_application)
@@ -45,6 +45,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'board.middleware.QueryMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -82,6 +83,27 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # 스레드마다 연결을 유지한다. 끊긴 연결은 요청 시작/끝에 close_old_connections 가 정리한다.
+        'CONN_MAX_AGE': 60,
+    },
+    # 같은 DB 파일을 여는 읽기 전용 연결 (BOARD_DB_REPLICAS, board.db.ReadRouter)
+    'read': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'TEST': {'MIRROR': 'default'},
+    },
+}
+
+DATABASE_ROUTERS = ['board.db.ReadRouter']
+
+
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
@@ -129,6 +151,145 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
     ],
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
+    'DEFAULT_PAGINATION_CLASS': 'board.pagination.OffsetPagination',
+    'DEFAULT_THROTTLE_CLASSES': [
+        'board.throttling.BoardThrottle',
+    ],
     'PAGE_SIZE': 10
 }
+
+
+# Board API instrumentation (Server-Timing headers, /metrics/)
+
+BOARD_METRICS_ENABLED = False
+
+BOARD_METRICS_SAMPLES = 1000
+
+
+# Versioned response cache for board/post/comment list and detail endpoints
+
+BOARD_CACHE_ENABLED = False
+
+BOARD_CACHE_ALIAS = 'default'
+
+BOARD_CACHE_TIMEOUT = 300
+
+
+# Bulk create/update/delete endpoints
+
+BOARD_BULK_MAX_ITEMS = 1000
+
+
+# Latest comments embedded per post by ?expand=comments on post lists
+
+BOARD_EXPAND_COMMENTS = 3
+
+
+# Build list responses from values() rows instead of ModelSerializer instances
+
+BOARD_LEAN_LIST = False
+
+
+# Write-behind buffer for like/unlike: None, 'local' (per process) or 'cache' (BOARD_LIKE_BUFFER_ALIAS)
+
+BOARD_LIKE_BUFFER = None
+
+BOARD_LIKE_BUFFER_ALIAS = 'default'
+
+# Seconds between background flushes; 0 flushes only through the flush_likes command
+
+BOARD_LIKE_BUFFER_FLUSH_INTERVAL = 5
+
+
+# SQLite pragmas applied to every new connection (board.db.PROFILES): 'stock' or 'production'
+
+BOARD_DB_PROFILE = 'production'
+
+BOARD_DB_PRAGMAS = {}
+
+# Replica aliases for read-only list/retrieve actions; an empty list keeps every query on 'default'
+
+BOARD_DB_REPLICAS = ['read']
+
+# Seconds a replica health probe result is reused
+
+BOARD_DB_REPLICA_CHECK_INTERVAL = 5
+
+# Seconds a client keeps reading from 'default' after a successful write (0 disables)
+
+BOARD_DB_STICKY_SECONDS = 5
+
+
+# Trending posts: time-decayed like/comment score kept in board.PostScore
+
+BOARD_TRENDING_LIKE_WEIGHT = 1.0
+
+BOARD_TRENDING_COMMENT_WEIGHT = 2.0
+
+# Seconds for a score to halve. Rankings use a time-normalised key, so decay_trending only prunes faded
+# scores; run decay_trending --rebuild after changing this
+
+BOARD_TRENDING_HALF_LIFE = 24 * 60 * 60
+
+BOARD_TRENDING_MIN_SCORE = 0.01
+
+
+# Rows fetched per round trip (and per streamed chunk) by the export endpoint and command
+
+BOARD_EXPORT_CHUNK_SIZE = 2000
+
+
+# Records per transaction for import_forum_data (each batch moves the resume checkpoint)
+
+BOARD_IMPORT_BATCH_SIZE = 1000
+
+
+# Deleting a board, post or comment only sets deleted_at (a tombstone); authors can restore it for
+# BOARD_TOMBSTONE_TTL seconds, after which purge_tombstones removes it in raw-delete batches (board.purge)
+
+BOARD_TOMBSTONE_TTL = 7 * 24 * 60 * 60
+
+BOARD_PURGE_BATCH_SIZE = 1000
+
+# Seconds between background purge_tombstones passes started by the first delete; 0 runs only through the command
+
+BOARD_PURGE_INTERVAL = 0
+
+
+# Server-sent event streams at /board/<id>/events/ and /board/<id>/post/<id>/events/ (ASGI only, board.sse);
+# events are kept in board.BoardEvent for Last-Event-ID resume
+
+BOARD_EVENT_LOG_SIZE = 10000
+
+# Seconds like-count changes are gathered into one event per post/comment; 0 sends every change
+
+BOARD_EVENT_LIKE_WINDOW = 1
+
+# Seconds between keep-alive comments; an idle stream also re-reads the log then for other processes' events
+
+BOARD_EVENT_KEEPALIVE = 15
+
+
+# Token-bucket rate limits per user (per client IP when anonymous), checked by board.throttling.BoardThrottle
+# and, for the read budget, by the /async/ views and event streams:
+# None (off), 'local' (per process) or 'cache' (shared through BOARD_THROTTLE_ALIAS)
+
+BOARD_THROTTLE = None
+
+BOARD_THROTTLE_ALIAS = 'default'
+
+# Sustained refill rate per budget; like toggles are counted apart from other writes
+
+BOARD_THROTTLE_RATES = {
+    'read': '20/s',
+    'write': '2/s',
+    'like': '1/s',
+}
+
+# Bucket size, i.e. how many requests may arrive at once after a quiet period
+
+BOARD_THROTTLE_BURST = {
+    'read': 100,
+    'write': 20,
+    'like': 10,
+}